@@ -6,17 +6,34 @@ import logging
 import sys
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from flask_cors import CORS
+from sqlalchemy.orm import load_only
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 import config
-from models import db, Post, ProcessingLog
-from services.post_processor import PostProcessor
+from models import (
+    db, Post, ArticleFingerprint, PostCategory, PostCounter, ProcessingLog, upgrade_schema, backfill_post_terms,
+    resolve_post_fields, counter_deltas, apply_counter_deltas, rebuild_post_counters, ensure_post_counters,
+    bump_cache_generation, ensure_cache_generation
+)
 from services.file_watcher import DataFileMonitor
 from services.scheduler import AutomationScheduler
+from services.job_queue import JobQueue, JobQueueFull
+from services.import_lock import get_import_lock
+from services.search_index import ensure_search_index, search_matches
+from services.suggest_index import get_suggest_index
+from services.response_cache import (
+    cached_response, get_response_cache, post_validator, request_generation, stats_validator
+)
+from services.sitemaps import (
+    get_sitemap_files, iter_full_sitemap_xml, iter_shard_xml, list_sitemaps, parse_sitemap_name,
+    post_sitemap_keys, shard_state, shard_validator, sitemap_index_entries, sitemap_is_sharded
+)
+from utils.pagination import encode_cursor, decode_cursor, keyset_before
+from utils.json_provider import json_provider_class
 
 
 # Configure logging
@@ -47,6 +64,10 @@ def create_app():
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     app.config['JSON_SORT_KEYS'] = False
 
+    # orjson when installed, standard library otherwise; both keep Flask's
+    # default of sorted keys (JSON_SORT_KEYS is not read by Flask 3)
+    app.json = json_provider_class(config.JSON_PROVIDER)(app)
+
     # Enable CORS for frontend integration
     # Allow requests from configured frontend domains
     CORS(app, resources={
@@ -65,6 +86,12 @@ def create_app():
     # Create tables if they don't exist
     with app.app_context():
         db.create_all()
+        upgrade_schema()
+        ensure_search_index()
+        ensure_post_counters()
+        if ensure_cache_generation():
+            # Generations restart on a new database, so older entries could collide
+            get_response_cache().clear()
         logger.info("Database tables initialized")
 
     return app
@@ -73,6 +100,13 @@ def create_app():
 # Create application instance
 app = create_app()
 
+# Background worker pool for processing jobs
+job_queue = JobQueue(
+    app=app,
+    max_workers=config.JOB_WORKERS,
+    max_pending=config.JOB_QUEUE_SIZE
+)
+
 # Initialize automation components (only if enabled)
 data_monitor = None
 automation_scheduler = None
@@ -84,7 +118,10 @@ if config.AUTO_PROCESS_ENABLED:
     data_monitor = DataFileMonitor(
         app=app,
         file_path=config.SCRAPED_DATA_FILE,
-        check_interval=config.CHECK_INTERVAL_MINUTES * 60  # Convert to seconds
+        check_interval=config.CHECK_INTERVAL_MINUTES * 60,  # Convert to seconds
+        resume=config.RESUME_INTERRUPTED_RUNS,
+        backend=config.WATCH_BACKEND,
+        debounce=config.WATCH_DEBOUNCE_SECONDS
     )
 
     # Create and start scheduler
@@ -93,7 +130,12 @@ if config.AUTO_PROCESS_ENABLED:
         data_file_monitor=data_monitor
     )
 
-    automation_scheduler.start(check_interval_minutes=config.CHECK_INTERVAL_MINUTES)
+    if data_monitor.event_driven:
+        # File events replace the periodic checks (the watcher polls by itself if events fail)
+        data_monitor.start_background()
+        automation_scheduler.start(check_interval_minutes=None)
+    else:
+        automation_scheduler.start(check_interval_minutes=config.CHECK_INTERVAL_MINUTES)
 
     # Add cron job if specified
     if config.CRON_SCHEDULE:
@@ -121,7 +163,8 @@ def health_check():
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.utcnow().isoformat(),
-            'database': 'connected'
+            'database': 'connected',
+            'cache': get_response_cache().get_status()
         }), 200
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
@@ -133,31 +176,34 @@ def health_check():
 
 
 @app.route('/api/stats', methods=['GET'])
+@cached_response(validator=stats_validator)
 def get_stats():
     """
     Get current database statistics.
     Returns counts of posts, categories, processing logs, etc.
+    Post and category counts are read from the post_counters table.
     """
     try:
-        total_posts = Post.query.count()
-        published_posts = Post.query.filter_by(is_published=True).count()
+        totals = db.session.get(PostCounter, ('all', ''))
+        published_posts = totals.published if totals else 0
+        unpublished_posts = totals.unpublished if totals else 0
 
         # Get recent processing logs
-        recent_logs = ProcessingLog.query.order_by(
-            ProcessingLog.started_at.desc()
-        ).limit(5).all()
+        recent_logs = ProcessingLog.recent()
 
         # Get category distribution
-        all_posts = Post.query.all()
-        category_counts = {}
-        for post in all_posts:
-            for category in post.get_categories():
-                category_counts[category] = category_counts.get(category, 0) + 1
+        category_counts = {
+            counter.name: counter.published + counter.unpublished
+            for counter in PostCounter.query.filter(
+                PostCounter.scope == 'category',
+                PostCounter.published + PostCounter.unpublished > 0
+            ).order_by(PostCounter.name)
+        }
 
         return jsonify({
-            'total_posts': total_posts,
+            'total_posts': published_posts + unpublished_posts,
             'published_posts': published_posts,
-            'unpublished_posts': total_posts - published_posts,
+            'unpublished_posts': unpublished_posts,
             'categories': len(category_counts),
             'category_distribution': category_counts,
             'recent_processing_logs': [log.to_dict() for log in recent_logs]
@@ -170,43 +216,54 @@ def get_stats():
 @app.route('/api/process', methods=['POST'])
 def process_data():
     """
-    Trigger bulk processing of scraped data.
-    Processes all articles from the JSON file and creates posts.
+    Queue bulk processing of scraped data.
+    Processes all articles from the JSON file in a background job and
+    returns immediately; poll /api/jobs/<job_id> for progress.
 
     Request body (optional):
         {
-            "data_file": "/path/to/custom/data.json"
+            "data_file": "/path/to/custom/data.json",
+            "bulk_insert": true,  // Use executemany bulk INSERTs for large backfills
+            "parallel": true,     // Generate SEO metadata in a MAX_WORKERS process pool
+            "incremental": false, // Reprocess every article, ignoring stored fingerprints
+            "upsert": true,       // Refresh existing posts whose content changed
+            "resume": true        // Continue the last interrupted run from its checkpoint
         }
 
     Returns:
-        Processing statistics and results
+        202 with the queued job id
     """
     try:
         logger.info("Received request to process data")
 
         # Get optional custom data file path
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         custom_data_file = data.get('data_file')
+        incremental = data.get('incremental')
 
         if custom_data_file:
             data_file_path = Path(custom_data_file)
         else:
             data_file_path = config.SCRAPED_DATA_FILE
 
-        # Initialize processor
-        processor = PostProcessor(app=app)
+        if not data_file_path.exists():
+            raise FileNotFoundError(f"Data file not found: {data_file_path}")
 
-        # Process all data
-        with app.app_context():
-            stats = processor.process_all_data(data_file=data_file_path)
+        processor_options = {
+            'bulk_insert': bool(data.get('bulk_insert', False)),
+            'parallel': bool(data.get('parallel', False)),
+            'incremental': None if incremental is None else bool(incremental),
+            'upsert': bool(data.get('upsert', False))
+        }
 
-        logger.info(f"Processing completed. Stats: {stats}")
+        job_id = job_queue.submit(
+            data_file=data_file_path,
+            resume=bool(data.get('resume', False)),
+            processor_options=processor_options,
+            source='api'
+        )
 
-        return jsonify({
-            'status': 'success',
-            'message': 'Data processing completed',
-            'statistics': stats
-        }), 200
+        return job_accepted_response(job_id, 'Data processing queued')
 
     except FileNotFoundError as e:
         logger.error(f"Data file not found: {str(e)}")
@@ -216,6 +273,14 @@ def process_data():
             'error': str(e)
         }), 404
 
+    except JobQueueFull as e:
+        logger.warning(str(e))
+        return jsonify({
+            'status': 'error',
+            'message': 'Too many processing jobs queued, try again later',
+            'error': str(e)
+        }), 503
+
     except Exception as e:
         logger.error(f"Error processing data: {str(e)}", exc_info=True)
         return jsonify({
@@ -225,7 +290,50 @@ def process_data():
         }), 500
 
 
+@app.route('/api/jobs/<int:job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get status and progress of a background processing job.
+
+    Args:
+        job_id: Job ID returned by /api/process or the webhook
+
+    Returns:
+        Job status with progress taken from its processing log
+    """
+    try:
+        job = job_queue.get_job(job_id)
+        if job is None:
+            return jsonify({'error': f'Job {job_id} not found'}), 404
+
+        return jsonify(job), 200
+
+    except Exception as e:
+        logger.error(f"Error getting job {job_id}: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+def job_accepted_response(job_id: int, message: str):
+    """
+    Build the 202 response returned when a processing job is queued.
+
+    Args:
+        job_id: Queued job ID
+        message: Human readable message
+
+    Returns:
+        Flask response tuple
+    """
+    return jsonify({
+        'status': 'queued',
+        'message': message,
+        'job_id': job_id,
+        'status_url': f'/api/jobs/{job_id}'
+    }), 202
+
+
 @app.route('/api/posts', methods=['GET'])
+@cached_response
 def get_posts():
     """
     Get posts with pagination and filtering.
@@ -235,7 +343,11 @@ def get_posts():
         - per_page: Items per page (default: 20, max: 100)
         - category: Filter by category
         - published: Filter by published status (true/false)
-        - search: Search in title and body
+        - search: Full-text search in title and body, ranked by relevance
+        - cursor: Keyset pagination; empty for the first page, then the
+          previous response's next_cursor (page is ignored)
+        - include_total: Also count matching posts in cursor mode (true/false)
+        - fields: "card", "full" (default) or comma-separated field names
 
     Returns:
         Paginated list of posts
@@ -243,57 +355,91 @@ def get_posts():
     try:
         # Get query parameters
         page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 20, type=int), 100)
+        per_page = max(min(request.args.get('per_page', 20, type=int), 100), 1)
         category = request.args.get('category')
         published = request.args.get('published')
         search_query = request.args.get('search')
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
 
-        # Build query
-        query = Post.query
+        try:
+            position = decode_cursor(cursor) if cursor is not None else None
+            fields = resolve_post_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # Build filters
+        filters = []
 
-        # Apply filters
         if published is not None:
             is_published = published.lower() == 'true'
-            query = query.filter_by(is_published=is_published)
+            filters.append(Post.is_published == is_published)
 
-        if search_query:
-            search_pattern = f"%{search_query}%"
-            query = query.filter(
-                db.or_(
-                    Post.title.ilike(search_pattern),
-                    Post.body.ilike(search_pattern)
-                )
-            )
-
-        # Category filter (requires scanning JSON field - less efficient)
+        # Listing of (sort key, id) pairs; category listings are served from post_categories
         if category:
-            all_posts = query.all()
-            filtered_posts = [
-                post for post in all_posts
-                if category in post.get_categories()
-            ]
-            total = len(filtered_posts)
-            start = (page - 1) * per_page
-            end = start + per_page
-            posts = filtered_posts[start:end]
+            sort_column, id_column = PostCategory.created_at, PostCategory.post_id
+            listing = db.select(id_column, sort_column).where(PostCategory.name == category)
+            if filters:
+                listing = listing.join(Post, Post.id == PostCategory.post_id).where(*filters)
         else:
-            # Paginate
-            pagination = query.order_by(Post.created_at.desc()).paginate(
-                page=page,
-                per_page=per_page,
-                error_out=False
-            )
-            posts = pagination.items
-            total = pagination.total
+            sort_column, id_column = Post.created_at, Post.id
+            listing = db.select(id_column, sort_column).where(*filters)
 
-        return jsonify({
-            'posts': [post.to_dict() for post in posts],
-            'pagination': {
+        # Full-text search (see services/search_index.py)
+        matches = None
+        if search_query:
+            matches = search_matches(search_query).subquery()
+            listing = listing.join(matches, matches.c.post_id == id_column)
+
+        def count_listing():
+            return db.session.scalar(db.select(db.func.count()).select_from(listing.subquery()))
+
+        # Newest first; id breaks created_at ties so pages are stable
+        ordered = listing.order_by(sort_column.desc(), id_column.desc())
+        if matches is not None and cursor is None:
+            # Search results are ranked by relevance (title matches above body matches)
+            ordered = listing.order_by(matches.c.rank.desc(), sort_column.desc(), id_column.desc())
+
+        if cursor is not None:
+            # Keyset mode: seek past the cursor and fetch one extra row to detect the end
+            if position:
+                ordered = ordered.where(keyset_before(sort_column, id_column, position))
+            rows = db.session.execute(ordered.limit(per_page + 1)).all()
+            has_more = len(rows) > per_page
+            rows = rows[:per_page]
+
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': encode_cursor(rows[-1][1], rows[-1][0]) if has_more else None,
+                'has_more': has_more
+            }
+            if include_total:
+                pagination['total'] = count_listing()
+        else:
+            # Page through the index, then load only that page's posts
+            total = count_listing()
+            rows = db.session.execute(
+                ordered.limit(per_page).offset((max(page, 1) - 1) * per_page)
+            ).all()
+
+            pagination = {
                 'page': page,
                 'per_page': per_page,
                 'total': total,
                 'pages': (total + per_page - 1) // per_page
             }
+
+        # Read only the columns the requested fields need
+        page_ids = [row[0] for row in rows]
+        posts_by_id = {
+            post.id: post
+            for post in Post.query.options(load_only(*Post.load_columns(fields))).filter(Post.id.in_(page_ids))
+        }
+        posts = [posts_by_id[post_id] for post_id in page_ids if post_id in posts_by_id]
+
+        return jsonify({
+            'posts': [post.to_dict(fields, raw_json=True) for post in posts],
+            'pagination': pagination
         }), 200
 
     except Exception as e:
@@ -302,6 +448,7 @@ def get_posts():
 
 
 @app.route('/api/posts/<int:post_id>', methods=['GET'])
+@cached_response(validator=post_validator)
 def get_post(post_id):
     """
     Get a single post by ID.
@@ -309,12 +456,20 @@ def get_post(post_id):
     Args:
         post_id: Post ID
 
+    Query parameters:
+        - fields: "card", "full" (default) or comma-separated field names
+
     Returns:
         Post details with all metadata
     """
     try:
-        post = Post.query.get_or_404(post_id)
-        return jsonify(post.to_dict()), 200
+        fields = resolve_post_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    try:
+        post = Post.query.options(load_only(*Post.load_columns(fields))).filter_by(id=post_id).first_or_404()
+        return jsonify(post.to_dict(fields, raw_json=True)), 200
     except Exception as e:
         logger.error(f"Error getting post {post_id}: {str(e)}")
         return jsonify({'error': str(e)}), 404
@@ -337,6 +492,7 @@ def update_post(post_id):
     try:
         post = Post.query.get_or_404(post_id)
         data = request.get_json()
+        before = (post.get_categories(), post.is_published)
 
         # Update allowed fields
         allowed_fields = [
@@ -356,10 +512,17 @@ def update_post(post_id):
             post.set_categories(data['categories'])
 
         post.updated_at = datetime.utcnow()
+
+        # Move the post between counters in the same transaction
+        deltas = counter_deltas([before], -1)
+        apply_counter_deltas(counter_deltas([(post.get_categories(), post.is_published)], 1, deltas))
+        bump_cache_generation([post_id])
+
         db.session.commit()
+        refresh_sitemap_files(post_id, before[0] + post.get_categories())
 
         logger.info(f"Updated post {post_id}")
-        return jsonify(post.to_dict()), 200
+        return jsonify(post.to_dict(raw_json=True)), 200
 
     except Exception as e:
         db.session.rollback()
@@ -367,6 +530,16 @@ def update_post(post_id):
         return jsonify({'error': str(e)}), 500
 
 
+def refresh_sitemap_files(post_id, categories):
+    """Rewrite the precomputed sitemap shards of an edited post (failures only logged)"""
+    if not config.SITEMAP_PRECOMPUTE:
+        return
+    try:
+        get_sitemap_files().regenerate(keys=post_sitemap_keys(post_id, categories))
+    except Exception as e:
+        logger.warning(f"Could not refresh sitemap files after editing post {post_id}: {str(e)}")
+
+
 @app.route('/api/posts/<int:post_id>', methods=['DELETE'])
 def delete_post(post_id):
     """
@@ -380,8 +553,14 @@ def delete_post(post_id):
     """
     try:
         post = Post.query.get_or_404(post_id)
+        categories = post.get_categories()
+        apply_counter_deltas(counter_deltas([(categories, post.is_published)], -1))
+        bump_cache_generation([post_id])
+        # Otherwise incremental imports would keep skipping the article as unchanged
+        ArticleFingerprint.query.filter_by(original_url=post.original_url).delete()
         db.session.delete(post)
         db.session.commit()
+        refresh_sitemap_files(post_id, categories)
 
         logger.info(f"Deleted post {post_id}")
         return jsonify({'message': f'Post {post_id} deleted successfully'}), 200
@@ -400,30 +579,61 @@ def get_processing_logs():
     Query parameters:
         - page: Page number (default: 1)
         - per_page: Items per page (default: 10)
+        - cursor: Keyset pagination; empty for the first page, then the
+          previous response's next_cursor (page is ignored)
+        - include_total: Also count logs in cursor mode (true/false)
 
     Returns:
         Paginated list of processing logs
     """
     try:
         page = request.args.get('page', 1, type=int)
-        per_page = min(request.args.get('per_page', 10, type=int), 50)
-
-        pagination = ProcessingLog.query.order_by(
-            ProcessingLog.started_at.desc()
-        ).paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
+        per_page = max(min(request.args.get('per_page', 10, type=int), 50), 1)
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'false').lower() == 'true'
+
+        try:
+            position = decode_cursor(cursor) if cursor is not None else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        query = ProcessingLog.query.order_by(
+            ProcessingLog.started_at.desc(), ProcessingLog.id.desc()
         )
 
-        return jsonify({
-            'logs': [log.to_dict() for log in pagination.items],
-            'pagination': {
+        if cursor is not None:
+            # Keyset mode: seek past the cursor and fetch one extra row to detect the end
+            if position:
+                query = query.filter(keyset_before(ProcessingLog.started_at, ProcessingLog.id, position))
+            logs = query.limit(per_page + 1).all()
+            has_more = len(logs) > per_page
+            logs = logs[:per_page]
+
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': encode_cursor(logs[-1].started_at, logs[-1].id) if has_more else None,
+                'has_more': has_more
+            }
+            if include_total:
+                pagination['total'] = ProcessingLog.query.count()
+        else:
+            page_result = query.paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            logs = page_result.items
+
+            pagination = {
                 'page': page,
                 'per_page': per_page,
-                'total': pagination.total,
-                'pages': pagination.pages
+                'total': page_result.total,
+                'pages': page_result.pages
             }
+
+        return jsonify({
+            'logs': [log.to_dict() for log in logs],
+            'pagination': pagination
         }), 200
 
     except Exception as e:
@@ -432,33 +642,31 @@ def get_processing_logs():
 
 
 @app.route('/api/categories', methods=['GET'])
+@cached_response
 def get_categories():
     """
-    Get all unique categories with post counts.
+    Get all unique categories with published post counts (from post_counters).
 
     Returns:
         List of categories with statistics
     """
     try:
-        all_posts = Post.query.filter_by(is_published=True).all()
-
-        category_stats = {}
-        for post in all_posts:
-            for category in post.get_categories():
-                if category not in category_stats:
-                    category_stats[category] = {
-                        'name': category,
-                        'count': 0,
-                        'slug': category.lower().replace(' ', '-')
-                    }
-                category_stats[category]['count'] += 1
-
-        categories = sorted(
-            category_stats.values(),
-            key=lambda x: x['count'],
-            reverse=True
+        rows = (
+            db.session.query(PostCounter.name, PostCounter.published)
+            .filter(PostCounter.scope == 'category', PostCounter.published > 0)
+            .order_by(PostCounter.published.desc(), PostCounter.name)
+            .all()
         )
 
+        categories = [
+            {
+                'name': name,
+                'count': count,
+                'slug': name.lower().replace(' ', '-')
+            }
+            for name, count in rows
+        ]
+
         return jsonify({
             'categories': categories,
             'total': len(categories)
@@ -469,6 +677,39 @@ def get_categories():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/suggest', methods=['GET'])
+def suggest():
+    """
+    Autocomplete suggestions for the search box.
+    Served from an in-memory prefix index of post titles, categories, tags
+    and focus keywords, ranked by how many published posts use each term.
+
+    Query parameters:
+        - q: Text typed so far
+        - limit: Maximum suggestions (default: 8, max: SUGGEST_MAX_RESULTS)
+
+    Returns:
+        List of suggestions
+    """
+    try:
+        prefix = request.args.get('q', '')
+        limit = request.args.get('limit', 8, type=int)
+
+        # Catch up on writes from any worker process (one request at a time)
+        suggest_index = get_suggest_index()
+        generation, _ = request_generation()
+        suggest_index.refresh(generation)
+
+        return jsonify({
+            'query': prefix,
+            'suggestions': suggest_index.suggest(prefix, limit)
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error getting suggestions: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/automation/status', methods=['GET'])
 def get_automation_status():
     """
@@ -490,9 +731,12 @@ def get_automation_status():
             'file_monitor': data_monitor.get_status() if data_monitor else None,
             'config': {
                 'check_interval_minutes': config.CHECK_INTERVAL_MINUTES,
+                'watch_backend': config.WATCH_BACKEND,
                 'data_file': str(config.SCRAPED_DATA_FILE),
                 'cron_schedule': config.CRON_SCHEDULE or None
-            }
+            },
+            'job_queue': job_queue.get_status(),
+            'import_in_progress': get_import_lock().is_locked()
         }
 
         return jsonify(status), 200
@@ -523,7 +767,19 @@ def check_now():
         # Check for updates
         changed = data_monitor.check_once()
 
-        if changed:
+        if changed and data_monitor.last_status == 'coalesced':
+            return jsonify({
+                'status': 'success',
+                'message': 'Data file updated - merged into the follow-up of an import already in progress',
+                'processed': False,
+                'coalesced': True
+            }), 200
+        elif changed and data_monitor.last_status == 'failed':
+            return jsonify({
+                'status': 'error',
+                'message': 'Data file updated - processing failed, see the processing logs'
+            }), 500
+        elif changed:
             return jsonify({
                 'status': 'success',
                 'message': 'Data file updated - processing completed',
@@ -549,6 +805,7 @@ def webhook_data_updated():
     """
     Webhook endpoint for external automation scripts.
     Call this endpoint after updating the JSON file to trigger processing.
+    Processing runs in a background job; poll /api/jobs/<job_id> for progress.
 
     Optional request body:
         {
@@ -557,10 +814,10 @@ def webhook_data_updated():
         }
 
     Returns:
-        Processing results
+        202 with the queued job id, or 200 if no changes were detected
     """
     try:
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         source = data.get('source', 'unknown')
         force = data.get('force', False)
 
@@ -569,45 +826,33 @@ def webhook_data_updated():
         if force:
             # Force processing regardless of file changes
             logger.info("Force processing requested")
-
-            with app.app_context():
-                processor = PostProcessor(app=app)
-                stats = processor.process_all_data()
-
+            message = 'Forced processing queued'
+        elif not config.AUTO_PROCESS_ENABLED or not data_monitor:
+            # If automation is disabled, just process the data
+            message = 'Processing queued'
+        elif data_monitor.has_changed():
+            message = 'Data updated - processing queued'
+        else:
             return jsonify({
                 'status': 'success',
-                'message': 'Forced processing completed',
-                'statistics': stats
+                'message': 'No changes detected',
+                'processed': False
             }), 200
-        else:
-            # Check if file changed before processing
-            if not config.AUTO_PROCESS_ENABLED or not data_monitor:
-                # If automation is disabled, just process the data
-                with app.app_context():
-                    processor = PostProcessor(app=app)
-                    stats = processor.process_all_data()
-
-                return jsonify({
-                    'status': 'success',
-                    'message': 'Processing completed',
-                    'statistics': stats
-                }), 200
-            else:
-                # Use monitor to check and process if changed
-                changed = data_monitor.check_once()
-
-                if changed:
-                    return jsonify({
-                        'status': 'success',
-                        'message': 'Data updated and processed',
-                        'processed': True
-                    }), 200
-                else:
-                    return jsonify({
-                        'status': 'success',
-                        'message': 'No changes detected',
-                        'processed': False
-                    }), 200
+
+        job_id = job_queue.submit(
+            data_file=config.SCRAPED_DATA_FILE,
+            resume=config.RESUME_INTERRUPTED_RUNS,
+            source=f'webhook:{source}'
+        )
+
+        return job_accepted_response(job_id, message)
+
+    except JobQueueFull as e:
+        logger.warning(str(e))
+        return jsonify({
+            'status': 'error',
+            'message': 'Too many processing jobs queued, try again later'
+        }), 503
 
     except Exception as e:
         logger.error(f"Webhook error: {str(e)}", exc_info=True)
@@ -618,35 +863,77 @@ def webhook_data_updated():
 
 
 @app.route('/sitemap.xml', methods=['GET'])
+@cached_response
 def generate_sitemap():
     """
     Generate XML sitemap for search engines (Google, Bing).
     Helps search engines discover and index all video pages.
+    The document is streamed from a database cursor, so memory use does
+    not grow with the number of posts. Past SITEMAP_SHARD_SIZE published
+    posts, or with several SITEMAP_FAMILIES, it is a sitemap index of
+    /sitemaps/<family>-<n>.xml shards instead.
+    The precomputed file is sent when SITEMAP_PRECOMPUTE has written one.
 
     Returns:
-        XML sitemap with video metadata
+        XML sitemap with video metadata, or a sitemap index
     """
     try:
-        from utils.sitemap_generator import generate_sitemap_xml
+        from utils.sitemap_generator import generate_sitemap_index
 
-        # Get all published posts
-        posts = Post.query.filter_by(is_published=True).order_by(Post.created_at.desc()).all()
+        if config.SITEMAP_PRECOMPUTE:
+            response = get_sitemap_files().response('sitemap.xml')
+            if response is not None:
+                return response
 
-        # Convert to dict
-        posts_data = [post.to_dict() for post in posts]
+        if sitemap_is_sharded():
+            sitemaps = sitemap_index_entries(list_sitemaps())
+            return Response(generate_sitemap_index(sitemaps, config.SITE_URL), mimetype='application/xml')
 
-        # Generate sitemap XML
-        sitemap_xml = generate_sitemap_xml(posts_data, config.SITE_URL)
-
-        # Return as XML
-        from flask import Response
-        return Response(sitemap_xml, mimetype='application/xml')
+        # The request context (and its database session) stays open until the last chunk is sent
+        chunks = iter_full_sitemap_xml(config.SITE_URL)
+        return Response(stream_with_context(chunks), mimetype='application/xml')
 
     except Exception as e:
         logger.error(f"Error generating sitemap: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/sitemaps/<name>.xml', methods=['GET'])
+@cached_response(validator=shard_validator)
+def generate_sitemap_shard(name):
+    """
+    One shard of a sitemap family: its published posts with ids in the shard's range
+    (e.g. posts-1, videos-2, category-music-1). The homepage entry is part of posts-1.
+
+    Args:
+        name: Family and shard number, '<family>-<n>'
+
+    Returns:
+        Streamed XML sitemap
+    """
+    try:
+        parsed = parse_sitemap_name(name)
+        if parsed is None:
+            return jsonify({'error': f'Sitemap {name} not found'}), 404
+
+        if config.SITEMAP_PRECOMPUTE:
+            response = get_sitemap_files().response(f'{name}.xml')
+            if response is not None:
+                return response
+
+        family, shard = parsed
+        state = shard_state(shard, family=family)
+        if not state or not state[0]:
+            return jsonify({'error': f'Sitemap {name} not found'}), 404
+
+        chunks = iter_shard_xml(family, shard, config.SITE_URL)
+        return Response(stream_with_context(chunks), mimetype='application/xml')
+
+    except Exception as e:
+        logger.error(f"Error generating sitemap {name}: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/robots.txt', methods=['GET'])
 def robots_txt():
     """
@@ -688,6 +975,33 @@ def internal_error(error):
     return jsonify({'error': 'Internal server error'}), 500
 
 
+# ============================================================================
+# CLI Commands
+# ============================================================================
+
+@app.cli.command('backfill-terms')
+def backfill_terms_command():
+    """Populate post_categories/post_tags from the JSON columns of existing posts."""
+    processed = backfill_post_terms()
+    logger.info(f"Backfill complete: categories and tags indexed for {processed} posts")
+
+
+@app.cli.command('rebuild-counters')
+def rebuild_counters_command():
+    """Recompute post_counters from the posts and post_categories tables."""
+    rebuild_post_counters()
+    bump_cache_generation([])
+    db.session.commit()
+    logger.info("Post counters rebuilt")
+
+
+@app.cli.command('build-sitemaps')
+def build_sitemaps_command():
+    """Rewrite every precomputed sitemap file in SITEMAP_DIR."""
+    written = get_sitemap_files().regenerate(force=True)
+    logger.info(f"Wrote {len(written)} sitemap files to {config.SITEMAP_DIR}")
+
+
 # ============================================================================
 # Main Entry Point
 # ============================================================================
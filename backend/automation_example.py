@@ -191,6 +191,10 @@ class DataAutomation:
             result = response.json()
             logger.info(f"Backend notification successful: {result.get('message')}")
 
+            # Processing runs in a background job; progress is at /api/jobs/<job_id>
+            if 'job_id' in result:
+                logger.info(f"Processing job {result['job_id']} queued: {self.backend_url}{result['status_url']}")
+
             if 'statistics' in result:
                 stats = result['statistics']
                 logger.info(
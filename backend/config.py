@@ -25,6 +25,49 @@ FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
 # Processing configuration
 BATCH_SIZE = 100  # Process articles in batches to manage memory
 MAX_WORKERS = 4   # Number of parallel workers for processing
+# Skip articles whose content fingerprint is unchanged since the last run
+INCREMENTAL_PROCESSING = os.getenv('INCREMENTAL_PROCESSING', 'True').lower() == 'true'
+# Continue an interrupted import from its last committed batch instead of starting over
+RESUME_INTERRUPTED_RUNS = os.getenv('RESUME_INTERRUPTED_RUNS', 'True').lower() == 'true'
+
+# Background job queue for /api/process and the webhook
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', 1))         # Jobs that may run at the same time
+JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', 10))  # Max queued + running jobs
+
+# Single-flight lock shared by all worker processes so imports never overlap
+IMPORT_LOCK_FILE = Path(os.getenv('IMPORT_LOCK_FILE', str(DATABASE_DIR / 'import.lock')))
+
+# Search box autocomplete (/api/suggest)
+SUGGEST_MAX_RESULTS = int(os.getenv('SUGGEST_MAX_RESULTS', 20))  # Largest allowed limit
+SUGGEST_CACHED_PREFIX_LENGTH = 3  # Prefixes up to this length are answered from a precomputed top list
+
+# Response cache for the read endpoints (posts, categories, stats, sitemap)
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')  # memory, disk, redis or none
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1000))  # LRU size (memory and disk backends)
+CACHE_DIR = Path(os.getenv('CACHE_DIR', str(DATABASE_DIR / 'cache')))  # Disk backend directory
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')  # Redis backend server
+CACHE_TTL_SECONDS = int(os.getenv('CACHE_TTL_SECONDS', 3600))  # Redis entry lifetime (0 = no expiry)
+
+# API response JSON encoding: 'orjson' (used when installed) or 'stdlib'
+JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+
+# Sitemap generation
+SITEMAP_FETCH_SIZE = int(os.getenv('SITEMAP_FETCH_SIZE', 1000))  # Rows read from the database cursor at a time
+# Past this many published posts /sitemap.xml becomes an index of shards covering this many post ids each.
+# Keep it below 50,000 URLs and small enough that a shard stays under 50 MB (video entries are up to ~2.5 KB)
+SITEMAP_SHARD_SIZE = int(os.getenv('SITEMAP_SHARD_SIZE', 10000))
+# Write sitemap files (.xml and .xml.gz) after each import and serve them instead of building XML per request
+SITEMAP_PRECOMPUTE = os.getenv('SITEMAP_PRECOMPUTE', 'True').lower() == 'true'
+SITEMAP_DIR = Path(os.getenv('SITEMAP_DIR', str(DATABASE_DIR / 'sitemaps')))
+# Sitemap families listed in the index: 'posts' (all posts), 'videos' (posts with a video) and
+# 'categories' (one family per category). Anything but 'posts' alone makes /sitemap.xml an index
+SITEMAP_FAMILIES = [name.strip() for name in os.getenv('SITEMAP_FAMILIES', 'posts').split(',') if name.strip()]
+# Extension blocks ('video', 'image') written in the entries of each family
+SITEMAP_BLOCKS = {
+    'posts': [name.strip() for name in os.getenv('SITEMAP_POSTS_BLOCKS', 'video,image').split(',') if name.strip()],
+    'videos': [name.strip() for name in os.getenv('SITEMAP_VIDEOS_BLOCKS', 'video').split(',') if name.strip()],
+    'categories': [name.strip() for name in os.getenv('SITEMAP_CATEGORIES_BLOCKS', 'image').split(',') if name.strip()],
+}
 
 # Frontend/Backend URLs
 BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:5000')  # e.g., https://myserverwebsite.com
@@ -44,6 +87,11 @@ DEFAULT_IMAGE = f'{SITE_URL}/default-thumbnail.jpg'
 AUTO_PROCESS_ENABLED = os.getenv('AUTO_PROCESS_ENABLED', 'True').lower() == 'true'
 CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 5))  # Check for updates every 5 minutes
 CRON_SCHEDULE = os.getenv('CRON_SCHEDULE', '')  # Optional cron expression (e.g., "0 */6 * * *")
+# How the data file is watched: 'auto' (inotify on Linux, polling elsewhere), 'inotify' or 'poll'.
+# With inotify, changes are processed right after the writer closes or renames the file,
+# and the CHECK_INTERVAL_MINUTES job is not scheduled
+WATCH_BACKEND = os.getenv('WATCH_BACKEND', 'auto')
+WATCH_DEBOUNCE_SECONDS = float(os.getenv('WATCH_DEBOUNCE_SECONDS', 2))  # Quiet time after the last write event
 
 # Logging configuration
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
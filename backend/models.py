@@ -4,11 +4,78 @@ Uses SQLAlchemy ORM for database interactions.
 """
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import Index, UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint, delete, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import deferred
 import json
+import logging
+
+from utils.json_provider import RawJSON
 
 db = SQLAlchemy()
 
+logger = logging.getLogger(__name__)
+
+# Posts per chunk when rebuilding category/tag association rows
+TERM_SYNC_CHUNK = 500
+
+# Generations of post changes kept for in-memory indexes catching up (see PostChange)
+POST_CHANGE_HISTORY = 1000
+
+
+# Serialized post fields, in output order
+POST_FIELDS = (
+    'id', 'page_number', 'article_number', 'url', 'slug', 'title', 'body',
+    'thumbnail', 'video_url', 'video_width', 'video_height', 'video_duration',
+    'video_duration_seconds', 'video_type', 'categories', 'tags',
+    # SEO fields for ranking
+    'meta_title', 'meta_description', 'meta_keywords', 'canonical_url',
+    'focus_keyword', 'long_tail_keywords', 'structured_data',
+    'is_published', 'created_at', 'updated_at',
+)
+
+# Predefined field sets for the `fields=` query parameter
+POST_VIEWS = {
+    'card': ('id', 'slug', 'title', 'thumbnail', 'video_duration', 'video_duration_seconds'),
+    'full': POST_FIELDS,
+}
+
+# Serialized name -> column name, where they differ
+POST_FIELD_COLUMNS = {'url': 'original_url'}
+
+# JSON array columns decoded on output
+POST_LIST_FIELDS = ('categories', 'tags', 'long_tail_keywords')
+
+
+def resolve_post_fields(spec, default='full'):
+    """
+    Parse a `fields=` parameter into serialized field names.
+
+    Args:
+        spec: A view name from POST_VIEWS, or comma-separated field names
+        default: View used when spec is empty
+
+    Returns:
+        Tuple of field names
+
+    Raises:
+        ValueError: If a field or view name is unknown
+    """
+    spec = (spec or default).strip()
+    if spec in POST_VIEWS:
+        return POST_VIEWS[spec]
+
+    fields = tuple(dict.fromkeys(name.strip() for name in spec.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in POST_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown) or spec}")
+    return fields
+
+
+def unique_terms(terms):
+    """Drop empty and repeated names from a category/tag list, keeping order"""
+    return list(dict.fromkeys(term for term in (terms or []) if term))
+
 
 class Post(db.Model):
     """
@@ -30,7 +97,8 @@ class Post(db.Model):
 
     # Content fields
     title = db.Column(db.String(255), nullable=False, index=True)
-    body = db.Column(db.Text, nullable=False)
+    # Large columns are only loaded when accessed or requested (see Post.load_columns)
+    body = deferred(db.Column(db.Text, nullable=False), group='heavy')
 
     # Media fields
     thumbnail = db.Column(db.String(512), nullable=True)
@@ -45,14 +113,22 @@ class Post(db.Model):
     categories = db.Column(db.Text, nullable=True)  # JSON array stored as text
     tags = db.Column(db.Text, nullable=True)  # JSON array stored as text
 
+    # Indexed copies of categories/tags (kept in sync by set_categories/set_tags)
+    category_links = db.relationship('PostCategory', cascade='all, delete-orphan')
+    tag_links = db.relationship('PostTag', cascade='all, delete-orphan')
+
     # SEO fields (for search ranking)
     meta_title = db.Column(db.String(255), nullable=True)
     meta_description = db.Column(db.String(512), nullable=True)
     meta_keywords = db.Column(db.Text, nullable=True)
     canonical_url = db.Column(db.String(512), nullable=True)  # Prevents duplicate content
     focus_keyword = db.Column(db.String(255), nullable=True, index=True)  # Primary ranking keyword
-    long_tail_keywords = db.Column(db.Text, nullable=True)  # JSON array of long-tail keywords
-    structured_data = db.Column(db.Text, nullable=True)  # JSON-LD schema (Article + Video + Breadcrumb)
+    long_tail_keywords = deferred(
+        db.Column(db.Text, nullable=True), group='heavy'
+    )  # JSON array of long-tail keywords
+    structured_data = deferred(
+        db.Column(db.Text, nullable=True), group='heavy'
+    )  # JSON-LD schema (Article + Video + Breadcrumb)
 
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -67,19 +143,28 @@ class Post(db.Model):
     __table_args__ = (
         Index('idx_page_article', 'page_number', 'article_number'),
         Index('idx_created_published', 'created_at', 'is_published'),
+        Index('idx_created_id', 'created_at', 'id'),
     )
 
     def set_categories(self, categories_list):
-        """Store categories as JSON string"""
+        """Store categories as JSON string and refresh the post_categories rows"""
         self.categories = json.dumps(categories_list) if categories_list else None
+        # The listing index orders by created_at, so it must be known before the first flush
+        if self.created_at is None:
+            self.created_at = datetime.utcnow()
+        self.category_links = [
+            PostCategory(name=name, created_at=self.created_at)
+            for name in unique_terms(categories_list)
+        ]
 
     def get_categories(self):
         """Retrieve categories as Python list"""
         return json.loads(self.categories) if self.categories else []
 
     def set_tags(self, tags_list):
-        """Store tags as JSON string"""
+        """Store tags as JSON string and refresh the post_tags rows"""
         self.tags = json.dumps(tags_list) if tags_list else None
+        self.tag_links = [PostTag(name=name) for name in unique_terms(tags_list)]
 
     def get_tags(self):
         """Retrieve tags as Python list"""
@@ -93,42 +178,97 @@ class Post(db.Model):
         """Retrieve long-tail keywords as Python list"""
         return json.loads(self.long_tail_keywords) if self.long_tail_keywords else []
 
-    def to_dict(self):
-        """Convert model to dictionary for JSON serialization"""
-        return {
-            'id': self.id,
-            'page_number': self.page_number,
-            'article_number': self.article_number,
-            'url': self.original_url,
-            'slug': self.slug,
-            'title': self.title,
-            'body': self.body,
-            'thumbnail': self.thumbnail,
-            'video_url': self.video_url,
-            'video_width': self.video_width,
-            'video_height': self.video_height,
-            'video_duration': self.video_duration,
-            'video_duration_seconds': self.video_duration_seconds,
-            'video_type': self.video_type,
-            'categories': self.get_categories(),
-            'tags': self.get_tags(),
-            # SEO fields for ranking
-            'meta_title': self.meta_title,
-            'meta_description': self.meta_description,
-            'meta_keywords': self.meta_keywords,
-            'canonical_url': self.canonical_url,
-            'focus_keyword': self.focus_keyword,
-            'long_tail_keywords': self.get_long_tail_keywords(),
-            'structured_data': json.loads(self.structured_data) if self.structured_data else None,
-            'is_published': self.is_published,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-        }
+    @classmethod
+    def load_columns(cls, fields):
+        """
+        Column attributes needed to serialize the given fields, for load_only().
+
+        Args:
+            fields: Serialized field names
+
+        Returns:
+            List of column attributes
+        """
+        return [getattr(cls, POST_FIELD_COLUMNS.get(name, name)) for name in fields]
+
+    def to_dict(self, fields=None, raw_json=False):
+        """
+        Convert model to dictionary for JSON serialization.
+
+        Args:
+            fields: Field names to include (see POST_VIEWS); all fields if None
+            raw_json: Return structured_data as RawJSON (embedded in responses
+                without decoding) instead of a parsed dict
+
+        Returns:
+            Dictionary of serialized fields
+        """
+        data = {}
+        for name in fields or POST_FIELDS:
+            value = getattr(self, POST_FIELD_COLUMNS.get(name, name))
+            if name in POST_LIST_FIELDS:
+                value = json.loads(value) if value else []
+            elif name == 'structured_data':
+                if value:
+                    value = RawJSON(value) if raw_json else json.loads(value)
+                else:
+                    value = None
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            data[name] = value
+        return data
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a post from raw column values, including its category/tag rows"""
+        post = cls(**row)
+        post.set_categories(post.get_categories())
+        post.set_tags(post.get_tags())
+        return post
 
     def __repr__(self):
         return f'<Post {self.id}: {self.title[:50]}>'
 
 
+class PostCategory(db.Model):
+    """
+    One row per (post, category) pair.
+    Lets category filters and counts run as indexed SQL instead of
+    decoding Post.categories for every row.
+    """
+    __tablename__ = 'post_categories'
+
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    name = db.Column(db.String(255), primary_key=True)
+    created_at = db.Column(db.DateTime, nullable=True)  # Copy of Post.created_at for ordered listings
+
+    __table_args__ = (
+        # Serves category listings ordered by (created_at, id) without touching posts
+        Index('idx_post_categories_listing', 'name', 'created_at', 'post_id'),
+    )
+
+    def __repr__(self):
+        return f'<PostCategory {self.post_id}: {self.name}>'
+
+
+class PostTag(db.Model):
+    """
+    One row per (post, tag) pair.
+    Indexed counterpart of Post.tags.
+    """
+    __tablename__ = 'post_tags'
+
+    post_id = db.Column(db.Integer, db.ForeignKey('posts.id', ondelete='CASCADE'), primary_key=True)
+    name = db.Column(db.String(255), primary_key=True)
+
+    __table_args__ = (
+        Index('idx_post_tags_name', 'name', 'post_id'),
+    )
+
+    def __repr__(self):
+        return f'<PostTag {self.post_id}: {self.name}>'
+
+
 class ProcessingLog(db.Model):
     """
     Logs for tracking bulk processing operations.
@@ -142,11 +282,48 @@ class ProcessingLog(db.Model):
     total_articles = db.Column(db.Integer, default=0)
     processed_articles = db.Column(db.Integer, default=0)
     created_posts = db.Column(db.Integer, default=0)
+    updated_posts = db.Column(db.Integer, default=0)
     skipped_duplicates = db.Column(db.Integer, default=0)
+    unchanged_articles = db.Column(db.Integer, default=0)
     errors = db.Column(db.Integer, default=0)
     status = db.Column(db.String(50), default='running', index=True)
     error_details = db.Column(db.Text, nullable=True)
 
+    # Resume support
+    data_file = db.Column(db.String(1024), nullable=True)
+    checkpoint = db.Column(db.Text, nullable=True)  # JSON: last committed batch position in the data file
+
+    # Instrumentation
+    timings = db.Column(db.Text, nullable=True)  # JSON: per-stage timings (see utils.stage_timer)
+
+    # Coalesced triggers: the log of the follow-up run that processed their request
+    merged_into_id = db.Column(db.Integer, nullable=True)
+
+    __table_args__ = (
+        Index('idx_started_id', 'started_at', 'id'),
+    )
+
+    def set_checkpoint(self, checkpoint):
+        """Store checkpoint as JSON string"""
+        self.checkpoint = json.dumps(checkpoint) if checkpoint else None
+
+    def get_checkpoint(self):
+        """Retrieve checkpoint as Python dict"""
+        return json.loads(self.checkpoint) if self.checkpoint else None
+
+    def set_timings(self, timings):
+        """Store stage timings as JSON string"""
+        self.timings = json.dumps(timings) if timings else None
+
+    def get_timings(self):
+        """Retrieve stage timings as Python dict"""
+        return json.loads(self.timings) if self.timings else None
+
+    @classmethod
+    def recent(cls, limit: int = 5):
+        """Most recently started logs, newest first"""
+        return cls.query.order_by(cls.started_at.desc()).limit(limit).all()
+
     def to_dict(self):
         """Convert log to dictionary"""
         return {
@@ -156,11 +333,378 @@ class ProcessingLog(db.Model):
             'total_articles': self.total_articles,
             'processed_articles': self.processed_articles,
             'created_posts': self.created_posts,
+            'updated_posts': self.updated_posts,
             'skipped_duplicates': self.skipped_duplicates,
+            'unchanged_articles': self.unchanged_articles,
             'errors': self.errors,
             'status': self.status,
             'error_details': self.error_details,
+            'data_file': self.data_file,
+            'checkpoint': self.get_checkpoint(),
+            'timings': self.get_timings(),
+            'merged_into_id': self.merged_into_id,
         }
 
     def __repr__(self):
         return f'<ProcessingLog {self.id}: {self.status}>'
+
+
+class ArticleFingerprint(db.Model):
+    """
+    Content fingerprint of the last ingested version of each scraped article.
+    Lets incremental runs skip articles that have not changed since the previous run.
+    """
+    __tablename__ = 'article_fingerprints'
+
+    original_url = db.Column(db.String(512), primary_key=True)
+    page_number = db.Column(db.Integer, nullable=False)
+    article_number = db.Column(db.Integer, nullable=False)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<ArticleFingerprint {self.original_url}: {self.fingerprint[:12]}>'
+
+
+class PostCounter(db.Model):
+    """
+    Materialized post counts, updated in the same transaction as every
+    post write so stats endpoints never scan the posts table.
+    Scope 'all' has a single row (name ''); scope 'category' has one row
+    per category name.
+    """
+    __tablename__ = 'post_counters'
+
+    scope = db.Column(db.String(20), primary_key=True)
+    name = db.Column(db.String(255), primary_key=True)
+    published = db.Column(db.Integer, nullable=False, default=0)
+    unpublished = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<PostCounter {self.scope}:{self.name} {self.published}/{self.unpublished}>'
+
+
+def counter_deltas(posts, sign=1, deltas=None):
+    """
+    Accumulate counter changes for posts being added or removed.
+
+    Args:
+        posts: Iterable of (categories list, is_published) pairs
+        sign: 1 for added posts, -1 for removed posts
+        deltas: Existing dict to add to
+
+    Returns:
+        Dict mapping (scope, name) to [published change, unpublished change]
+    """
+    deltas = {} if deltas is None else deltas
+
+    for categories, is_published in posts:
+        # Unflushed posts have no value yet; the column default is published
+        column = 0 if is_published is not False else 1
+        for key in [('all', '')] + [('category', name) for name in unique_terms(categories)]:
+            deltas.setdefault(key, [0, 0])[column] += sign
+
+    return deltas
+
+
+def apply_counter_deltas(deltas):
+    """
+    Add counter changes with atomic upserts. Does not commit, so the
+    counters commit or roll back together with the post writes.
+
+    Args:
+        deltas: Dict as returned by counter_deltas
+    """
+    rows = [
+        {'scope': scope, 'name': name, 'published': published, 'unpublished': unpublished}
+        for (scope, name), (published, unpublished) in deltas.items()
+        if published or unpublished
+    ]
+    if not rows:
+        return
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('sqlite', 'postgresql'):
+        insert_stmt = (sqlite if dialect == 'sqlite' else postgresql).insert(PostCounter)
+        stmt = insert_stmt.on_conflict_do_update(
+            index_elements=[PostCounter.scope, PostCounter.name],
+            set_={
+                'published': PostCounter.published + insert_stmt.excluded.published,
+                'unpublished': PostCounter.unpublished + insert_stmt.excluded.unpublished,
+            }
+        )
+        for row in rows:
+            db.session.execute(stmt, row)
+        return
+
+    for row in rows:
+        counter = db.session.get(PostCounter, (row['scope'], row['name']))
+        if counter is None:
+            db.session.add(PostCounter(**row))
+        else:
+            counter.published += row['published']
+            counter.unpublished += row['unpublished']
+    db.session.flush()
+
+
+def rebuild_post_counters():
+    """
+    Recompute every counter from posts and post_categories.
+    Used to initialize the table and to repair drift. Does not commit.
+    """
+    published = db.case((Post.is_published.is_(False), 0), else_=1)
+    unpublished = db.case((Post.is_published.is_(False), 1), else_=0)
+
+    rows = []
+    total = db.session.execute(
+        select(db.func.coalesce(db.func.sum(published), 0), db.func.coalesce(db.func.sum(unpublished), 0))
+    ).one()
+    rows.append({'scope': 'all', 'name': '', 'published': total[0], 'unpublished': total[1]})
+
+    categories = db.session.execute(
+        select(PostCategory.name, db.func.sum(published), db.func.sum(unpublished))
+        .join(Post, Post.id == PostCategory.post_id)
+        .group_by(PostCategory.name)
+    ).all()
+    rows += [
+        {'scope': 'category', 'name': name, 'published': count, 'unpublished': hidden}
+        for name, count, hidden in categories
+    ]
+
+    db.session.execute(delete(PostCounter))
+    db.session.execute(insert(PostCounter), rows)
+
+
+def ensure_post_counters():
+    """
+    Fill post_counters the first time it exists on a database with posts.
+    Must be called inside an application context.
+    """
+    if db.session.get(PostCounter, ('all', '')) is None:
+        rebuild_post_counters()
+        db.session.commit()
+        logger.info("Initialized post counters")
+
+
+class CacheGeneration(db.Model):
+    """
+    Single-row counter of content changes. Every transaction that changes
+    what the read endpoints return bumps it, and response cache keys include
+    it, so a commit invalidates cached responses in all worker processes.
+    """
+    __tablename__ = 'cache_generation'
+
+    id = db.Column(db.Integer, primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    changed_at = db.Column(db.DateTime, default=datetime.utcnow)  # Last-Modified of listings
+
+    def __repr__(self):
+        return f'<CacheGeneration {self.value}>'
+
+
+class PostChange(db.Model):
+    """
+    Posts written under each cache generation, recorded by bump_cache_generation.
+    Lets the in-memory indexes of every worker process (services.suggest_index)
+    catch up by re-reading only the changed posts. Only the last
+    POST_CHANGE_HISTORY generations are kept.
+    """
+    __tablename__ = 'post_changes'
+
+    generation = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    post_ids = db.Column(db.Text, nullable=True)  # JSON list; NULL when the changed posts are unknown
+
+    def get_post_ids(self):
+        """Changed post ids, or None if the bump did not say which posts changed"""
+        return json.loads(self.post_ids) if self.post_ids is not None else None
+
+    def __repr__(self):
+        return f'<PostChange {self.generation}>'
+
+
+def bump_cache_generation(post_ids=None) -> int:
+    """
+    Increment the cache generation. Does not commit, so cached responses are
+    invalidated exactly when the surrounding write transaction commits.
+
+    Args:
+        post_ids: Ids of the posts created, updated or deleted by the transaction;
+            None if unknown (in-memory indexes then rebuild from scratch)
+
+    Returns:
+        The new generation; the row stays locked by this transaction, so it
+        is the value its commit publishes
+    """
+    result = db.session.execute(
+        update(CacheGeneration).where(CacheGeneration.id == 1)
+        .values(value=CacheGeneration.value + 1, changed_at=datetime.utcnow())
+    )
+    if result.rowcount == 0:
+        db.session.add(CacheGeneration(id=1, value=1, changed_at=datetime.utcnow()))
+        db.session.flush()
+    generation = db.session.execute(select(CacheGeneration.value).where(CacheGeneration.id == 1)).scalar_one()
+
+    db.session.execute(delete(PostChange).where(PostChange.generation <= generation - POST_CHANGE_HISTORY))
+    db.session.merge(PostChange(
+        generation=generation,
+        post_ids=json.dumps(sorted(set(post_ids))) if post_ids is not None else None
+    ))
+    return generation
+
+
+def get_post_changes(after: int, up_to: int):
+    """
+    Posts changed by the generations after one generation up to another.
+
+    Args:
+        after: Generation already seen
+        up_to: Generation to catch up to
+
+    Returns:
+        Set of changed post ids, or None if some of those changes are unknown
+        or no longer recorded
+    """
+    if up_to < after:
+        return None
+    changes = PostChange.query.filter(PostChange.generation > after, PostChange.generation <= up_to).all()
+    if len(changes) != up_to - after:
+        return None
+
+    post_ids = set()
+    for change in changes:
+        ids = change.get_post_ids()
+        if ids is None:
+            return None
+        post_ids.update(ids)
+    return post_ids
+
+
+def get_cache_generation():
+    """
+    Read the current cache generation.
+
+    Returns:
+        Tuple of (generation, time of the last bump); (0, None) before the first bump
+    """
+    row = db.session.execute(
+        select(CacheGeneration.value, CacheGeneration.changed_at).where(CacheGeneration.id == 1)
+    ).first()
+    return (row.value, row.changed_at) if row else (0, None)
+
+
+def ensure_cache_generation() -> bool:
+    """
+    Create the cache generation row if it is missing.
+    Must be called inside an application context.
+
+    Returns:
+        True if the row was created (a new or recreated database)
+    """
+    if db.session.get(CacheGeneration, 1) is not None:
+        return False
+
+    db.session.add(CacheGeneration(id=1, value=0))
+    db.session.commit()
+    return True
+
+
+def upgrade_schema():
+    """
+    Add columns that were introduced after a table was first created.
+    db.create_all() only creates missing tables, so existing databases are
+    brought up to date with ALTER TABLE ... ADD COLUMN (new columns are nullable)
+    and CREATE INDEX for indexes added to existing tables.
+    Must be called inside an application context, after db.create_all().
+    """
+    inspector = inspect(db.engine)
+
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            db.session.execute(db.text(
+                f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'
+            ))
+            logger.info(f"Added column {table.name}.{column.name}")
+
+        existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind=db.session.connection())
+                logger.info(f"Created index {index.name} on {table.name}")
+
+    db.session.commit()
+
+
+def sync_post_terms(post_ids):
+    """
+    Rebuild post_categories/post_tags rows for the given posts from their
+    JSON columns. Used by bulk writes that bypass set_categories/set_tags.
+    Does not commit.
+
+    Args:
+        post_ids: Iterable of post ids
+    """
+    post_ids = list(post_ids)
+
+    for i in range(0, len(post_ids), TERM_SYNC_CHUNK):
+        chunk = post_ids[i:i + TERM_SYNC_CHUNK]
+        rows = db.session.execute(
+            select(Post.id, Post.created_at, Post.categories, Post.tags).where(Post.id.in_(chunk))
+        ).all()
+
+        category_rows = []
+        tag_rows = []
+        for post_id, created_at, categories, tags in rows:
+            category_rows += [
+                {'post_id': post_id, 'name': name, 'created_at': created_at}
+                for name in unique_terms(json.loads(categories) if categories else [])
+            ]
+            tag_rows += [
+                {'post_id': post_id, 'name': name}
+                for name in unique_terms(json.loads(tags) if tags else [])
+            ]
+
+        for model, term_rows in ((PostCategory, category_rows), (PostTag, tag_rows)):
+            db.session.execute(delete(model).where(model.post_id.in_(chunk)))
+            if term_rows:
+                db.session.execute(insert(model), term_rows)
+
+
+def backfill_post_terms() -> int:
+    """
+    Populate post_categories/post_tags for every existing post, then
+    recompute post_counters from them.
+    Safe to re-run; each chunk of posts is rebuilt and committed in turn.
+
+    Returns:
+        Number of posts processed
+    """
+    processed = 0
+    last_id = 0
+
+    while True:
+        post_ids = db.session.execute(
+            select(Post.id).where(Post.id > last_id).order_by(Post.id).limit(TERM_SYNC_CHUNK)
+        ).scalars().all()
+        if not post_ids:
+            break
+
+        sync_post_terms(post_ids)
+        db.session.commit()
+        processed += len(post_ids)
+        last_id = post_ids[-1]
+        logger.info(f"Backfilled categories and tags for {processed} posts")
+
+    # Category counters are derived from post_categories
+    rebuild_post_counters()
+    bump_cache_generation()
+    db.session.commit()
+
+    return processed
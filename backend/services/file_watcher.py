@@ -2,17 +2,31 @@
 File Watcher Service
 Monitors the scraped_pages.json file for changes and triggers automatic processing.
 Uses file modification time to detect updates.
+On Linux the file is watched with inotify: a change is picked up as soon
+as the writer closes the file or renames a new copy into place, once no
+further event arrives for a short debounce period. Elsewhere (or when
+inotify cannot be set up) the file is polled every check_interval seconds.
 """
 import os
 import time
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Callable
 import hashlib
 
+from utils.inotify import (
+    Inotify, inotify_available,
+    IN_CLOSE_WRITE, IN_DELETE_SELF, IN_IGNORED, IN_MOVE_SELF, IN_MOVED_TO, IN_ONLYDIR, IN_Q_OVERFLOW
+)
+
 logger = logging.getLogger(__name__)
 
+# Events on the data file's directory: the file written in place or renamed into place,
+# and the directory itself going away
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
 
 class FileWatcher:
     """
@@ -35,6 +49,9 @@ class FileWatcher:
         self.last_modified = None
         self.last_hash = None
         self.is_running = False
+        self.mode = 'poll'
+        # The watcher thread and manual checks (API, scheduler) share the tracked state
+        self.lock = threading.Lock()
 
         logger.info(f"FileWatcher initialized for {self.file_path}")
 
@@ -66,9 +83,16 @@ class FileWatcher:
         Returns:
             True if file has changed, False otherwise
         """
+        with self.lock:
+            return self._file_changed()
+
+    def _file_changed(self) -> bool:
         try:
             if not self.file_path.exists():
                 logger.warning(f"File does not exist: {self.file_path}")
+                # A file created later is new data, not the initial state
+                if self.last_modified is None:
+                    self.last_modified = 0
                 return False
 
             # Get current modification time
@@ -81,8 +105,8 @@ class FileWatcher:
                 logger.info("Initial file state recorded")
                 return False
 
-            # Check if modification time changed
-            if current_modified > self.last_modified:
+            # Check if modification time changed (a file renamed into place can be older)
+            if current_modified != self.last_modified:
                 # Verify content actually changed by comparing hashes
                 current_hash = self.get_file_hash(self.file_path)
 
@@ -128,6 +152,7 @@ class FileWatcher:
         Use start_background() for non-blocking operation.
         """
         self.is_running = True
+        self.mode = 'poll'
         logger.info(f"Starting file watcher (check interval: {self.check_interval}s)")
 
         try:
@@ -164,13 +189,116 @@ class FileWatcher:
         return False
 
 
+class EventFileWatcher(FileWatcher):
+    """
+    FileWatcher driven by inotify events on the file's directory.
+    Watching the directory rather than the file keeps working when the
+    writer replaces the file with a rename. Bursts of events are debounced:
+    the file is checked (mtime and hash, as when polling) once no event has
+    arrived for debounce seconds. Falls back to polling if inotify cannot
+    be set up or the directory disappears.
+    """
+
+    def __init__(self, file_path: Path, callback: Optional[Callable] = None,
+                 check_interval: int = 60, debounce: float = 2.0):
+        """
+        Initialize the watcher.
+
+        Args:
+            file_path: Path to the file to watch
+            callback: Function to call when file changes (receives file_path as argument)
+            check_interval: Polling interval in seconds if events are unavailable
+            debounce: Seconds without events before the file is checked
+        """
+        super().__init__(file_path, callback=callback, check_interval=check_interval)
+        self.debounce = debounce
+        self.wake_read, self.wake_write = os.pipe()
+
+    def start(self):
+        """
+        Start watching the file.
+        This is a blocking call that runs until stop() is called.
+        """
+        self.is_running = True
+        try:
+            with Inotify() as inotify:
+                inotify.add_watch(self.file_path.parent, WATCH_MASK)
+                self.mode = 'inotify'
+                logger.info(f"Starting file watcher (inotify, debounce: {self.debounce}s)")
+
+                # Record the current state so the first event is compared against it
+                self.file_changed()
+                self.watch(inotify)
+        except OSError as e:
+            if not self.is_running:
+                return
+            logger.warning(f"File events unavailable, falling back to polling: {str(e)}")
+            super().start()
+        except Exception as e:
+            logger.error(f"File watcher error: {str(e)}", exc_info=True)
+            self.is_running = False
+
+    def watch(self, inotify: Inotify):
+        """
+        Event loop: wait for events on the data file, check it once they settle.
+
+        Raises:
+            OSError: If the watched directory was removed or moved
+        """
+        deadline = None
+        while self.is_running:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            for mask, name in inotify.read(timeout, wake_fd=self.wake_read):
+                if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                    raise OSError(f"Watched directory {self.file_path.parent} was removed or moved")
+                # A queue overflow may have dropped the event we wanted
+                if name == self.file_path.name or mask & IN_Q_OVERFLOW:
+                    deadline = time.monotonic() + self.debounce
+
+            if deadline is not None and time.monotonic() >= deadline:
+                deadline = None
+                if self.file_changed():
+                    self.on_file_change()
+
+    def stop(self):
+        """Stop the file watcher (wakes up a blocked event loop)"""
+        super().stop()
+        os.write(self.wake_write, b'\0')
+
+
+def create_file_watcher(file_path: Path, callback: Optional[Callable] = None, check_interval: int = 60,
+                        backend: str = 'auto', debounce: float = 2.0) -> FileWatcher:
+    """
+    Build the watcher selected by config.WATCH_BACKEND.
+
+    Args:
+        file_path: Path to the file to watch
+        callback: Function to call when file changes
+        check_interval: Polling interval in seconds
+        backend: 'auto' (inotify where available, else polling), 'inotify' or 'poll'
+        debounce: Seconds without events before an event-driven check
+
+    Returns:
+        EventFileWatcher or FileWatcher
+    """
+    backend = (backend or 'auto').lower()
+    if backend not in ('auto', 'inotify', 'poll'):
+        raise ValueError(f"Unknown WATCH_BACKEND: {backend}")
+    if backend == 'inotify' and not inotify_available():
+        logger.warning("WATCH_BACKEND=inotify but inotify is not available here, polling instead")
+    if backend != 'poll' and inotify_available():
+        return EventFileWatcher(file_path, callback=callback, check_interval=check_interval, debounce=debounce)
+    return FileWatcher(file_path, callback=callback, check_interval=check_interval)
+
+
 class DataFileMonitor:
     """
     Specialized monitor for scraped_pages.json file.
     Integrates with Flask app for automatic post processing.
     """
 
-    def __init__(self, app, file_path: Path, check_interval: int = 60):
+    def __init__(self, app, file_path: Path, check_interval: int = 60, resume: bool = False,
+                 backend: str = 'poll', debounce: float = 2.0):
         """
         Initialize data file monitor.
 
@@ -178,13 +306,21 @@ class DataFileMonitor:
             app: Flask application instance
             file_path: Path to scraped_pages.json
             check_interval: Check interval in seconds
+            resume: Continue an interrupted run from its checkpoint instead of starting over
+            backend: Watcher backend, 'auto', 'inotify' or 'poll' (see create_file_watcher)
+            debounce: Seconds without file events before processing starts
         """
         self.app = app
         self.file_path = file_path
         self.check_interval = check_interval
+        self.resume = resume
+        self.backend = backend
+        self.debounce = debounce
         self.watcher = None
+        self.thread = None
         self.processing_count = 0
         self.last_processed = None
+        self.last_status = None  # 'completed', 'coalesced' or 'failed' for the latest change
 
     def process_new_data(self, file_path: Path):
         """
@@ -198,11 +334,15 @@ class DataFileMonitor:
         logger.info("=" * 60)
 
         try:
-            from services.post_processor import PostProcessor
+            from services.import_lock import run_import
 
-            with self.app.app_context():
-                processor = PostProcessor(app=self.app)
-                stats = processor.process_all_data(data_file=file_path)
+            result = run_import(self.app, data_file=file_path, resume=self.resume)
+
+            self.last_status = result['status']
+            if result['status'] == 'coalesced':
+                logger.info("Import already in progress - a follow-up run was queued")
+            else:
+                stats = result['statistics']
 
                 self.processing_count += 1
                 self.last_processed = datetime.utcnow()
@@ -216,20 +356,48 @@ class DataFileMonitor:
                 logger.info("=" * 60)
 
         except Exception as e:
+            self.last_status = 'failed'
             logger.error(f"Error in automatic processing: {str(e)}", exc_info=True)
 
     def start(self):
         """Start monitoring the data file"""
         logger.info(f"Starting data file monitor for {self.file_path}")
 
-        self.watcher = FileWatcher(
+        self.watcher = self.create_watcher()
+
+        # This is blocking - should be run in a separate thread
+        self.watcher.start()
+
+    def create_watcher(self) -> FileWatcher:
+        """Build the file watcher for the configured backend"""
+        return create_file_watcher(
             file_path=self.file_path,
             callback=self.process_new_data,
-            check_interval=self.check_interval
+            check_interval=self.check_interval,
+            backend=self.backend,
+            debounce=self.debounce
         )
 
-        # This is blocking - should be run in a separate thread
-        self.watcher.start()
+    @property
+    def event_driven(self) -> bool:
+        """Whether changes are reported by file events (no interval checks needed)"""
+        return (self.backend or 'auto').lower() != 'poll' and inotify_available()
+
+    def start_background(self) -> threading.Thread:
+        """
+        Start monitoring in a daemon thread.
+
+        Returns:
+            The watcher thread
+        """
+        self.thread = threading.Thread(target=self.start, name='data-file-monitor', daemon=True)
+        self.thread.start()
+        return self.thread
+
+    def stop(self):
+        """Stop monitoring"""
+        if self.watcher:
+            self.watcher.stop()
 
     def check_once(self) -> bool:
         """
@@ -237,14 +405,23 @@ class DataFileMonitor:
         Returns True if new data was processed.
         """
         if not self.watcher:
-            self.watcher = FileWatcher(
-                file_path=self.file_path,
-                callback=self.process_new_data,
-                check_interval=self.check_interval
-            )
+            self.watcher = self.create_watcher()
 
         return self.watcher.check_once()
 
+    def has_changed(self) -> bool:
+        """
+        Check for changes without processing them.
+        Lets callers hand the processing off to a background job.
+
+        Returns:
+            True if the data file changed since the last check
+        """
+        if not self.watcher:
+            self.watcher = self.create_watcher()
+
+        return self.watcher.file_changed()
+
     def get_status(self) -> dict:
         """
         Get current monitor status.
@@ -256,8 +433,12 @@ class DataFileMonitor:
             'is_running': self.watcher.is_running if self.watcher else False,
             'file_path': str(self.file_path),
             'check_interval': self.check_interval,
+            'backend': self.watcher.mode if self.watcher and self.watcher.is_running else self.backend,
+            'debounce_seconds': self.debounce,
+            'resume': self.resume,
             'processing_count': self.processing_count,
             'last_processed': self.last_processed.isoformat() if self.last_processed else None,
+            'last_status': self.last_status,
             'file_exists': self.file_path.exists(),
             'last_modified': datetime.fromtimestamp(
                 os.path.getmtime(self.file_path)
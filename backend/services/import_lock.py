@@ -0,0 +1,295 @@
+"""
+Import Lock Service
+Single-flight guard so only one bulk import runs at a time across threads and
+gunicorn worker processes. Concurrent triggers are coalesced into follow-up
+runs, one per distinct request, instead of importing the same data in parallel.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import config
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class ImportLock:
+    """
+    Cross-process single-flight lock backed by a file.
+    The lock itself is an exclusive flock on lock_path; a trigger that finds
+    the lock held adds its request to a pending file, which the current
+    holder picks up and runs once its import finishes. Identical requests
+    collapse into one follow-up run; requests with different files or
+    options each keep their own, so no trigger's options are lost.
+    """
+
+    def __init__(self, lock_path: Path):
+        """
+        Initialize the lock.
+
+        Args:
+            lock_path: Path of the lock file (created if missing)
+        """
+        self.lock_path = Path(lock_path)
+        self.pending_path = self.lock_path.with_name(self.lock_path.name + '.pending')
+        self.pending_lock_path = self.lock_path.with_name(self.lock_path.name + '.pending.lock')
+        # Without fcntl the guard only covers threads of this process
+        self.thread_lock = threading.Lock()
+        self.pending_lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Try to take the lock without blocking.
+
+        Returns:
+            Lock handle to pass to release(), or None if another import holds it
+        """
+        if fcntl is None:
+            return self.thread_lock if self.thread_lock.acquire(blocking=False) else None
+
+        handle = open(self.lock_path, 'a+')
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            handle.close()
+            return None
+
+        handle.seek(0)
+        handle.truncate()
+        handle.write(str(os.getpid()))
+        handle.flush()
+        return handle
+
+    def release(self, handle):
+        """Release a handle returned by try_acquire()"""
+        if fcntl is None:
+            handle.release()
+            return
+
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        handle.close()
+
+    def is_locked(self) -> bool:
+        """Check whether an import currently holds the lock"""
+        handle = self.try_acquire()
+        if handle is None:
+            return True
+        self.release(handle)
+        return False
+
+    @contextmanager
+    def pending_guard(self):
+        """Serialize reads and writes of the pending file across threads and processes"""
+        with self.pending_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.pending_lock_path, 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def read_pending(self) -> List[Dict]:
+        """Pending requests (call under pending_guard)"""
+        try:
+            pending = json.loads(self.pending_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return []
+        except ValueError:
+            logger.warning(f"Ignoring unreadable pending import requests in {self.pending_path}")
+            return []
+        # Files written before requests were queued hold a single request
+        return [pending] if isinstance(pending, dict) else pending
+
+    def request_follow_up(self, request: Dict):
+        """
+        Record a request to run once the current import finishes.
+        A request equal to a pending one (apart from coalesced_log_ids, which
+        are combined) joins it; any other request is queued after it.
+
+        Args:
+            request: JSON-serializable run parameters
+        """
+        with self.pending_guard():
+            pending = self.read_pending()
+            key = request_key(request)
+            for queued in pending:
+                if request_key(queued) == key:
+                    if request.get('coalesced_log_ids'):
+                        queued['coalesced_log_ids'] = queued.get('coalesced_log_ids', []) + request['coalesced_log_ids']
+                    break
+            else:
+                pending.append(request)
+
+            tmp_path = self.pending_path.with_name(f"{self.pending_path.name}.{os.getpid()}.{threading.get_ident()}")
+            tmp_path.write_text(json.dumps(pending), encoding='utf-8')
+            os.replace(tmp_path, self.pending_path)
+
+    def take_follow_up(self) -> Optional[List[Dict]]:
+        """
+        Claim every pending request, if any.
+
+        Returns:
+            Pending requests in the order they were queued, or None
+        """
+        with self.pending_guard():
+            pending = self.read_pending()
+            self.pending_path.unlink(missing_ok=True)
+        return pending or None
+
+    def run(self, request: Dict, runner: Callable[[Dict, bool], Dict]) -> Dict:
+        """
+        Run an import unless one is already in progress.
+        If the lock is free the request runs here, followed by any follow-ups
+        requested meanwhile. If the lock is held the request is queued as a
+        follow-up of the running import and this call returns at once.
+
+        Args:
+            request: JSON-serializable run parameters
+            runner: Callable(request, is_own_request) performing the import
+
+        Returns:
+            {'status': 'completed', 'statistics': ...} if this call ran its own request,
+            or {'status': 'coalesced', 'statistics': None} if it was handed off
+        """
+        handle = self.try_acquire()
+        own_request = request
+
+        if handle is None:
+            self.request_follow_up(request)
+            logger.info("Import already in progress - queued a follow-up run")
+
+            # The holder may have finished between our two checks
+            handle = self.try_acquire()
+            if handle is None:
+                return {'status': 'coalesced', 'statistics': None}
+            own_request = None
+
+        result = {'status': 'coalesced', 'statistics': None}
+
+        while handle is not None:
+            try:
+                if own_request is not None:
+                    result = {'status': 'completed', 'statistics': runner(own_request, True)}
+                    own_request = None
+
+                follow_ups = self.take_follow_up()
+                while follow_ups is not None:
+                    for follow_up in follow_ups:
+                        logger.info("Running queued follow-up import")
+                        try:
+                            runner(follow_up, False)
+                        except Exception as e:
+                            logger.error(f"Follow-up import failed: {str(e)}", exc_info=True)
+                    follow_ups = self.take_follow_up()
+            finally:
+                self.release(handle)
+                handle = None
+
+            # A request may have arrived after the last check but before release
+            if self.pending_path.exists():
+                handle = self.try_acquire()
+
+        return result
+
+
+def request_key(request: Dict) -> str:
+    """Identity of a run request: its parameters without the logs coalesced into it"""
+    return json.dumps({k: v for k, v in request.items() if k != 'coalesced_log_ids'}, sort_keys=True)
+
+
+_default_lock = None
+
+
+def get_import_lock() -> ImportLock:
+    """Get the process-wide lock for config.IMPORT_LOCK_FILE"""
+    global _default_lock
+    if _default_lock is None:
+        _default_lock = ImportLock(config.IMPORT_LOCK_FILE)
+    return _default_lock
+
+
+def run_import(
+    app,
+    data_file: Path,
+    resume: bool = False,
+    processor_options: Optional[Dict] = None,
+    log_id: Optional[int] = None
+) -> Dict:
+    """
+    Run a PostProcessor import under the single-flight lock.
+    Used by every trigger (scheduler, file monitor, job queue) so imports
+    never overlap. A coalesced request's ProcessingLog is marked 'coalesced'
+    and points (merged_into_id) at the log of the follow-up run that did its work.
+
+    Args:
+        app: Flask application instance
+        data_file: Path to the JSON data file
+        resume: Continue the last interrupted run of this file from its checkpoint
+        processor_options: Keyword arguments for PostProcessor
+        log_id: Existing ProcessingLog to run under (queued jobs); with resume,
+            it takes over the checkpoint of an interrupted run of the file
+
+    Returns:
+        {'status': 'completed' | 'coalesced', 'statistics': stats or None}
+    """
+    from models import db, ProcessingLog
+    from services.post_processor import PostProcessor
+
+    request = {
+        'data_file': str(data_file),
+        'resume': resume,
+        'processor_options': processor_options or {},
+        'coalesced_log_ids': [log_id] if log_id is not None else []
+    }
+
+    def runner(run_request: Dict, is_own_request: bool) -> Dict:
+        with app.app_context():
+            processor = PostProcessor(app=app, **run_request['processor_options'])
+            data_path = Path(run_request['data_file'])
+
+            processing_log = db.session.get(ProcessingLog, log_id) if is_own_request and log_id is not None else None
+            if processing_log is None:
+                processing_log = ProcessingLog(status='queued', data_file=str(data_path))
+                db.session.add(processing_log)
+                db.session.flush()
+
+            # Looked up here, under the lock, so the run found is never one still in progress
+            if run_request['resume']:
+                interrupted = processor.find_resumable_log(data_path, exclude_id=processing_log.id)
+                if interrupted is not None:
+                    processor.take_over_run(processing_log, interrupted)
+
+            if not is_own_request and run_request.get('coalesced_log_ids'):
+                ProcessingLog.query.filter(
+                    ProcessingLog.id.in_(run_request['coalesced_log_ids'])
+                ).update({'merged_into_id': processing_log.id}, synchronize_session=False)
+            db.session.commit()
+
+            return processor.process_all_data(data_file=data_path, log_id=processing_log.id)
+
+    result = get_import_lock().run(request, runner)
+
+    if result['status'] == 'coalesced' and log_id is not None:
+        with app.app_context():
+            processing_log = db.session.get(ProcessingLog, log_id)
+            if processing_log is not None and processing_log.status == 'queued':
+                processing_log.status = 'coalesced'
+                if processing_log.merged_into_id is not None:
+                    processing_log.error_details = f'Merged into processing log {processing_log.merged_into_id}'
+                else:
+                    processing_log.error_details = 'Merged into the follow-up of an import already in progress'
+                db.session.commit()
+
+    return result
@@ -0,0 +1,213 @@
+"""
+Job Queue Service
+Runs bulk processing jobs in a bounded in-process worker pool.
+Lets HTTP endpoints return immediately while imports run in the background.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from models import db, ProcessingLog
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs whose in-process info (source, error) is kept; older ones are
+# reported from their ProcessingLog alone
+FINISHED_JOBS_KEPT = 100
+
+
+class JobQueueFull(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs."""
+
+
+class JobQueue:
+    """
+    Bounded background queue for PostProcessor runs.
+    Each job is backed by a ProcessingLog row whose id is the job id, so job
+    status can be read from the database by any worker process.
+    """
+
+    def __init__(self, app, max_workers: int = 1, max_pending: int = 10):
+        """
+        Initialize the job queue.
+
+        Args:
+            app: Flask application instance
+            max_workers: Number of jobs that may run at the same time
+            max_pending: Maximum number of queued plus running jobs
+        """
+        self.app = app
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job-worker')
+        self.lock = threading.Lock()
+        self.jobs = {}  # job_id -> in-process info of queued and running jobs
+        self.finished = OrderedDict()  # job_id -> info of the last FINISHED_JOBS_KEPT finished jobs
+
+        logger.info(f"JobQueue initialized ({max_workers} workers, {max_pending} pending max)")
+
+    def pending_count(self) -> int:
+        """Number of jobs in this process that are queued or running."""
+        with self.lock:
+            return len(self.jobs)
+
+    def submit(
+        self,
+        data_file: Path,
+        resume: bool = False,
+        processor_options: Optional[Dict] = None,
+        source: str = 'api'
+    ) -> int:
+        """
+        Queue a processing run of the given data file.
+
+        Args:
+            data_file: Path to the JSON data file
+            resume: Continue the last interrupted run of this file from its checkpoint
+            processor_options: Keyword arguments for PostProcessor (bulk_insert, parallel, ...)
+            source: Who requested the job (for logging)
+
+        Returns:
+            Job id (the id of the job's ProcessingLog)
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running
+        """
+        processor_options = processor_options or {}
+
+        with self.lock:
+            if len(self.jobs) >= self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({self.max_pending} pending jobs)")
+
+            with self.app.app_context():
+                # An interrupted run to resume is looked up when the job runs, under the import lock
+                processing_log = ProcessingLog(status='queued', data_file=str(data_file))
+                db.session.add(processing_log)
+                db.session.commit()
+                job_id = processing_log.id
+
+            self.jobs[job_id] = {
+                'state': 'queued',
+                'source': source,
+                'submitted_at': datetime.utcnow(),
+                'finished_at': None,
+                'error': None
+            }
+
+        self.executor.submit(self.run_job, job_id, data_file, resume, processor_options)
+        logger.info(f"Queued processing job {job_id} (source: {source})")
+        return job_id
+
+    def run_job(self, job_id: int, data_file: Path, resume: bool, processor_options: Dict):
+        """
+        Worker entry point: run PostProcessor against the job's ProcessingLog.
+        Goes through the single-flight import lock, so a job submitted while
+        another import runs is coalesced into that import's follow-up run.
+
+        Args:
+            job_id: Job id (ProcessingLog id)
+            data_file: Path to the JSON data file
+            resume: Continue the last interrupted run of this file from its checkpoint
+            processor_options: Keyword arguments for PostProcessor
+        """
+        from services.import_lock import run_import
+
+        with self.lock:
+            self.jobs[job_id]['state'] = 'running'
+
+        logger.info(f"Starting processing job {job_id}")
+
+        try:
+            result = run_import(
+                self.app,
+                data_file=data_file,
+                resume=resume,
+                processor_options=processor_options,
+                log_id=job_id
+            )
+
+            if result['status'] == 'coalesced':
+                logger.info(f"Processing job {job_id} coalesced into the import already in progress")
+            else:
+                stats = result['statistics']
+                logger.info(
+                    f"Processing job {job_id} completed - "
+                    f"Created: {stats['created']}, Skipped: {stats['skipped']}, Errors: {stats['errors']}"
+                )
+            state, error = result['status'], None
+
+        except Exception as e:
+            logger.error(f"Processing job {job_id} failed: {str(e)}", exc_info=True)
+            state, error = 'failed', str(e)
+
+        with self.lock:
+            job = self.jobs.pop(job_id)
+            job.update(state=state, error=error, finished_at=datetime.utcnow())
+            self.finished[job_id] = job
+            while len(self.finished) > FINISHED_JOBS_KEPT:
+                self.finished.popitem(last=False)
+
+    def get_job(self, job_id: int) -> Optional[Dict]:
+        """
+        Get job status and progress.
+        The total grows while the data file is streamed, so percent is approximate
+        until the run completes. Jobs of other processes, and finished jobs past
+        FINISHED_JOBS_KEPT, are reported from their ProcessingLog without a source.
+
+        Args:
+            job_id: Job id (ProcessingLog id)
+
+        Returns:
+            Dictionary with status information, or None if the job does not exist
+        """
+        processing_log = db.session.get(ProcessingLog, job_id)
+        if processing_log is None:
+            return None
+
+        total = processing_log.total_articles or 0
+        processed = processing_log.processed_articles or 0
+
+        with self.lock:
+            job = dict(self.jobs.get(job_id) or self.finished.get(job_id) or {})
+
+        submitted_at = job.get('submitted_at') or processing_log.started_at
+        finished_at = job.get('finished_at') or processing_log.completed_at
+        error = job.get('error')
+        if error is None and processing_log.status == 'failed':
+            error = processing_log.error_details
+
+        return {
+            'job_id': job_id,
+            'status': processing_log.status,
+            'progress': {
+                'processed': processed,
+                'total': total,
+                'percent': round(processed * 100.0 / total, 1) if total else None
+            },
+            'source': job.get('source'),
+            'submitted_at': submitted_at.isoformat() if submitted_at else None,
+            'finished_at': finished_at.isoformat() if finished_at else None,
+            'error': error,
+            'processing_log': processing_log.to_dict()
+        }
+
+    def get_status(self) -> Dict:
+        """
+        Get queue status.
+
+        Returns:
+            Dictionary with status information
+        """
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'pending': self.pending_count()
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and optionally wait for running ones"""
+        self.executor.shutdown(wait=wait)
@@ -4,13 +4,22 @@ Handles bulk processing of scraped articles into SEO-optimized posts.
 Includes duplicate detection, error handling, and progress tracking.
 """
 import json
+import os
+import time
+import hashlib
 import logging
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Optional
 from pathlib import Path
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
-from models import db, Post, ProcessingLog
+from models import (
+    db, Post, ProcessingLog, ArticleFingerprint,
+    sync_post_terms, counter_deltas, apply_counter_deltas, rebuild_post_counters, bump_cache_generation
+)
 from utils.seo_utils import (
     extract_slug_from_url,
     generate_meta_title,
@@ -23,12 +32,334 @@ from utils.seo_utils import (
     extract_focus_keyword,
     validate_required_fields
 )
+from utils.json_stream import iter_json_object
+from utils.stage_timer import StageTimer
+from services.sitemaps import get_sitemap_files
 import config
 
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Maximum number of bound parameters per IN (...) lookup (SQLite's default limit is 999)
+DUPLICATE_LOOKUP_CHUNK = 500
+
+# Post columns counter_states needs from newly written posts
+COUNTER_COLUMNS = ('is_published', 'categories')
+
+
+def counter_states(rows: Iterable[Dict]) -> List[Tuple[List[str], Optional[bool]]]:
+    """
+    Extract (categories, is_published) pairs from post column mappings for counter_deltas.
+
+    Args:
+        rows: Post column mappings (categories as JSON text)
+
+    Returns:
+        List of (categories list, is_published) tuples
+    """
+    return [
+        (json.loads(row['categories']) if row.get('categories') else [], row.get('is_published'))
+        for row in rows
+    ]
+
+
+def dialect_insert(model):
+    """
+    Build a dialect-specific INSERT for a model that supports ON CONFLICT clauses.
+
+    Args:
+        model: SQLAlchemy model class
+
+    Returns:
+        SQLite or PostgreSQL Insert construct
+
+    Raises:
+        ValueError: If the bound database dialect has no ON CONFLICT support
+    """
+    dialect = db.session.get_bind().dialect
+    if dialect.name == 'sqlite':
+        return sqlite.insert(model)
+    if dialect.name == 'postgresql':
+        return postgresql.insert(model)
+    raise ValueError(f"Bulk insert is not supported for dialect: {dialect.name}")
+
+
+def article_fingerprint(article: Dict) -> str:
+    """
+    Compute a stable content fingerprint for a scraped article.
+
+    Args:
+        article: Article dictionary as found in the data file
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON encoding
+    """
+    canonical = json.dumps(article, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def data_file_version(file_path: Path) -> Dict:
+    """
+    Identify the current contents of a data file, so a checkpoint is only
+    resumed against the version it was taken from.
+
+    Args:
+        file_path: Path to the data file
+
+    Returns:
+        Dictionary with size, mtime and SHA-256 hex digest of the file,
+        or None if it cannot be read (the run then fails while parsing it)
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': digest.hexdigest()}
+
+
+# ProcessingLog totals carried over when a run is resumed
+RUN_TOTAL_FIELDS = (
+    'total_articles', 'processed_articles', 'created_posts', 'updated_posts',
+    'skipped_duplicates', 'unchanged_articles', 'errors'
+)
+
+
+# Content columns copied from the scraped article, and which SEO columns depend on them
+CONTENT_FIELDS = (
+    'title', 'body', 'thumbnail', 'video_url', 'video_width', 'video_height',
+    'video_duration', 'video_duration_seconds', 'video_type', 'categories', 'tags'
+)
+SEO_DEPENDENCIES = {
+    'meta_title': {'title'},
+    'meta_description': {'title', 'body'},
+    'meta_keywords': {'tags', 'categories'},
+    'focus_keyword': {'title', 'tags'},
+    'long_tail_keywords': {'title', 'tags', 'categories'},
+    'structured_data': {
+        'title', 'body', 'thumbnail', 'video_url',
+        'video_duration_seconds', 'categories', 'tags'
+    },
+}
+
+
+def article_content(article: Dict) -> Dict:
+    """
+    Map a scraped article onto the Post content fields.
+    Categories and tags are returned as lists (not yet JSON-encoded).
+
+    Args:
+        article: Validated article dictionary containing video data
+
+    Returns:
+        Dictionary keyed by CONTENT_FIELDS
+    """
+    return {
+        'title': article['title'],
+        'body': article['body'],
+        'thumbnail': article.get('thumbnail'),
+        'video_url': article['video'],
+        'video_width': article.get('video_width'),
+        'video_height': article.get('video_height'),
+        'video_duration': article.get('video_duration'),
+        'video_duration_seconds': article.get('video_duration_seconds', 0),
+        'video_type': article.get('video_type', 'video'),
+        'categories': article.get('category', []),
+        'tags': article.get('tags', []),
+    }
+
+
+def derive_seo_fields(
+    content: Dict,
+    slug: str,
+    fields: Iterable[str],
+    published_at: datetime,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict:
+    """
+    Generate the requested SEO columns from post content.
+    Only the named fields are computed, so an update can regenerate just the
+    metadata affected by the content that changed (see SEO_DEPENDENCIES).
+
+    Args:
+        content: Content dictionary (see article_content)
+        slug: Post slug
+        fields: SEO column names to generate
+        published_at: Original publish date used in structured data
+        timings: Optional dict; seconds spent encoding JSON are added under 'serialize'
+
+    Returns:
+        Dictionary of generated SEO column values
+    """
+    fields = set(fields)
+    title = content['title']
+    categories = content['categories'] or []
+    tags = content['tags'] or []
+    seo = {}
+
+    # Generate SEO metadata for search ranking
+    if 'meta_title' in fields:
+        seo['meta_title'] = generate_meta_title(
+            title,
+            add_suffix=True,
+            site_name=config.SITE_NAME
+        )
+    if 'meta_description' in fields:
+        seo['meta_description'] = generate_meta_description(
+            content['body'],
+            title=title
+        )
+    if 'meta_keywords' in fields:
+        seo['meta_keywords'] = generate_meta_keywords(tags, categories)
+
+    # Extract focus keyword (primary ranking keyword)
+    if 'focus_keyword' in fields:
+        seo['focus_keyword'] = extract_focus_keyword(title, tags)
+
+    # Generate long-tail keywords for ranking
+    if 'long_tail_keywords' in fields:
+        long_tail_keywords = generate_long_tail_keywords(title, tags, categories)
+        seo['long_tail_keywords'] = json.dumps(long_tail_keywords) if long_tail_keywords else None
+
+    if 'structured_data' in fields:
+        # Generate complete structured data (Video + Article + Breadcrumb)
+        # This helps with Google rich results and search ranking
+        thumbnail = content['thumbnail'] or config.DEFAULT_IMAGE
+        post_data = {
+            'title': title,
+            'body': content['body'],
+            'video_url': content['video_url'],
+            'thumbnail': thumbnail,
+            'created_at': published_at,
+            'video_duration_seconds': content['video_duration_seconds'],
+            'categories': categories,
+            'tags': tags,
+            'slug': slug
+        }
+
+        # Video + Breadcrumb structured data
+        structured_data = generate_complete_structured_data(
+            post_data=post_data,
+            site_url=config.SITE_URL,
+            site_name=config.SITE_NAME
+        )
+
+        # Add Article schema for better search ranking
+        article_schema = generate_article_structured_data(
+            title=title,
+            description=content['body'],
+            author_name=config.SITE_NAME,
+            site_name=config.SITE_NAME,
+            site_url=config.SITE_URL,
+            slug=slug,
+            thumbnail_url=thumbnail,
+            publish_date=published_at,
+            modified_date=datetime.utcnow(),
+            categories=categories,
+            tags=tags
+        )
+
+        # Combine all structured data
+        serialize_started = time.perf_counter()
+        all_schemas = json.loads(structured_data)
+        all_schemas.append(article_schema)
+        seo['structured_data'] = json.dumps(all_schemas, indent=2)
+        if timings is not None:
+            timings['serialize'] = timings.get('serialize', 0.0) + time.perf_counter() - serialize_started
+
+    return seo
+
+
+def encode_content(content: Dict) -> Dict:
+    """
+    Convert a content dictionary to column values (categories/tags as JSON text).
+
+    Args:
+        content: Content dictionary (see article_content)
+
+    Returns:
+        Dictionary of Post column values
+    """
+    row = dict(content)
+    row['categories'] = json.dumps(content['categories']) if content['categories'] else None
+    row['tags'] = json.dumps(content['tags']) if content['tags'] else None
+    return row
+
+
+def derive_post_row(
+    article: Dict,
+    page_number: int,
+    article_number: int,
+    timings: Optional[Dict[str, float]] = None
+) -> Dict:
+    """
+    Derive the column values for a new post, including all SEO metadata.
+    Pure function of the article (no database access), so it can run in a
+    worker process. The mapping can be used for Post.from_row(row) or a bulk INSERT.
+
+    Args:
+        article: Validated article dictionary containing video data
+        page_number: Page number from scraped data
+        article_number: Article number within the page
+        timings: Optional dict collecting serialization time (see derive_seo_fields)
+
+    Returns:
+        Dictionary of Post column values
+    """
+    original_url = article['url']
+    slug = extract_slug_from_url(original_url)
+    content = article_content(article)
+    now = datetime.utcnow()
+
+    return {
+        'page_number': page_number,
+        'article_number': article_number,
+        'original_url': original_url,
+        'slug': slug,
+        **encode_content(content),
+        **derive_seo_fields(content, slug, SEO_DEPENDENCIES, now, timings),
+        # Generate canonical URL (prevents duplicate content)
+        'canonical_url': generate_canonical_url(config.SITE_URL, slug),
+        'created_at': now,
+        'updated_at': now,
+        'is_published': True,
+        'processing_status': 'success',
+        'error_message': None
+    }
+
+
+def derive_post_rows(
+    articles: List[Tuple[Dict, int, int]]
+) -> Tuple[List[Tuple[Optional[Dict], Optional[str], int, int]], Dict[str, float]]:
+    """
+    Worker entry point for parallel SEO generation.
+    Runs derive_post_row over a chunk of articles, capturing per-article errors.
+
+    Args:
+        articles: List of tuples (article_dict, page_number, article_number)
+
+    Returns:
+        Tuple of (list of (row or None, error message or None, page_number, article_number),
+        worker seconds spent in the 'seo' and 'serialize' stages)
+    """
+    results = []
+    timings = {'serialize': 0.0}
+    started = time.perf_counter()
+
+    for article, page_number, article_number in articles:
+        try:
+            row = derive_post_row(article, page_number, article_number, timings)
+            results.append((row, None, page_number, article_number))
+        except Exception as e:
+            results.append((None, f"Error creating post: {str(e)}", page_number, article_number))
+
+    timings['seo'] = time.perf_counter() - started - timings['serialize']
+    return results, timings
+
 
 class PostProcessor:
     """
@@ -36,20 +367,50 @@ class PostProcessor:
     Handles duplicate detection, validation, and batch processing.
     """
 
-    def __init__(self, app=None):
+    def __init__(
+        self,
+        app=None,
+        bulk_insert: bool = False,
+        parallel: bool = False,
+        incremental: Optional[bool] = None,
+        upsert: bool = False
+    ):
         """
         Initialize the post processor.
 
         Args:
             app: Flask application instance
+            bulk_insert: Write new posts with executemany bulk INSERTs instead of ORM objects
+            parallel: Generate SEO metadata in a process pool (config.MAX_WORKERS)
+                while the main thread writes to the database
+            incremental: Skip articles whose fingerprint is unchanged since the last run
+                (defaults to config.INCREMENTAL_PROCESSING)
+            upsert: Refresh existing posts whose content changed instead of skipping them
         """
         self.app = app
+        self.bulk_insert = bulk_insert
+        self.parallel = parallel
+        self.incremental = config.INCREMENTAL_PROCESSING if incremental is None else incremental
+        self.upsert = upsert
+        # batch_num -> {(page_number, article_number): (original_url, fingerprint)}
+        self.pending_fingerprints = {}
+        # batch_num -> (page_key, article_key) of the last article in the batch
+        self.batch_positions = {}
+        self.batches_completed = 0
+        self.file_version = None  # data_file_version() of the file being processed
+        self.timer = StageTimer()
+        self.processed_at_start = 0
+        self.processed_at_last_batch = 0
         self.stats = {
             'total_articles': 0,
             'processed': 0,
             'created': 0,
+            'updated': 0,
             'skipped': 0,
+            'unchanged': 0,
             'errors': 0,
+            'dedupe_seconds': 0.0,
+            'timings': None,
             'error_details': []
         }
 
@@ -78,6 +439,206 @@ class PostProcessor:
         logger.info(f"Loaded {len(data)} pages from data file")
         return data
 
+    def iter_scraped_pages(self, file_path: Path) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream pages from the scraped JSON file one at a time.
+        Unlike load_scraped_data, only the page being parsed is held in memory.
+
+        Args:
+            file_path: Path to the JSON data file
+
+        Yields:
+            Tuples of (page_key, page_data)
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            json.JSONDecodeError: If file contains invalid JSON
+        """
+        logger.info(f"Streaming scraped data from {file_path}")
+
+        if not file_path.exists():
+            raise FileNotFoundError(f"Data file not found: {file_path}")
+
+        yield from iter_json_object(file_path)
+
+    def iter_article_batches(
+        self,
+        file_path: Path,
+        batch_size: int,
+        resume_after: Optional[Tuple[str, str]] = None
+    ) -> Iterator[List[Tuple[Dict, int, int]]]:
+        """
+        Stream articles from the data file grouped into batches.
+        Updates stats['total_articles'] as each page is parsed and records the
+        file position of each batch in batch_positions for checkpointing.
+
+        Args:
+            file_path: Path to the JSON data file
+            batch_size: Maximum number of articles per batch
+            resume_after: (page_key, article_key) of the last committed article;
+                everything up to and including it is skipped
+
+        Yields:
+            Lists of tuples (article_dict, page_number, article_number)
+        """
+        batch = []
+        batch_num = 0
+        skipping = resume_after is not None
+
+        pages = self.iter_scraped_pages(file_path)
+        while True:
+            parse_started = time.perf_counter()
+            page = next(pages, None)
+            if page is None:
+                break
+
+            page_key, page_data = page
+            page_number = page_data.get('page_number', int(page_key))
+            articles = page_data.get('articles', {})
+            self.stats['total_articles'] += len(articles)
+            self.timer.add('parse', time.perf_counter() - parse_started, len(articles))
+
+            for article_key, article_data in articles.items():
+                if skipping:
+                    skipping = (page_key, article_key) != tuple(resume_after)
+                    continue
+
+                batch.append((article_data, page_number, int(article_key)))
+
+                if len(batch) >= batch_size:
+                    batch_num += 1
+                    self.batch_positions[batch_num] = (page_key, article_key)
+                    yield batch
+                    batch = []
+
+        if skipping:
+            # The checkpointed article is no longer in the file, so start over
+            logger.warning(f"Checkpoint {resume_after} not found in data file - processing from the start")
+            self.reset_stats()
+            yield from self.iter_article_batches(file_path, batch_size)
+            return
+
+        if batch:
+            batch_num += 1
+            self.batch_positions[batch_num] = (page_key, article_key)
+            yield batch
+
+    def load_fingerprints(self, urls: Iterable[str]) -> Dict[str, str]:
+        """
+        Fetch stored content fingerprints for the given URLs.
+        Only URLs that still have a post count, so a post deleted since it
+        was fingerprinted is imported again.
+
+        Args:
+            urls: Original URLs to look up
+
+        Returns:
+            Dictionary mapping URL to its stored fingerprint
+        """
+        unique_urls = list({url for url in urls if url})
+        fingerprints = {}
+
+        for i in range(0, len(unique_urls), DUPLICATE_LOOKUP_CHUNK):
+            chunk = unique_urls[i:i + DUPLICATE_LOOKUP_CHUNK]
+            rows = db.session.query(
+                ArticleFingerprint.original_url,
+                ArticleFingerprint.fingerprint
+            ).join(
+                Post, Post.original_url == ArticleFingerprint.original_url
+            ).filter(ArticleFingerprint.original_url.in_(chunk)).all()
+            fingerprints.update(rows)
+
+        return fingerprints
+
+    def iter_changed_batches(
+        self,
+        batches: Iterable[List[Tuple[Dict, int, int]]]
+    ) -> Iterator[List[Tuple[Dict, int, int]]]:
+        """
+        Drop articles whose content fingerprint matches the stored one.
+        Unchanged articles are counted in stats['unchanged'] and never reach the
+        posts table. Fingerprints of the remaining articles are saved by
+        record_batch_progress once their batch has been written.
+
+        Args:
+            batches: Iterable of article batches (see iter_article_batches)
+
+        Yields:
+            Batches containing only new or changed articles
+        """
+        for batch_num, batch in enumerate(batches, 1):
+            fingerprint_started = time.perf_counter()
+            stored = self.load_fingerprints(article_data.get('url') for article_data, _, _ in batch)
+
+            changed = []
+            pending = {}
+            for article_data, page_num, article_num in batch:
+                url = article_data.get('url')
+                fingerprint = article_fingerprint(article_data)
+
+                if url and stored.get(url) == fingerprint:
+                    self.stats['unchanged'] += 1
+                    self.stats['processed'] += 1
+                    continue
+
+                changed.append((article_data, page_num, article_num))
+                if url:
+                    pending[(page_num, article_num)] = (url, fingerprint)
+
+            self.timer.add('fingerprint', time.perf_counter() - fingerprint_started, len(batch))
+
+            if len(changed) < len(batch):
+                logger.info(f"Batch {batch_num}: {len(batch) - len(changed)} unchanged articles skipped")
+
+            self.pending_fingerprints[batch_num] = pending
+            yield changed
+
+    def forget_fingerprints(self, keys: Iterable[Tuple[int, int]]):
+        """
+        Drop pending fingerprints for articles that failed, so they are retried next run.
+
+        Args:
+            keys: (page_number, article_number) pairs
+        """
+        for key in keys:
+            for pending in self.pending_fingerprints.values():
+                pending.pop(key, None)
+
+    def save_fingerprints(self, batch_num: int):
+        """
+        Upsert the pending fingerprints of a written batch (committed by the caller).
+
+        Args:
+            batch_num: Batch whose fingerprints should be stored
+        """
+        pending = self.pending_fingerprints.pop(batch_num, None)
+        if not pending:
+            return
+
+        # One row per URL; a URL repeated in the file keeps its last occurrence
+        rows = {
+            url: {
+                'original_url': url,
+                'page_number': page_num,
+                'article_number': article_num,
+                'fingerprint': fingerprint,
+                'updated_at': datetime.utcnow()
+            }
+            for (page_num, article_num), (url, fingerprint) in pending.items()
+        }
+
+        stmt = dialect_insert(ArticleFingerprint)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ArticleFingerprint.original_url],
+            set_={
+                'page_number': stmt.excluded.page_number,
+                'article_number': stmt.excluded.article_number,
+                'fingerprint': stmt.excluded.fingerprint,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+        db.session.execute(stmt, list(rows.values()))
+
     def check_duplicate(self, url: str) -> bool:
         """
         Check if a post with the given URL already exists in database.
@@ -91,150 +652,130 @@ class PostProcessor:
         existing = Post.query.filter_by(original_url=url).first()
         return existing is not None
 
-    def create_post_from_article(
+    def find_existing_urls(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Resolve which of the given URLs already exist in the database.
+        Uses set-based IN lookups against the original_url index instead of
+        one query per article. Time spent is recorded as the 'dedupe' stage.
+
+        Args:
+            urls: Original URLs to check
+
+        Returns:
+            Set of URLs that already have a post
+        """
+        started = time.perf_counter()
+        unique_urls = list({url for url in urls if url})
+        existing = set()
+
+        for i in range(0, len(unique_urls), DUPLICATE_LOOKUP_CHUNK):
+            chunk = unique_urls[i:i + DUPLICATE_LOOKUP_CHUNK]
+            rows = db.session.query(Post.original_url).filter(
+                Post.original_url.in_(chunk)
+            ).all()
+            existing.update(row[0] for row in rows)
+
+        self.timer.add('dedupe', time.perf_counter() - started, len(unique_urls))
+        self.stats['dedupe_seconds'] = self.timer.seconds('dedupe')
+        return existing
+
+    def screen_article(self, article: Dict, existing_urls: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        Validate an article and check it against known URLs.
+        Duplicates are counted in stats['skipped'].
+
+        Args:
+            article: Article dictionary containing video data
+            existing_urls: Pre-resolved set of known URLs (skips the per-article query)
+
+        Returns:
+            Error message ("Duplicate URL" for duplicates), or None if the article is new
+        """
+        # Validate required fields
+        is_valid, error = validate_required_fields(article)
+        if not is_valid:
+            logger.warning(f"Article validation failed: {error}")
+            return error
+
+        # Check for duplicates
+        original_url = article['url']
+        if existing_urls is not None:
+            is_duplicate = original_url in existing_urls
+        else:
+            is_duplicate = self.check_duplicate(original_url)
+
+        if is_duplicate:
+            logger.info(f"Skipping duplicate: {original_url}")
+            self.stats['skipped'] += 1
+            return "Duplicate URL"
+
+        return None
+
+    def build_post_row(
         self,
         article: Dict,
         page_number: int,
-        article_number: int
-    ) -> Tuple[Optional[Post], Optional[str]]:
+        article_number: int,
+        existing_urls: Optional[Set[str]] = None
+    ) -> Tuple[Optional[Dict], Optional[str]]:
         """
-        Create a Post object from article data with SEO optimization.
+        Build the column values for a new post with SEO optimization.
+        The returned mapping can be used for Post.from_row(row) or a bulk INSERT.
 
         Args:
             article: Article dictionary containing video data
             page_number: Page number from scraped data
             article_number: Article number within the page
+            existing_urls: Pre-resolved set of known URLs (skips the per-article query)
 
         Returns:
-            Tuple of (Post object or None, error message or None)
+            Tuple of (column mapping or None, error message or None)
         """
         try:
-            # Validate required fields
-            is_valid, error = validate_required_fields(article)
-            if not is_valid:
-                logger.warning(f"Article validation failed: {error}")
+            error = self.screen_article(article, existing_urls)
+            if error:
                 return None, error
 
-            # Check for duplicates
-            original_url = article['url']
-            if self.check_duplicate(original_url):
-                logger.info(f"Skipping duplicate: {original_url}")
-                self.stats['skipped'] += 1
-                return None, "Duplicate URL"
-
-            # Extract and process data
-            slug = extract_slug_from_url(original_url)
-            categories = article.get('category', [])
-            tags = article.get('tags', [])
-
-            # Generate SEO metadata for search ranking
-            meta_title = generate_meta_title(
-                article['title'],
-                add_suffix=True,
-                site_name=config.SITE_NAME
-            )
-            meta_description = generate_meta_description(
-                article['body'],
-                title=article['title']
-            )
-            meta_keywords = generate_meta_keywords(tags, categories)
-
-            # Generate canonical URL (prevents duplicate content)
-            canonical_url = generate_canonical_url(config.SITE_URL, slug)
-
-            # Extract focus keyword (primary ranking keyword)
-            focus_keyword = extract_focus_keyword(article['title'], tags)
-
-            # Generate long-tail keywords for ranking
-            long_tail_keywords = generate_long_tail_keywords(
-                article['title'],
-                tags,
-                categories
-            )
-
-            # Create post object
-            post = Post(
-                page_number=page_number,
-                article_number=article_number,
-                original_url=original_url,
-                slug=slug,
-                title=article['title'],
-                body=article['body'],
-                thumbnail=article.get('thumbnail'),
-                video_url=article['video'],
-                video_width=article.get('video_width'),
-                video_height=article.get('video_height'),
-                video_duration=article.get('video_duration'),
-                video_duration_seconds=article.get('video_duration_seconds', 0),
-                video_type=article.get('video_type', 'video'),
-                meta_title=meta_title,
-                meta_description=meta_description,
-                meta_keywords=meta_keywords,
-                canonical_url=canonical_url,
-                focus_keyword=focus_keyword,
-                is_published=True,
-                processing_status='success'
-            )
-
-            # Set categories, tags, and long-tail keywords
-            post.set_categories(categories)
-            post.set_tags(tags)
-            post.set_long_tail_keywords(long_tail_keywords)
-
-            # Generate complete structured data (Video + Article + Breadcrumb)
-            # This helps with Google rich results and search ranking
-            post_data = {
-                'title': post.title,
-                'body': post.body,
-                'video_url': post.video_url,
-                'thumbnail': post.thumbnail or config.DEFAULT_IMAGE,
-                'created_at': datetime.utcnow(),
-                'video_duration_seconds': post.video_duration_seconds,
-                'categories': categories,
-                'tags': tags,
-                'slug': slug
-            }
-
-            # Video + Breadcrumb structured data
-            structured_data = generate_complete_structured_data(
-                post_data=post_data,
-                site_url=config.SITE_URL,
-                site_name=config.SITE_NAME
-            )
+            timings = {}
+            started = time.perf_counter()
+            row = derive_post_row(article, page_number, article_number, timings)
+            serialize_seconds = timings.get('serialize', 0.0)
+            self.timer.add('seo', time.perf_counter() - started - serialize_seconds, 1)
+            self.timer.add('serialize', serialize_seconds, 1)
 
-            # Add Article schema for better search ranking
-            article_schema = generate_article_structured_data(
-                title=post.title,
-                description=post.body,
-                author_name=config.SITE_NAME,
-                site_name=config.SITE_NAME,
-                site_url=config.SITE_URL,
-                slug=slug,
-                thumbnail_url=post.thumbnail or config.DEFAULT_IMAGE,
-                publish_date=datetime.utcnow(),
-                modified_date=datetime.utcnow(),
-                categories=categories,
-                tags=tags
-            )
-
-            # Combine all structured data
-            import json
-            all_schemas = json.loads(structured_data)
-            all_schemas.append(article_schema)
-            post.structured_data = json.dumps(all_schemas, indent=2)
-
-            logger.debug(
-                f"Generated SEO data - Focus: '{focus_keyword}', "
-                f"Long-tail: {len(long_tail_keywords)} keywords"
-            )
+            logger.debug(f"Generated SEO data - Focus: '{row['focus_keyword']}'")
 
-            return post, None
+            return row, None
 
         except Exception as e:
             error_msg = f"Error creating post: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return None, error_msg
 
+    def create_post_from_article(
+        self,
+        article: Dict,
+        page_number: int,
+        article_number: int,
+        existing_urls: Optional[Set[str]] = None
+    ) -> Tuple[Optional[Post], Optional[str]]:
+        """
+        Create a Post object from article data with SEO optimization.
+
+        Args:
+            article: Article dictionary containing video data
+            page_number: Page number from scraped data
+            article_number: Article number within the page
+            existing_urls: Pre-resolved set of known URLs (skips the per-article query)
+
+        Returns:
+            Tuple of (Post object or None, error message or None)
+        """
+        row, error = self.build_post_row(article, page_number, article_number, existing_urls)
+        if row is None:
+            return None, error
+        return Post.from_row(row), None
+
     def process_articles_batch(
         self,
         articles: List[Tuple[Dict, int, int]],
@@ -248,30 +789,41 @@ class PostProcessor:
             commit: Whether to commit to database
 
         Returns:
-            List of successfully created Post objects
+            List of successfully created Post objects (empty in bulk insert mode,
+            which never builds ORM objects)
         """
         created_posts = []
 
+        # Resolve duplicates for the whole batch in a few set-based queries
+        existing_urls = self.find_existing_urls(
+            article_data.get('url') for article_data, _, _ in articles
+        )
+
+        if self.upsert:
+            articles = self.refresh_existing_posts(articles, existing_urls, commit=commit)
+
+        if self.bulk_insert:
+            self.bulk_insert_batch(articles, existing_urls, commit=commit)
+            return created_posts
+
         for article_data, page_num, article_num in articles:
             try:
                 post, error = self.create_post_from_article(
                     article=article_data,
                     page_number=page_num,
-                    article_number=article_num
+                    article_number=article_num,
+                    existing_urls=existing_urls
                 )
 
                 if post:
                     db.session.add(post)
                     created_posts.append(post)
+                    # Catch repeats of the same URL later in this batch
+                    existing_urls.add(post.original_url)
                     self.stats['created'] += 1
                     logger.debug(f"Created post: {post.title}")
-                elif error and error != "Duplicate URL":
-                    self.stats['errors'] += 1
-                    self.stats['error_details'].append({
-                        'page': page_num,
-                        'article': article_num,
-                        'error': error
-                    })
+                else:
+                    self.record_article_error(page_num, article_num, error)
 
                 self.stats['processed'] += 1
 
@@ -279,6 +831,7 @@ class PostProcessor:
                 # Handle unique constraint violations
                 db.session.rollback()
                 logger.warning(f"Integrity error (likely duplicate): {str(e)}")
+                self.forget_fingerprints([(page_num, article_num)])
                 self.stats['skipped'] += 1
                 self.stats['processed'] += 1
 
@@ -296,89 +849,621 @@ class PostProcessor:
 
         # Commit the batch
         if commit and created_posts:
+            # Read before commit expires the objects
+            written = [{column: getattr(post, column) for column in COUNTER_COLUMNS} for post in created_posts]
             try:
-                db.session.commit()
+                db.session.flush()
+                apply_counter_deltas(counter_deltas(counter_states(written)))
+                bump_cache_generation([post.id for post in created_posts])
+                with self.timer.stage('commit', len(created_posts)):
+                    db.session.commit()
                 logger.info(f"Successfully committed batch of {len(created_posts)} posts")
             except Exception as e:
                 db.session.rollback()
                 logger.error(f"Error committing batch: {str(e)}", exc_info=True)
                 self.stats['errors'] += len(created_posts)
+                self.forget_fingerprints((post.page_number, post.article_number) for post in created_posts)
                 created_posts = []
 
         return created_posts
 
-    def process_all_data(self, data_file: Path = None) -> Dict:
+    def bulk_insert_batch(
+        self,
+        articles: List[Tuple[Dict, int, int]],
+        existing_urls: Set[str],
+        commit: bool = True
+    ) -> int:
         """
-        Process all scraped data and create posts.
-        Main entry point for bulk processing.
+        Fast path for large backfills: build plain row mappings and write them
+        with a single executemany INSERT ... ON CONFLICT DO NOTHING.
+        Rows that hit the original_url/slug unique constraints are counted as skipped.
 
         Args:
-            data_file: Path to data file (uses default from config if None)
+            articles: List of tuples (article_dict, page_number, article_number)
+            existing_urls: URLs already known to exist (updated with new rows)
+            commit: Whether to commit to database
 
         Returns:
-            Dictionary containing processing statistics
+            Number of posts inserted
         """
-        if data_file is None:
-            data_file = config.SCRAPED_DATA_FILE
+        rows = []
 
-        # Create processing log entry
-        processing_log = ProcessingLog(status='running')
-        db.session.add(processing_log)
-        db.session.commit()
+        for article_data, page_num, article_num in articles:
+            row, error = self.build_post_row(
+                article=article_data,
+                page_number=page_num,
+                article_number=article_num,
+                existing_urls=existing_urls
+            )
 
-        logger.info("=" * 60)
-        logger.info("Starting bulk post processing")
-        logger.info("=" * 60)
+            if row:
+                rows.append(row)
+                existing_urls.add(row['original_url'])
+            else:
+                self.record_article_error(page_num, article_num, error)
+
+            self.stats['processed'] += 1
+
+        return self.bulk_insert_rows(rows, commit=commit)
+
+    def bulk_insert_rows(self, rows: List[Dict], commit: bool = True) -> int:
+        """
+        Write prepared post rows with a single executemany
+        INSERT ... ON CONFLICT DO NOTHING and update created/skipped/errors.
+
+        Args:
+            rows: Post column mappings (as returned by derive_post_row)
+            commit: Whether to commit to database
+
+        Returns:
+            Number of posts inserted
+        """
+        if not rows:
+            return 0
+
+        stmt = dialect_insert(Post).on_conflict_do_nothing()
+        dialect = db.session.get_bind().dialect
 
         try:
-            # Load data
-            scraped_data = self.load_scraped_data(data_file)
+            with self.timer.stage('write', len(rows)):
+                if dialect.insert_executemany_returning:
+                    # Match on original_url: rows sharing a slug with an existing post are skipped too
+                    returned = db.session.execute(stmt.returning(Post.id, Post.original_url), rows).all()
+                    post_ids = [post_id for post_id, _ in returned]
+                    inserted_urls = {url for _, url in returned}
+                    inserted_rows = [row for row in rows if row['original_url'] in inserted_urls]
+                    apply_counter_deltas(counter_deltas(counter_states(inserted_rows)))
+                    # Skipped rows were not written, so their fingerprints must not be stored
+                    self.forget_fingerprints(
+                        (row['page_number'], row['article_number'])
+                        for row in rows if row['original_url'] not in inserted_urls
+                    )
+                    inserted = len(post_ids)
+                else:
+                    inserted = db.session.execute(stmt, rows).rowcount
+                    # Rows skipped by ON CONFLICT are resynced from their own stored values
+                    urls = [row['original_url'] for row in rows]
+                    post_ids = []
+                    for i in range(0, len(urls), DUPLICATE_LOOKUP_CHUNK):
+                        post_ids += db.session.execute(
+                            select(Post.id).where(Post.original_url.in_(urls[i:i + DUPLICATE_LOOKUP_CHUNK]))
+                        ).scalars().all()
+                    # Inserted rows are unknown, so counters are rebuilt instead
+                sync_post_terms(post_ids)
+                if not dialect.insert_executemany_returning:
+                    rebuild_post_counters()
+                if inserted:
+                    # Without RETURNING this includes rows that already existed, which is harmless
+                    bump_cache_generation(post_ids)
+
+            if commit:
+                with self.timer.stage('commit', len(rows)):
+                    db.session.commit()
+            logger.info(f"Bulk inserted {inserted} of {len(rows)} posts")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error bulk inserting batch: {str(e)}", exc_info=True)
+            self.stats['errors'] += len(rows)
+            self.forget_fingerprints((row['page_number'], row['article_number']) for row in rows)
+            return 0
 
-            # Prepare articles list
-            articles_to_process = []
-            for page_key, page_data in scraped_data.items():
-                page_number = page_data.get('page_number', int(page_key))
-                articles = page_data.get('articles', {})
+        self.stats['created'] += inserted
+        self.stats['skipped'] += len(rows) - inserted
+        return inserted
 
-                for article_key, article_data in articles.items():
-                    article_number = int(article_key)
-                    articles_to_process.append((article_data, page_number, article_number))
+    def refresh_existing_posts(
+        self,
+        articles: List[Tuple[Dict, int, int]],
+        existing_urls: Set[str],
+        commit: bool = True
+    ) -> List[Tuple[Dict, int, int]]:
+        """
+        Upsert mode: update posts whose scraped content changed.
+        Compares each existing post field by field, regenerates only the SEO
+        columns affected by the changed fields (see SEO_DEPENDENCIES) and writes
+        the whole batch with one executemany UPDATE statement. Existing posts
+        without changes are counted as skipped.
 
-            self.stats['total_articles'] = len(articles_to_process)
-            processing_log.total_articles = self.stats['total_articles']
-            db.session.commit()
+        Args:
+            articles: List of tuples (article_dict, page_number, article_number)
+            existing_urls: URLs known to exist in the posts table
+            commit: Whether to commit to database
+
+        Returns:
+            The articles whose URLs are not in the database yet
+        """
+        remaining = []
+        latest = {}
+
+        for article_data, page_num, article_num in articles:
+            url = article_data.get('url')
+            if url not in existing_urls:
+                remaining.append((article_data, page_num, article_num))
+                continue
+
+            self.stats['processed'] += 1
+            is_valid, error = validate_required_fields(article_data)
+            if not is_valid:
+                self.record_article_error(page_num, article_num, error)
+                continue
+
+            # A URL repeated within the batch keeps its last occurrence
+            if url in latest:
+                self.stats['skipped'] += 1
+            latest[url] = (article_data, page_num, article_num)
 
-            logger.info(f"Found {self.stats['total_articles']} total articles to process")
+        if not latest:
+            return remaining
 
-            # Process in batches
-            batch_size = config.BATCH_SIZE
-            total_batches = (len(articles_to_process) + batch_size - 1) // batch_size
+        columns = [Post.id, Post.original_url, Post.slug, Post.created_at, Post.is_published]
+        columns += [getattr(Post, name) for name in CONTENT_FIELDS]
+        columns += [getattr(Post, name) for name in SEO_DEPENDENCIES]
+        urls = list(latest)
 
-            for i in range(0, len(articles_to_process), batch_size):
-                batch = articles_to_process[i:i + batch_size]
-                batch_num = (i // batch_size) + 1
+        current_rows = []
+        for i in range(0, len(urls), DUPLICATE_LOOKUP_CHUNK):
+            chunk = urls[i:i + DUPLICATE_LOOKUP_CHUNK]
+            current_rows.extend(
+                db.session.query(*columns).filter(Post.original_url.in_(chunk)).all()
+            )
+
+        updates = []
+        updated_keys = []
+        retagged_ids = []
+        deltas = {}
+        timings = {}
+        now = datetime.utcnow()
+        seo_started = time.perf_counter()
+        for current in current_rows:
+            current = current._asdict()
+            content = article_content(latest[current['original_url']][0])
+            stored = dict(current)
+            stored['categories'] = json.loads(current['categories']) if current['categories'] else []
+            stored['tags'] = json.loads(current['tags']) if current['tags'] else []
+
+            changed = {name for name in CONTENT_FIELDS if content[name] != stored[name]}
+            if not changed:
+                self.stats['skipped'] += 1
+                continue
+
+            stale = [name for name, deps in SEO_DEPENDENCIES.items() if deps & changed]
+            row = {name: current[name] for name in CONTENT_FIELDS}
+            row.update({name: current[name] for name in SEO_DEPENDENCIES})
+            row.update(encode_content(content))
+            row.update(derive_seo_fields(content, current['slug'], stale, current['created_at'], timings))
+            row['id'] = current['id']
+            row['updated_at'] = now
+            updates.append(row)
+            updated_keys.append(latest[current['original_url']][1:])
+            if changed & {'categories', 'tags'}:
+                retagged_ids.append(current['id'])
+            if 'categories' in changed:
+                counter_deltas([(stored['categories'], current['is_published'])], -1, deltas)
+                counter_deltas([(content['categories'], current['is_published'])], 1, deltas)
+
+            logger.debug(
+                f"Refreshing post {current['id']}: changed {sorted(changed)}, "
+                f"regenerated {stale}"
+            )
+
+        serialize_seconds = timings.get('serialize', 0.0)
+        self.timer.add('seo', time.perf_counter() - seo_started - serialize_seconds, len(current_rows))
+        self.timer.add('serialize', serialize_seconds, len(updates))
 
-                logger.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} articles)")
+        if updates:
+            try:
+                # Every row carries the same keys, so this is a single executemany UPDATE
+                with self.timer.stage('write', len(updates)):
+                    db.session.execute(update(Post), updates)
+                    sync_post_terms(retagged_ids)
+                    apply_counter_deltas(deltas)
+                    bump_cache_generation([row['id'] for row in updates])
+                if commit:
+                    with self.timer.stage('commit', len(updates)):
+                        db.session.commit()
+                self.stats['updated'] += len(updates)
+                logger.info(f"Updated {len(updates)} changed posts")
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error updating changed posts: {str(e)}", exc_info=True)
+                self.stats['errors'] += len(updates)
+                self.forget_fingerprints(updated_keys)
 
-                self.process_articles_batch(batch, commit=True)
+        return remaining
 
-                # Update processing log
-                processing_log.processed_articles = self.stats['processed']
-                processing_log.created_posts = self.stats['created']
-                processing_log.skipped_duplicates = self.stats['skipped']
-                processing_log.errors = self.stats['errors']
+    def write_post_rows(self, rows: List[Dict]) -> int:
+        """
+        Write prepared post rows and commit, using the bulk INSERT path
+        when enabled and ORM objects otherwise.
+
+        Args:
+            rows: Post column mappings (as returned by derive_post_row)
+
+        Returns:
+            Number of posts created
+        """
+        if self.bulk_insert:
+            return self.bulk_insert_rows(rows, commit=True)
+
+        if not rows:
+            return 0
+
+        try:
+            posts = [Post.from_row(row) for row in rows]
+            db.session.add_all(posts)
+            db.session.flush()
+            apply_counter_deltas(counter_deltas(counter_states(rows)))
+            bump_cache_generation([post.id for post in posts])
+            with self.timer.stage('commit', len(rows)):
                 db.session.commit()
+            logger.info(f"Successfully committed batch of {len(rows)} posts")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error committing batch: {str(e)}", exc_info=True)
+            self.stats['errors'] += len(rows)
+            self.forget_fingerprints((row['page_number'], row['article_number']) for row in rows)
+            return 0
+
+        self.stats['created'] += len(rows)
+        return len(rows)
+
+    def process_batches_parallel(
+        self,
+        batches: Iterable[List[Tuple[Dict, int, int]]],
+        processing_log: ProcessingLog
+    ):
+        """
+        Pipeline mode: SEO metadata for each batch is derived in a process pool
+        sized by config.MAX_WORKERS, while the main thread writes the previous
+        batch to the database. Validation and duplicate checks stay in the main
+        thread because they need the database session.
+
+        Args:
+            batches: Iterable of article batches (see iter_article_batches)
+            processing_log: ProcessingLog row updated after each batch
+        """
+        workers = max(1, config.MAX_WORKERS)
+        logger.info(f"Parallel SEO generation enabled ({workers} workers)")
+
+        pending = None  # (batch_num, futures, urls) of the batch awaiting its write
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch_num, batch in enumerate(batches, 1):
+                logger.info(f"Processing batch {batch_num} ({len(batch)} articles)")
+
+                # URLs of the not-yet-written batch are not in the database yet
+                pending_urls = pending[2] if pending else set()
+                urls = [article_data.get('url') for article_data, _, _ in batch]
+                known_urls = self.find_existing_urls(urls)
+                known_urls.update(url for url in urls if url in pending_urls)
+
+                if self.upsert:
+                    batch = self.refresh_existing_posts(batch, known_urls - pending_urls)
+
+                candidates = []
+                for article_data, page_num, article_num in batch:
+                    error = self.screen_article(article_data, known_urls)
+                    if error:
+                        self.record_article_error(page_num, article_num, error)
+                        self.stats['processed'] += 1
+                        continue
+                    candidates.append((article_data, page_num, article_num))
+                    known_urls.add(article_data['url'])
+
+                # Spread the batch evenly over the workers
+                chunk_size = max(1, -(-len(candidates) // workers))
+                futures = [
+                    pool.submit(derive_post_rows, candidates[i:i + chunk_size])
+                    for i in range(0, len(candidates), chunk_size)
+                ]
+                batch_urls = {article_data['url'] for article_data, _, _ in candidates}
+
+                # Write the previous batch while the pool works on this one
+                if pending:
+                    self.write_derived_batch(pending[0], pending[1], processing_log)
+                pending = (batch_num, futures, batch_urls)
+
+            if pending:
+                self.write_derived_batch(pending[0], pending[1], processing_log)
+
+    def write_derived_batch(
+        self,
+        batch_num: int,
+        futures: List[Future],
+        processing_log: ProcessingLog
+    ):
+        """
+        Collect worker results for a batch, write the rows and record progress.
+
+        Args:
+            batch_num: Batch number (for logging)
+            futures: Futures returned by submitting derive_post_rows
+            processing_log: ProcessingLog row to update
+        """
+        rows = []
+        for future in futures:
+            with self.timer.stage('wait'):
+                results, timings = future.result()
+            # Worker time overlaps with the main thread, so it is summed per worker
+            self.timer.add('seo', timings['seo'], len(results))
+            self.timer.add('serialize', timings['serialize'], len(results))
+
+            for row, error, page_num, article_num in results:
+                if row:
+                    rows.append(row)
+                else:
+                    self.record_article_error(page_num, article_num, error)
+                self.stats['processed'] += 1
+
+        self.write_post_rows(rows)
+        self.record_batch_progress(processing_log, batch_num)
+
+    def record_article_error(self, page_num: int, article_num: int, error: Optional[str]):
+        """
+        Count a rejected article. Duplicates are already counted as skipped.
+        Its fingerprint is not stored either way: a skipped duplicate left the
+        stored post as it was, so a later upsert run must still compare it.
+
+        Args:
+            page_num: Page number of the article
+            article_num: Article number within the page
+            error: Error message returned for the article
+        """
+        if error:
+            self.forget_fingerprints([(page_num, article_num)])
+        if error and error != "Duplicate URL":
+            self.stats['errors'] += 1
+            self.stats['error_details'].append({
+                'page': page_num,
+                'article': article_num,
+                'error': error
+            })
+
+    def update_sitemaps(self):
+        """
+        Rewrite the precomputed sitemap files of shards this run changed.
+        Failures are logged; the routes fall back to generating sitemaps per request.
+        """
+        if not config.SITEMAP_PRECOMPUTE or not (self.stats['created'] or self.stats['updated']):
+            return
+
+        try:
+            with self.timer.stage('sitemap'):
+                get_sitemap_files().regenerate()
+        except Exception as e:
+            logger.warning(f"Could not regenerate sitemap files: {str(e)}", exc_info=True)
+
+    def timing_summary(self) -> Dict:
+        """
+        Per-stage timings of this run (a resumed run only counts its own work).
+
+        Returns:
+            Dictionary as returned by StageTimer.summary()
+        """
+        return self.timer.summary(self.stats['processed'] - self.processed_at_start)
+
+    def record_batch_progress(self, processing_log: ProcessingLog, batch_num: int):
+        """
+        Copy running statistics onto the processing log and commit it.
+
+        Args:
+            processing_log: ProcessingLog row for the current run
+            batch_num: Number of the batch that just finished
+        """
+        if self.incremental:
+            with self.timer.stage('fingerprint'):
+                self.save_fingerprints(batch_num)
+
+        self.timer.end_batch(batch_num, self.stats['processed'] - self.processed_at_last_batch)
+        self.processed_at_last_batch = self.stats['processed']
+        self.stats['timings'] = self.timing_summary()
+
+        self.batches_completed += 1
+        position = self.batch_positions.pop(batch_num, None)
+        if position:
+            processing_log.set_checkpoint({
+                'page_key': position[0],
+                'article_key': position[1],
+                'batches_completed': self.batches_completed,
+                'file': self.file_version,
+                'updated_at': datetime.utcnow().isoformat()
+            })
+
+        processing_log.total_articles = self.stats['total_articles']
+        processing_log.processed_articles = self.stats['processed']
+        processing_log.created_posts = self.stats['created']
+        processing_log.updated_posts = self.stats['updated']
+        processing_log.skipped_duplicates = self.stats['skipped']
+        processing_log.unchanged_articles = self.stats['unchanged']
+        processing_log.errors = self.stats['errors']
+        processing_log.set_timings(self.stats['timings'])
+        db.session.commit()
+
+        logger.info(
+            f"Batch {batch_num} complete - "
+            f"Created: {self.stats['created']}, "
+            f"Updated: {self.stats['updated']}, "
+            f"Skipped: {self.stats['skipped']}, "
+            f"Errors: {self.stats['errors']}"
+        )
+
+    def find_resumable_log(self, data_file: Path, exclude_id: Optional[int] = None) -> Optional[ProcessingLog]:
+        """
+        Find an interrupted run of the given data file that can be resumed.
+        Only the most recent run of the file is considered; queued and
+        coalesced jobs never ran, so they are ignored.
+        Must be called while holding the import lock (see services.import_lock):
+        a run still marked 'running' then belongs to an import that died.
 
-                logger.info(
-                    f"Batch {batch_num} complete - "
-                    f"Created: {self.stats['created']}, "
-                    f"Skipped: {self.stats['skipped']}, "
-                    f"Errors: {self.stats['errors']}"
+        Args:
+            data_file: Path to the data file
+            exclude_id: ProcessingLog to leave out (the caller's own queued job)
+
+        Returns:
+            ProcessingLog left in 'running' or 'failed' state, or None
+        """
+        query = ProcessingLog.query.filter(
+            ProcessingLog.data_file == str(data_file),
+            ProcessingLog.status.in_(('running', 'failed', 'completed'))
+        )
+        if exclude_id is not None:
+            query = query.filter(ProcessingLog.id != exclude_id)
+        latest = query.order_by(ProcessingLog.started_at.desc(), ProcessingLog.id.desc()).first()
+
+        if latest and latest.status in ('running', 'failed'):
+            return latest
+        return None
+
+    def take_over_run(self, processing_log: ProcessingLog, interrupted: ProcessingLog):
+        """
+        Let a queued job continue an interrupted run: copy its checkpoint and
+        totals to the job's log and retire the interrupted log as 'resumed'.
+        Does not commit.
+
+        Args:
+            processing_log: The job's ProcessingLog
+            interrupted: Run found by find_resumable_log
+        """
+        processing_log.set_checkpoint(interrupted.get_checkpoint())
+        for field in RUN_TOTAL_FIELDS:
+            setattr(processing_log, field, getattr(interrupted, field))
+
+        interrupted.status = 'resumed'
+        interrupted.error_details = f'Continued by processing log {processing_log.id}'
+        logger.info(f"Processing log {processing_log.id} continues interrupted run {interrupted.id}")
+
+    def restore_stats(self, processing_log: ProcessingLog):
+        """
+        Continue counting from the totals of an interrupted run.
+
+        Args:
+            processing_log: ProcessingLog being resumed
+        """
+        self.stats['processed'] = processing_log.processed_articles or 0
+        self.stats['created'] = processing_log.created_posts or 0
+        self.stats['updated'] = processing_log.updated_posts or 0
+        self.stats['skipped'] = processing_log.skipped_duplicates or 0
+        self.stats['unchanged'] = processing_log.unchanged_articles or 0
+        self.stats['errors'] = processing_log.errors or 0
+        self.processed_at_start = self.processed_at_last_batch = self.stats['processed']
+
+        checkpoint = processing_log.get_checkpoint()
+        if checkpoint:
+            self.batches_completed = checkpoint.get('batches_completed', 0)
+
+    def reset_stats(self):
+        """Drop the totals restored from an interrupted run before counting a full run"""
+        for key in ('total_articles', 'processed', 'created', 'updated', 'skipped', 'unchanged', 'errors'):
+            self.stats[key] = 0
+        self.processed_at_start = self.processed_at_last_batch = 0
+        self.batches_completed = 0
+
+    def process_all_data(
+        self,
+        data_file: Path = None,
+        resume: bool = False,
+        log_id: Optional[int] = None
+    ) -> Dict:
+        """
+        Process all scraped data and create posts.
+        Main entry point for bulk processing.
+
+        Args:
+            data_file: Path to data file (uses default from config if None)
+            resume: Continue the last interrupted run of this file from its checkpoint
+            log_id: Existing ProcessingLog to run under (e.g. a queued job);
+                continues from its checkpoint if it has one
+
+        Returns:
+            Dictionary containing processing statistics
+        """
+        if data_file is None:
+            data_file = config.SCRAPED_DATA_FILE
+
+        if log_id is not None:
+            processing_log = db.session.get(ProcessingLog, log_id)
+            if processing_log is None:
+                raise ValueError(f"Processing log not found: {log_id}")
+        else:
+            processing_log = self.find_resumable_log(data_file) if resume else None
+        resume_after = None
+        self.file_version = data_file_version(data_file)
+
+        if processing_log:
+            # Continue the queued or interrupted run in place
+            checkpoint = processing_log.get_checkpoint()
+            if checkpoint and (self.file_version is None or checkpoint.get('file') != self.file_version):
+                # Articles before the checkpoint key may be new or changed in this version
+                logger.warning(
+                    f"Data file changed since the checkpoint of log {processing_log.id} - processing from the start"
                 )
+                checkpoint = None
+                processing_log.set_checkpoint(None)
+                for field in RUN_TOTAL_FIELDS:
+                    setattr(processing_log, field, 0)
+            if checkpoint:
+                resume_after = (checkpoint['page_key'], checkpoint['article_key'])
+            self.restore_stats(processing_log)
+            processing_log.status = 'running'
+            processing_log.completed_at = None
+            processing_log.error_details = None
+            db.session.commit()
+        else:
+            # Create processing log entry
+            processing_log = ProcessingLog(status='running', data_file=str(data_file))
+            db.session.add(processing_log)
+            db.session.commit()
+
+        logger.info("=" * 60)
+        if resume_after:
+            logger.info(f"Resuming bulk post processing (log {processing_log.id}) after {resume_after}")
+        else:
+            logger.info("Starting bulk post processing")
+        logger.info("=" * 60)
+
+        try:
+            # Stream articles page by page so memory is bounded by the batch size
+            batches = self.iter_article_batches(data_file, config.BATCH_SIZE, resume_after=resume_after)
+            if self.incremental:
+                batches = self.iter_changed_batches(batches)
+
+            if self.parallel:
+                self.process_batches_parallel(batches, processing_log)
+            else:
+                for batch_num, batch in enumerate(batches, 1):
+                    logger.info(f"Processing batch {batch_num} ({len(batch)} articles)")
+                    self.process_articles_batch(batch, commit=True)
+                    self.record_batch_progress(processing_log, batch_num)
+
+            self.update_sitemaps()
 
             # Mark processing as complete
             processing_log.status = 'completed'
+            processing_log.total_articles = self.stats['total_articles']
+            processing_log.processed_articles = self.stats['processed']
             processing_log.completed_at = datetime.utcnow()
+            self.stats['timings'] = self.timing_summary()
+            processing_log.set_timings(self.stats['timings'])
 
             if self.stats['error_details']:
                 processing_log.error_details = json.dumps(self.stats['error_details'][:100])  # Limit stored errors
@@ -390,8 +1475,13 @@ class PostProcessor:
             logger.info(f"Total articles: {self.stats['total_articles']}")
             logger.info(f"Processed: {self.stats['processed']}")
             logger.info(f"Created: {self.stats['created']}")
+            logger.info(f"Updated: {self.stats['updated']}")
             logger.info(f"Skipped (duplicates): {self.stats['skipped']}")
+            logger.info(f"Unchanged: {self.stats['unchanged']}")
             logger.info(f"Errors: {self.stats['errors']}")
+            logger.info(f"Duplicate check time: {self.stats['dedupe_seconds']:.3f}s")
+            for stage, timing in self.stats['timings']['stages'].items():
+                logger.info(f"Stage {stage}: {timing['seconds']:.3f}s ({timing['items']} items)")
             logger.info("=" * 60)
 
         except Exception as e:
@@ -399,6 +1489,7 @@ class PostProcessor:
             processing_log.status = 'failed'
             processing_log.completed_at = datetime.utcnow()
             processing_log.error_details = str(e)
+            processing_log.set_timings(self.timing_summary())
             db.session.commit()
             raise
 
@@ -0,0 +1,424 @@
+"""
+Response Cache
+Caches the responses of read endpoints (posts, categories, stats, sitemap).
+Keys combine the endpoint, its normalized arguments and the database cache
+generation, which every content-changing commit bumps, so cached responses
+stay valid until the data they were built from changes.
+Entries live in an in-process LRU, a local directory or a shared Redis server.
+The same data versions back ETag/Last-Modified headers, so conditional
+requests are answered with 304 before the view runs.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+from pathlib import Path
+from typing import Mapping, Optional, Tuple
+
+from flask import Response, g, make_response, request
+
+import config
+from models import db, Post, ProcessingLog, get_cache_generation
+
+logger = logging.getLogger(__name__)
+
+# Cached value: (body, status code, content type)
+CachedResponse = Tuple[bytes, int, str]
+
+
+def encode_entry(value: CachedResponse) -> bytes:
+    """Serialize a cached response for byte-oriented backends"""
+    body, status, content_type = value
+    return json.dumps([status, content_type]).encode('utf-8') + b'\n' + body
+
+
+def decode_entry(data: bytes) -> CachedResponse:
+    """Parse bytes produced by encode_entry"""
+    header, body = data.split(b'\n', 1)
+    status, content_type = json.loads(header)
+    return body, status, content_type
+
+
+class MemoryBackend:
+    """In-process LRU of at most max_entries responses"""
+
+    def __init__(self, max_entries: int = 1000):
+        """
+        Initialize the backend.
+
+        Args:
+            max_entries: Number of responses kept before the oldest is evicted
+        """
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedResponse):
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class DiskBackend:
+    """
+    One file per response in a local directory, shared by the worker
+    processes of one host. Reads refresh a file's mtime, and the least
+    recently used files are removed once max_entries is exceeded.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 1000):
+        """
+        Initialize the backend.
+
+        Args:
+            directory: Cache directory (created if missing)
+            max_entries: Number of files kept before eviction
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.count = sum(1 for _ in self.directory.glob('*.cache'))
+
+    def path(self, key: str) -> Path:
+        """File holding the entry for a key"""
+        return self.directory / (hashlib.sha256(key.encode('utf-8')).hexdigest() + '.cache')
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        path = self.path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return decode_entry(data)
+
+    def set(self, key: str, value: CachedResponse):
+        # Write to a temporary file first so readers never see a partial entry
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') as temp_file:
+                temp_file.write(encode_entry(value))
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            os.unlink(temp_path)
+            raise
+
+        with self.lock:
+            self.count += 1
+            if self.count > self.max_entries:
+                self.evict()
+
+    def evict(self):
+        """Remove the least recently used files down to 90% of max_entries"""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.cache'):
+                try:
+                    files.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+        files.sort()
+
+        excess = len(files) - int(self.max_entries * 0.9)
+        for _, path in files[:max(excess, 0)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+        self.count = len(files) - max(excess, 0)
+
+    def clear(self):
+        for path in self.directory.glob('*.cache'):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        with self.lock:
+            self.count = 0
+
+
+class RedisBackend:
+    """
+    Shared cache on a Redis server, for deployments with several hosts.
+    Eviction is left to Redis (configure maxmemory-policy allkeys-lru);
+    entries also expire after ttl seconds so old generations do not linger.
+    Requires the optional redis package.
+    """
+
+    def __init__(self, url: str, ttl: int = 3600, prefix: str = 'response-cache:'):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis URL (e.g. redis://localhost:6379/0)
+            ttl: Entry lifetime in seconds (0 = no expiry)
+            prefix: Prefix of all keys written by this cache
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package (pip install redis)") from e
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl or None
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        data = self.client.get(self.prefix + key)
+        return decode_entry(data) if data is not None else None
+
+    def set(self, key: str, value: CachedResponse):
+        self.client.set(self.prefix + key, encode_entry(value), ex=self.ttl)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.prefix + '*'):
+            self.client.delete(key)
+
+
+class ResponseCache:
+    """
+    Front end of the cache: builds keys and counts hits.
+    A cache without a backend is disabled and caches nothing.
+    """
+
+    def __init__(self, backend=None):
+        """
+        Initialize the cache.
+
+        Args:
+            backend: MemoryBackend, DiskBackend, RedisBackend or None to disable caching
+        """
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @staticmethod
+    def make_key(endpoint: str, view_args: Optional[Mapping], args, version) -> str:
+        """
+        Build a cache key.
+        Argument names are sorted and blank values dropped, so equivalent
+        query strings share an entry; repeated values keep their order.
+
+        Args:
+            endpoint: Flask endpoint name
+            view_args: URL path arguments (e.g. post_id)
+            args: Query string MultiDict
+            version: Version of the underlying data (e.g. the cache generation)
+
+        Returns:
+            Cache key string
+        """
+        path_args = sorted((name, str(value)) for name, value in (view_args or {}).items())
+        query_args = sorted(
+            (name, [value.strip() for value in args.getlist(name) if value.strip()])
+            for name in set(args.keys())
+        )
+        query_args = [(name, values) for name, values in query_args if values]
+        return json.dumps([endpoint, version, path_args, query_args], separators=(',', ':'))
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache read failed: {str(e)}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: CachedResponse):
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {str(e)}")
+
+    def clear(self):
+        """Drop every cached response"""
+        if self.enabled:
+            self.backend.clear()
+
+    def get_status(self) -> dict:
+        """Backend name and hit/miss counts of this process"""
+        return {
+            'backend': type(self.backend).__name__ if self.enabled else None,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def create_backend(name: str):
+    """
+    Build the backend selected by config.CACHE_BACKEND.
+
+    Args:
+        name: 'memory', 'disk', 'redis' or 'none'
+
+    Returns:
+        Backend instance, or None when caching is disabled
+    """
+    name = (name or 'none').lower()
+    if name == 'memory':
+        return MemoryBackend(config.CACHE_MAX_ENTRIES)
+    if name == 'disk':
+        return DiskBackend(config.CACHE_DIR, config.CACHE_MAX_ENTRIES)
+    if name == 'redis':
+        return RedisBackend(config.CACHE_REDIS_URL, config.CACHE_TTL_SECONDS)
+    if name == 'none':
+        return None
+    raise ValueError(f"Unknown CACHE_BACKEND: {name}")
+
+
+_default_cache = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResponseCache(create_backend(config.CACHE_BACKEND))
+    return _default_cache
+
+
+def request_generation() -> Tuple[int, Optional[datetime]]:
+    """Cache generation and its change time, read once per request"""
+    if 'cache_generation' not in g:
+        g.cache_generation = get_cache_generation()
+    return g.cache_generation
+
+
+def generation_validator(**view_args) -> Optional[Tuple[str, Optional[datetime]]]:
+    """Validators for responses built from many posts: the cache generation and its change time"""
+    generation, changed_at = request_generation()
+    return f'g{generation}', changed_at
+
+
+def post_validator(post_id: int, **view_args) -> Optional[Tuple[str, Optional[datetime]]]:
+    """Validators for a single post: its updated_at (None if the post does not exist)"""
+    updated_at = db.session.query(Post.updated_at).filter(Post.id == post_id).scalar()
+    if updated_at is None:
+        return None
+    return updated_at.isoformat(), updated_at
+
+
+def stats_validator(**view_args) -> Optional[Tuple[str, Optional[datetime]]]:
+    """
+    Validators for /api/stats: the cache generation plus a digest of the recent
+    processing logs, which import progress updates without moving the generation.
+    No modification time, since log updates do not record one.
+    """
+    generation, _ = request_generation()
+    logs = json.dumps([log.to_dict() for log in ProcessingLog.recent()], sort_keys=True)
+    return f'g{generation}-{hashlib.sha256(logs.encode("utf-8")).hexdigest()[:16]}', None
+
+
+def not_modified(etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Check the request's conditional headers against a response's validators.
+    If-None-Match takes precedence; If-Modified-Since is only used without it.
+
+    Args:
+        etag: ETag the response would carry
+        last_modified: Naive UTC modification time, if known
+
+    Returns:
+        True if the client's copy is current (answer 304)
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        # HTTP dates have one-second resolution
+        return last_modified.replace(microsecond=0, tzinfo=timezone.utc) <= request.if_modified_since
+    return False
+
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime]):
+    """Add ETag/Last-Modified and ask clients to revalidate before reusing the response"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+
+
+def cached_response(view=None, *, validator=generation_validator):
+    """
+    Decorator for read-only views.
+    Answers conditional requests with 304 when the client's ETag or date
+    is current, serves successful responses from the response cache while
+    the cache generation is unchanged, and adds validators to 200 responses.
+    Responses carry an X-Cache: HIT or MISS header when the cache is enabled.
+
+    Args:
+        view: View function (when used as @cached_response)
+        validator: Function of the view arguments returning (version, last modified)
+            or None when the resource does not exist; defaults to the cache generation
+    """
+    if view is None:
+        return lambda view: cached_response(view, validator=validator)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = get_response_cache()
+
+        validators = validator(**kwargs)
+        if validators is not None:
+            version, last_modified = validators
+            key = cache.make_key(request.endpoint, request.view_args, request.args, version)
+            etag = hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+            if not_modified(etag, last_modified):
+                response = Response(status=304)
+                set_validators(response, etag, last_modified)
+                return response
+
+        if cache.enabled:
+            generation, _ = request_generation()
+            # Validators may cover data the generation does not (e.g. processing logs)
+            version = [generation, validators[0]] if validators is not None else generation
+            key = cache.make_key(request.endpoint, request.view_args, request.args, version)
+            cached = cache.get(key)
+            if cached is not None:
+                body, status, content_type = cached
+                response = Response(body, status=status, content_type=content_type)
+                response.headers['X-Cache'] = 'HIT'
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    cache.set(key, (response.get_data(), response.status_code, response.content_type))
+                response.headers['X-Cache'] = 'MISS'
+        else:
+            response = make_response(view(*args, **kwargs))
+
+        # Keep validators a view set on its own response
+        if validators is not None and response.status_code == 200 and not response.get_etag()[0]:
+            set_validators(response, etag, last_modified)
+        return response
+
+    return wrapper
@@ -9,6 +9,7 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from pathlib import Path
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
@@ -54,27 +55,31 @@ class AutomationScheduler:
         except Exception as e:
             logger.error(f"Error in scheduled check: {str(e)}", exc_info=True)
 
-    def start(self, check_interval_minutes: int = 5):
+    def start(self, check_interval_minutes: Optional[int] = 5):
         """
         Start the scheduler with periodic checks.
 
         Args:
-            check_interval_minutes: How often to check for updates (in minutes)
+            check_interval_minutes: How often to check for updates (in minutes);
+                None or 0 adds no periodic check (file events or cron jobs only)
         """
         if self.is_running:
             logger.warning("Scheduler is already running")
             return
 
-        logger.info(f"Starting scheduler (check interval: {check_interval_minutes} minutes)")
+        if check_interval_minutes:
+            logger.info(f"Starting scheduler (check interval: {check_interval_minutes} minutes)")
 
-        # Add periodic job to check for updates
-        self.scheduler.add_job(
-            func=self.check_for_updates,
-            trigger=IntervalTrigger(minutes=check_interval_minutes),
-            id='check_data_updates',
-            name='Check for data file updates',
-            replace_existing=True
-        )
+            # Add periodic job to check for updates
+            self.scheduler.add_job(
+                func=self.check_for_updates,
+                trigger=IntervalTrigger(minutes=check_interval_minutes),
+                id='check_data_updates',
+                name='Check for data file updates',
+                replace_existing=True
+            )
+        else:
+            logger.info("Starting scheduler without periodic checks")
 
         # Start the scheduler
         self.scheduler.start()
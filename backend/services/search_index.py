@@ -0,0 +1,148 @@
+"""
+Full-Text Search Index
+Backs /api/posts?search= with the database's own full-text engine:
+an FTS5 table kept in sync by triggers on SQLite, and a generated,
+GIN-indexed tsvector column on PostgreSQL. Titles are weighted above bodies.
+Other databases (or SQLite builds without FTS5) fall back to ILIKE.
+"""
+import logging
+import re
+
+from sqlalchemy import column, false, func, literal, literal_column, select, table, text
+
+from models import db, Post
+
+logger = logging.getLogger(__name__)
+
+# Relative weight of a title match over a body match (SQLite bm25)
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+
+# PostgreSQL text search configuration
+TEXT_SEARCH_CONFIG = 'english'
+
+SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, body, content='posts', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_insert AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_delete AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS posts_fts_update AFTER UPDATE OF title, body ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO posts_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+POSTGRES_SETUP = [
+    f"""
+    ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_posts_search_vector ON posts USING GIN (search_vector)",
+]
+
+posts_fts = table('posts_fts', column('rowid'))
+
+_backend = None
+
+
+def ensure_search_index() -> str:
+    """
+    Create the full-text index for the current database if it is missing.
+    A newly created SQLite index is filled from the existing posts.
+    Must be called inside an application context, after db.create_all().
+
+    Returns:
+        Search backend in use: 'fts5', 'tsvector' or 'like'
+    """
+    global _backend
+    dialect = db.engine.dialect.name
+
+    try:
+        if dialect == 'sqlite':
+            exists = db.session.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'")
+            ).first() is not None
+            for statement in SQLITE_SETUP:
+                db.session.execute(text(statement))
+            if not exists:
+                db.session.execute(text("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')"))
+                logger.info("Built full-text index posts_fts")
+            _backend = 'fts5'
+        elif dialect == 'postgresql':
+            for statement in POSTGRES_SETUP:
+                db.session.execute(text(statement))
+            _backend = 'tsvector'
+        else:
+            _backend = 'like'
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.warning(f"Full-text index unavailable, falling back to ILIKE search: {str(e)}")
+        _backend = 'like'
+
+    return _backend
+
+
+def get_search_backend() -> str:
+    """Search backend in use (detected on first call if ensure_search_index was not run)"""
+    if _backend is None:
+        return ensure_search_index()
+    return _backend
+
+
+def search_matches(query: str):
+    """
+    Build a selectable of posts matching a search query with their relevance.
+    Every term must match (stemmed on the full-text backends).
+
+    Args:
+        query: User search text
+
+    Returns:
+        Select with columns post_id and rank (higher rank = more relevant)
+    """
+    backend = get_search_backend()
+    terms = re.findall(r'\w+', query)
+
+    if not terms:
+        return select(Post.id.label('post_id'), literal(0.0).label('rank')).where(false())
+
+    if backend == 'fts5':
+        # Quote each term so FTS5 operators in user input are matched literally
+        match = ' '.join('"' + term.replace('"', '""') + '"' for term in terms)
+        fts = literal_column('posts_fts')
+        return select(
+            posts_fts.c.rowid.label('post_id'),
+            (-func.bm25(fts, TITLE_WEIGHT, BODY_WEIGHT)).label('rank')
+        ).where(fts.op('MATCH')(match))
+
+    if backend == 'tsvector':
+        vector = literal_column('posts.search_vector')
+        ts_query = func.plainto_tsquery(TEXT_SEARCH_CONFIG, ' '.join(terms))
+        return select(
+            Post.id.label('post_id'),
+            func.ts_rank(vector, ts_query).label('rank')
+        ).where(vector.op('@@')(ts_query))
+
+    search_pattern = f"%{query}%"
+    return select(Post.id.label('post_id'), literal(0.0).label('rank')).where(
+        db.or_(
+            Post.title.ilike(search_pattern),
+            Post.body.ilike(search_pattern)
+        )
+    )
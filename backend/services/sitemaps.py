@@ -0,0 +1,570 @@
+"""
+Sitemap Service
+Feeds the streaming sitemap generator from the database: published posts
+are read through a server-side cursor, selecting only the columns a
+sitemap entry uses, so memory stays flat however many posts there are.
+
+Past config.SITEMAP_SHARD_SIZE published posts, /sitemap.xml becomes a
+sitemap index over shards that each cover a fixed range of post ids
+(shard n holds ids (n-1)*size+1 .. n*size). Ranges never move, so new
+posts only change the last shard and each shard's lastmod reflects edits
+within its own range.
+
+With config.SITEMAP_PRECOMPUTE, sitemaps are also written to
+config.SITEMAP_DIR as .xml and .xml.gz files after each import. A manifest
+of every shard's (lastmod, published count) tells which shards changed, so
+only those files are rewritten; the routes serve the files with send_file.
+
+Besides 'posts', config.SITEMAP_FAMILIES can enable a 'videos' family
+(posts with a video) and one family per category. Every family is sharded
+by the same id ranges into <family>-<n>.xml files, each with its own
+extension blocks (config.SITEMAP_BLOCKS), so editing a post only touches
+the shards of its own families.
+"""
+import gzip
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from flask import request, send_file
+from sqlalchemy import case, func, null, select
+
+import config
+from models import db, Post, PostCategory, PostCounter
+from utils.seo_utils import slugify
+from utils.sitemap_generator import generate_sitemap_index, iter_sitemap_xml
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Longest video:description Google accepts; the rest of the body is never read
+VIDEO_DESCRIPTION_LENGTH = 2048
+
+CATEGORY_PREFIX = 'category-'
+
+# Position of the fixed families in the sitemap index; category families follow
+FAMILY_ORDER = {'posts': 0, 'videos': 1}
+
+# Shard file names: <family>-<shard number>
+SITEMAP_NAME_PATTERN = re.compile(r'^([\w-]+)-(\d+)$')
+
+
+def sitemap_columns(include_body: bool = True):
+    """
+    Columns of Post needed for sitemap entries.
+
+    Args:
+        include_body: Select the start of the body (only video descriptions use it)
+    """
+    return (
+        Post.slug,
+        Post.title,
+        func.substr(Post.body, 1, VIDEO_DESCRIPTION_LENGTH).label('body') if include_body else null().label('body'),
+        Post.thumbnail,
+        Post.video_url,
+        Post.video_duration_seconds,
+        Post.tags,
+        Post.categories,
+        Post.created_at,
+        Post.updated_at,
+    )
+
+
+def category_family(name: str) -> str:
+    """Name of the sitemap family of a category"""
+    return CATEGORY_PREFIX + slugify(name)
+
+
+def sitemap_families() -> List[str]:
+    """
+    Enabled sitemap families: 'posts', 'videos' and one 'category-<slug>'
+    per category with published posts (read from post_counters).
+    """
+    families = [family for family in ('posts', 'videos') if family in config.SITEMAP_FAMILIES]
+    if 'categories' in config.SITEMAP_FAMILIES:
+        names = db.session.scalars(
+            select(PostCounter.name).where(PostCounter.scope == 'category', PostCounter.published > 0)
+        )
+        families.extend(sorted({category_family(name) for name in names if slugify(name)}))
+    return families
+
+
+def family_filters(family: str) -> Optional[list]:
+    """
+    WHERE criteria selecting the posts of a sitemap family.
+
+    Args:
+        family: Family name ('posts', 'videos' or 'category-<slug>')
+
+    Returns:
+        List of criteria, or None for an unknown or disabled family
+    """
+    if family == 'posts' and 'posts' in config.SITEMAP_FAMILIES:
+        return []
+    if family == 'videos' and 'videos' in config.SITEMAP_FAMILIES:
+        return [Post.video_url.isnot(None), Post.video_url != '']
+    if family.startswith(CATEGORY_PREFIX) and 'categories' in config.SITEMAP_FAMILIES:
+        # Categories whose names differ only in punctuation or case share a slug, and a family
+        slug = family[len(CATEGORY_PREFIX):]
+        names = [
+            name for name in db.session.scalars(select(PostCounter.name).where(PostCounter.scope == 'category'))
+            if slugify(name) == slug
+        ]
+        if names:
+            return [Post.id.in_(select(PostCategory.post_id).where(PostCategory.name.in_(names)))]
+    return None
+
+
+def family_blocks(family: str) -> List[str]:
+    """Extension blocks ('video', 'image') written in a family's entries"""
+    return config.SITEMAP_BLOCKS['categories' if family.startswith(CATEGORY_PREFIX) else family]
+
+
+def parse_sitemap_name(name: str) -> Optional[Tuple[str, int]]:
+    """
+    Split a shard file name ('<family>-<n>', without .xml) into family and shard number.
+
+    Returns:
+        Tuple (family, shard), or None if the name is malformed
+    """
+    match = SITEMAP_NAME_PATTERN.match(name)
+    if not match:
+        return None
+    return match.group(1), int(match.group(2))
+
+
+def sitemap_sort_key(name: str) -> tuple:
+    """Order of shards in the index: posts, videos, then categories by slug, each by shard number"""
+    family, shard = parse_sitemap_name(name)
+    return FAMILY_ORDER.get(family, len(FAMILY_ORDER)), family, shard
+
+
+def iter_sitemap_posts(fetch_size: int = None, id_range: Optional[Tuple[int, int]] = None,
+                       filters: Iterable = (), include_body: bool = True) -> Iterator[Dict]:
+    """
+    Stream published posts as sitemap entry mappings.
+    Must be consumed inside an application context.
+
+    Args:
+        fetch_size: Rows fetched from the cursor at a time
+        id_range: Only posts with low < id <= high, in id order (a shard);
+            all posts newest first if None
+        filters: Extra criteria (see family_filters)
+        include_body: Read the body for video descriptions
+
+    Yields:
+        Dicts with the sitemap fields, tags and categories decoded
+    """
+    stmt = select(*sitemap_columns(include_body)).where(Post.is_published.is_(True), *filters)
+    if id_range:
+        stmt = stmt.where(Post.id > id_range[0], Post.id <= id_range[1]).order_by(Post.id)
+    else:
+        stmt = stmt.order_by(Post.created_at.desc(), Post.id.desc())
+    stmt = stmt.execution_options(yield_per=fetch_size or config.SITEMAP_FETCH_SIZE)
+
+    for row in db.session.execute(stmt):
+        post = row._asdict()
+        post['tags'] = json.loads(post['tags']) if post['tags'] else []
+        post['categories'] = json.loads(post['categories']) if post['categories'] else []
+        yield post
+
+
+def sitemap_is_sharded(shard_size: int = None) -> bool:
+    """
+    Whether /sitemap.xml is an index: several families are enabled, or the
+    published posts no longer fit in one sitemap (read from post_counters).
+    """
+    if config.SITEMAP_FAMILIES != ['posts']:
+        return True
+    totals = db.session.get(PostCounter, ('all', ''))
+    return bool(totals) and totals.published > (shard_size or config.SITEMAP_SHARD_SIZE)
+
+
+def shard_id_range(shard: int, shard_size: int = None) -> Tuple[int, int]:
+    """
+    Id range of a shard.
+
+    Args:
+        shard: Shard number (1-based)
+        shard_size: Post ids per shard
+
+    Returns:
+        Tuple (low, high): the shard holds posts with low < id <= high
+    """
+    shard_size = shard_size or config.SITEMAP_SHARD_SIZE
+    return (shard - 1) * shard_size, shard * shard_size
+
+
+def list_sitemap_shards(shard_size: int = None, family: str = 'posts') -> List[Dict]:
+    """
+    Summarize every shard of a family that holds published posts.
+    lastmod is the newest updated_at of any family post in the range, so
+    unpublishing a post also moves its shard's lastmod.
+
+    Args:
+        shard_size: Post ids per shard
+        family: Sitemap family
+
+    Returns:
+        List of {'name', 'shard', 'lastmod' (datetime), 'urls'} dicts in shard order
+    """
+    filters = family_filters(family)
+    if filters is None:
+        return []
+
+    shard_size = shard_size or config.SITEMAP_SHARD_SIZE
+    shard = ((Post.id - 1) // shard_size + 1).label('shard')
+    published = func.sum(case((Post.is_published.is_(True), 1), else_=0))
+
+    rows = db.session.execute(
+        select(shard, func.max(Post.updated_at), published).where(*filters).group_by(shard).order_by(shard)
+    ).all()
+
+    return [
+        {'name': f'{family}-{number}', 'shard': number, 'lastmod': lastmod, 'urls': urls}
+        for number, lastmod, urls in rows
+        if urls
+    ]
+
+
+def list_sitemaps(shard_size: int = None) -> List[Dict]:
+    """Non-empty shards of every enabled family, in index order (see list_sitemap_shards)"""
+    return [
+        shard
+        for family in sitemap_families()
+        for shard in list_sitemap_shards(shard_size, family)
+    ]
+
+
+def shard_state(shard: int, shard_size: int = None, family: str = 'posts') -> Optional[Tuple[int, Optional[datetime]]]:
+    """
+    Number of published posts and newest updated_at of a family within a shard's id range.
+
+    Args:
+        shard: Shard number (1-based)
+        shard_size: Post ids per shard
+        family: Sitemap family
+
+    Returns:
+        Tuple (published count, lastmod), or None for an invalid shard number or family
+    """
+    filters = family_filters(family)
+    if shard < 1 or filters is None:
+        return None
+    low, high = shard_id_range(shard, shard_size)
+    published = func.coalesce(func.sum(case((Post.is_published.is_(True), 1), else_=0)), 0)
+    return tuple(db.session.execute(
+        select(published, func.max(Post.updated_at)).where(Post.id > low, Post.id <= high, *filters)
+    ).one())
+
+
+def shard_validator(name: str, **view_args) -> Optional[Tuple[str, Optional[datetime]]]:
+    """Response validators of a shard: its post count and lastmod (None if the shard is empty)"""
+    parsed = parse_sitemap_name(name)
+    state = shard_state(parsed[1], family=parsed[0]) if parsed else None
+    if not state or not state[0]:
+        return None
+    count, lastmod = state
+    return f'{count}:{lastmod.isoformat()}', lastmod
+
+
+def iter_shard_xml(family: str, shard: int, site_url: str, shard_size: int = None) -> Iterator[str]:
+    """
+    Stream the sitemap of one family shard, with the family's extension blocks.
+    The homepage entry is part of posts-1.
+
+    Args:
+        family: Sitemap family
+        shard: Shard number (1-based)
+        site_url: Base site URL
+        shard_size: Post ids per shard
+
+    Returns:
+        Iterator of XML text chunks
+    """
+    blocks = family_blocks(family)
+    posts = iter_sitemap_posts(
+        id_range=shard_id_range(shard, shard_size),
+        filters=family_filters(family) or [],
+        include_body='video' in blocks
+    )
+    return iter_sitemap_xml(
+        posts,
+        site_url,
+        include_homepage=(family, shard) == ('posts', 1),
+        include_video='video' in blocks,
+        include_image='image' in blocks
+    )
+
+
+def iter_full_sitemap_xml(site_url: str) -> Iterator[str]:
+    """Stream the single sitemap of all published posts, newest first, used while unsharded"""
+    blocks = family_blocks('posts')
+    return iter_sitemap_xml(
+        iter_sitemap_posts(include_body='video' in blocks),
+        site_url,
+        include_video='video' in blocks,
+        include_image='image' in blocks
+    )
+
+
+def sitemap_index_entries(shards: Iterable[Dict]) -> List[Dict[str, str]]:
+    """Sitemap index entries ({'loc', 'lastmod'}) of shards from list_sitemaps"""
+    return [
+        {'loc': f"/sitemaps/{shard['name']}.xml", 'lastmod': format_w3c_datetime(shard['lastmod'])}
+        for shard in shards
+    ]
+
+
+def post_sitemap_keys(post_id: int, categories: Iterable[str], shard_size: int = None) -> List[Tuple[str, int]]:
+    """
+    (family, shard) pairs a post can appear in: its posts and videos shards
+    and the shards of its categories.
+
+    Args:
+        post_id: Post ID
+        categories: Category names the post has or had
+        shard_size: Post ids per shard
+    """
+    shard = shard_of(post_id, shard_size)
+    families = ['posts', 'videos'] + [category_family(name) for name in categories if slugify(name)]
+    return [(family, shard) for family in dict.fromkeys(families)]
+
+
+def format_w3c_datetime(value: datetime) -> str:
+    """Format a naive UTC datetime for <lastmod> of a sitemap index"""
+    return value.replace(microsecond=0).isoformat() + '+00:00'
+
+
+def shard_of(post_id: int, shard_size: int = None) -> int:
+    """Number of the shard holding a post id"""
+    return (post_id - 1) // (shard_size or config.SITEMAP_SHARD_SIZE) + 1
+
+
+def write_sitemap_file(path: Path, chunks: Iterable[str]):
+    """
+    Write a sitemap and its gzip-compressed copy (path + '.gz') atomically.
+    Both are streamed to temporary files in the same directory and renamed
+    into place, so readers see either the old or the new document.
+
+    Args:
+        path: Destination .xml path
+        chunks: XML text chunks
+    """
+    path = Path(path)
+    xml_handle, xml_temp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    gz_handle, gz_temp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(xml_handle, 'w', encoding='utf-8') as xml_file, \
+                gzip.open(os.fdopen(gz_handle, 'wb'), 'wt', encoding='utf-8', compresslevel=6) as gz_file:
+            for chunk in chunks:
+                xml_file.write(chunk)
+                gz_file.write(chunk)
+        os.replace(xml_temp, path)
+        os.replace(gz_temp, path.with_name(path.name + '.gz'))
+    except BaseException:
+        for temp in (xml_temp, gz_temp):
+            if os.path.exists(temp):
+                os.unlink(temp)
+        raise
+
+
+def remove_sitemap_file(path: Path):
+    """Delete a precomputed sitemap and its .gz copy if present"""
+    for name in (path.name, path.name + '.gz'):
+        try:
+            os.unlink(path.with_name(name))
+        except FileNotFoundError:
+            pass
+
+
+class SitemapFiles:
+    """
+    Precomputed sitemap files in one directory: sitemap.xml (a full sitemap
+    or an index), <family>-<n>.xml shards, their .gz copies and manifest.json.
+    """
+
+    def __init__(self, directory: Path, shard_size: int):
+        """
+        Initialize the file set.
+
+        Args:
+            directory: Output directory (created if missing)
+            shard_size: Post ids per shard
+        """
+        self.directory = Path(directory)
+        self.shard_size = shard_size
+        self.manifest_path = self.directory / 'manifest.json'
+        self.lock_path = self.directory / '.regenerate.lock'
+        # Without fcntl the guard only covers threads of this process
+        self.lock = threading.Lock()
+
+    def shard_path(self, name: str) -> Path:
+        return self.directory / f'{name}.xml'
+
+    def read_manifest(self) -> Dict:
+        try:
+            return json.loads(self.manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def write_manifest(self, manifest: Dict):
+        """Replace the manifest in one rename, so readers never see a partial file"""
+        handle, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w', encoding='utf-8') as temp_file:
+                json.dump(manifest, temp_file)
+            os.replace(temp, self.manifest_path)
+        except BaseException:
+            if os.path.exists(temp):
+                os.unlink(temp)
+            raise
+
+    @contextmanager
+    def exclusive(self):
+        """
+        Hold the regeneration lock: a thread lock plus an flock on a file in
+        the directory, so imports, API edits and `flask build-sitemaps` in
+        different processes never rewrite the files and manifest at once.
+        """
+        with self.lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as handle:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def settings(self) -> Dict:
+        """Settings the files were built with; a change rewrites every file"""
+        return {'shard_size': self.shard_size, 'families': config.SITEMAP_FAMILIES, 'blocks': config.SITEMAP_BLOCKS}
+
+    def regenerate(self, keys: Optional[Iterable[Tuple[str, int]]] = None, site_url: str = None,
+                   force: bool = False) -> List[str]:
+        """
+        Rewrite the files whose content changed since the last run.
+        Must be called inside an application context.
+
+        Args:
+            keys: Only re-check these (family, shard) pairs (e.g. after editing
+                one post, see post_sitemap_keys); every shard of every family is
+                compared against the manifest if None
+            site_url: Base site URL
+            force: Rewrite every file
+
+        Returns:
+            Names of the files written
+        """
+        site_url = site_url or config.SITE_URL
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.exclusive():
+            manifest = self.read_manifest()
+            if force or manifest.get('settings') != self.settings():
+                manifest = {}
+            if 'shards' not in manifest:
+                keys = None
+            previous = manifest.get('shards', {})
+
+            if keys is None:
+                states = {
+                    shard['name']: [shard['lastmod'].isoformat(), shard['urls']]
+                    for shard in list_sitemaps(self.shard_size)
+                }
+            else:
+                states = dict(previous)
+                for family, shard in keys:
+                    state = shard_state(shard, self.shard_size, family)
+                    if state and state[0]:
+                        states[f'{family}-{shard}'] = [state[1].isoformat(), state[0]]
+                    else:
+                        states.pop(f'{family}-{shard}', None)
+
+            sharded = sitemap_is_sharded(self.shard_size)
+            mode_changed = manifest.get('sharded') != sharded
+            changed = {key for key in set(states) | set(previous) if states.get(key) != previous.get(key)}
+            index_path = self.directory / 'sitemap.xml'
+            written = []
+
+            if sharded:
+                names = sorted(states, key=sitemap_sort_key)
+                for name in names:
+                    path = self.shard_path(name)
+                    if name in changed or mode_changed or not path.exists():
+                        family, shard = parse_sitemap_name(name)
+                        write_sitemap_file(path, iter_shard_xml(family, shard, site_url, self.shard_size))
+                        written.append(path.name)
+                for name in set(previous) - set(states):
+                    remove_sitemap_file(self.shard_path(name))
+
+                if changed or mode_changed or not index_path.exists():
+                    sitemaps = sitemap_index_entries(
+                        {'name': name, 'lastmod': datetime.fromisoformat(states[name][0])} for name in names
+                    )
+                    write_sitemap_file(index_path, [generate_sitemap_index(sitemaps, site_url)])
+                    written.append(index_path.name)
+            else:
+                if changed or mode_changed or not index_path.exists():
+                    write_sitemap_file(index_path, iter_full_sitemap_xml(site_url))
+                    written.append(index_path.name)
+                for name in set(previous) | set(states):
+                    remove_sitemap_file(self.shard_path(name))
+
+            self.write_manifest({'settings': self.settings(), 'sharded': sharded, 'shards': states})
+
+        if written:
+            logger.info(f"Regenerated sitemap files: {', '.join(written)}")
+        return written
+
+    def response(self, name: str):
+        """
+        Serve a precomputed file with send_file: the .gz copy with
+        Content-Encoding: gzip when the client accepts it. The file carries
+        no validators of its own; cached_response adds the route's ETag and
+        answers conditional requests, so 304s and 200s use the same one.
+
+        Args:
+            name: File name (sitemap.xml or <family>-<n>.xml)
+
+        Returns:
+            Response, or None if the file has not been generated
+        """
+        path = self.directory / name
+        try:
+            if 'gzip' in request.accept_encodings:
+                response = send_file(path.with_name(name + '.gz'), mimetype='application/xml',
+                                     download_name=name, etag=False)
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                response = send_file(path, mimetype='application/xml', download_name=name, etag=False)
+        except FileNotFoundError:
+            return None
+
+        response.last_modified = None
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+
+_default_files = None
+
+
+def get_sitemap_files() -> SitemapFiles:
+    """Get the process-wide precomputed sitemap files"""
+    global _default_files
+    if _default_files is None:
+        _default_files = SitemapFiles(config.SITEMAP_DIR, config.SITEMAP_SHARD_SIZE)
+    return _default_files
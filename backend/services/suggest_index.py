@@ -0,0 +1,334 @@
+"""
+Suggest Index
+In-memory prefix index behind /api/suggest (search box autocomplete).
+Covers post titles, categories, tags and focus keywords of published posts,
+weighted by how many posts use each term. Built from the database on first
+use. Each worker process holds its own index, tagged with the cache
+generation it reflects; a query that finds the generation moved on (a write
+in any process) applies just the posts those generations changed, as
+recorded in models.PostChange, and rebuilds only when that record is incomplete.
+"""
+import heapq
+import json
+import logging
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Order of suggestion types when weights tie
+KIND_PRIORITY = {'category': 0, 'tag': 1, 'keyword': 2, 'post': 3}
+
+# Prefix-range terminator: sorts after any character used in a normalized key
+_MAX_CHAR = '\U0010ffff'
+
+# Prefix ranges longer than this are ranked once and cached
+SCAN_LIMIT = 256
+
+# Changed posts read per query when catching up
+CATCH_UP_CHUNK = 500
+
+
+def post_columns() -> tuple:
+    """Post columns an index entry is derived from"""
+    from models import Post
+    return Post.id, Post.slug, Post.title, Post.focus_keyword, Post.categories, Post.tags
+
+
+def post_contribution(row) -> tuple:
+    """
+    Entries a published post counts towards: its title, its categories,
+    tags and focus keyword (each distinct term once).
+
+    Args:
+        row: Row with the post_columns() of a post (categories/tags as JSON text)
+
+    Returns:
+        Tuple of (kind, ident, text, slug)
+    """
+    contribution = [('post', row.slug, row.title, row.slug)]
+    for kind, names in (
+        ('category', json.loads(row.categories) if row.categories else []),
+        ('tag', json.loads(row.tags) if row.tags else []),
+        ('keyword', [row.focus_keyword] if row.focus_keyword else [])
+    ):
+        seen = set()
+        for name in names:
+            term = normalize(name)
+            if term and term not in seen:
+                seen.add(term)
+                contribution.append((kind, term, name, None))
+    return tuple(contribution)
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse whitespace for prefix matching"""
+    return re.sub(r'\s+', ' ', text or '').strip().lower()
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index with cached top results for large prefix ranges.
+    Keys are (normalized text, kind, identifier) tuples kept sorted, so a
+    prefix maps to one contiguous range found by binary search. The best
+    entries for prefixes of up to cached_prefix_length characters are ranked
+    at build time, those of other ranges over SCAN_LIMIT keys on first use.
+    Cached lists are updated as weights grow and dropped when an entry in
+    them loses weight.
+    """
+
+    def __init__(self, max_results: int = 20, cached_prefix_length: int = 3):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_results: Largest number of suggestions a query may ask for
+            cached_prefix_length: Prefixes up to this length answer from a cache
+        """
+        self.max_results = max_results
+        self.cached_prefix_length = cached_prefix_length
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()  # Single flight for catch-ups and rebuilds
+        self.keys = []      # Sorted (normalized, kind, ident)
+        self.entries = {}   # (kind, ident) -> {'text', 'weight', 'slug'}
+        self.top = {}       # prefix -> [(rank, key)] best first, for short and large-range prefixes
+        self.contributions = {}  # post id -> entries the published post counts towards
+        self.built = False
+        self.generation = None  # Cache generation the index reflects
+
+    @staticmethod
+    def rank(entry: Dict, key) -> tuple:
+        """Sort key: heavier first, then by type, then shorter text"""
+        return (-entry['weight'], KIND_PRIORITY[key[1]], len(key[0]), key[0])
+
+    def build(self):
+        """
+        Rebuild the index from published posts in the database.
+        Must be called inside an application context.
+        """
+        from models import db, Post, get_cache_generation
+
+        # Read first: a write committed while building moves the generation past it
+        generation, _ = get_cache_generation()
+        rows = db.session.query(*post_columns()).filter(Post.is_published.is_(True)).all()
+
+        contributions = {row.id: post_contribution(row) for row in rows}
+        entries = {}
+        for contribution in contributions.values():
+            for kind, ident, text, slug in contribution:
+                entry = entries.setdefault((kind, ident), {'text': text, 'weight': 0, 'slug': slug})
+                entry['weight'] += 1
+
+        keys = sorted((normalize(entry['text']), kind, ident) for (kind, ident), entry in entries.items())
+        keys = [key for key in keys if key[0]]
+
+        top = {}
+        for key in keys:
+            entry = entries[(key[1], key[2])]
+            for length in range(1, min(len(key[0]), self.cached_prefix_length) + 1):
+                top.setdefault(key[0][:length], []).append((self.rank(entry, key), key))
+        for prefix, candidates in top.items():
+            top[prefix] = heapq.nsmallest(self.max_results, candidates)
+
+        with self.lock:
+            self.contributions = contributions
+            self.entries = entries
+            self.keys = keys
+            self.top = top
+            self.built = True
+            self.generation = generation
+
+        logger.info(f"Suggest index built with {len(keys)} entries")
+
+    def catch_up(self, generation: int) -> bool:
+        """
+        Apply the posts changed since the index's generation (see models.PostChange):
+        each changed post's old terms lose a use and its current terms gain one.
+        Must be called inside an application context.
+
+        Args:
+            generation: Generation to catch up to
+
+        Returns:
+            False if the changes are not all recorded (the index needs a rebuild)
+        """
+        from models import db, Post, get_post_changes
+
+        post_ids = get_post_changes(self.generation, generation)
+        if post_ids is None:
+            return False
+
+        current = {}
+        post_ids = sorted(post_ids)
+        for i in range(0, len(post_ids), CATCH_UP_CHUNK):
+            rows = db.session.query(*post_columns()).filter(
+                Post.id.in_(post_ids[i:i + CATCH_UP_CHUNK]), Post.is_published.is_(True)
+            ).all()
+            current.update((row.id, post_contribution(row)) for row in rows)
+
+        with self.lock:
+            for post_id in post_ids:
+                old = self.contributions.pop(post_id, ())
+                new = current.get(post_id, ())
+                if new:
+                    self.contributions[post_id] = new
+                if old == new:
+                    continue
+                for kind, ident, text, slug in old:
+                    self.remove_use(kind, ident)
+                for kind, ident, text, slug in new:
+                    self.add_entry(kind, ident, text, slug=slug)
+            self.generation = generation
+
+        logger.debug(f"Suggest index caught up on {len(post_ids)} changed posts")
+        return True
+
+    def is_current(self, generation: int) -> bool:
+        """Whether the index is built and reflects the given cache generation"""
+        return self.built and self.generation == generation
+
+    def refresh(self, generation: int):
+        """
+        Bring the index up to a generation, incrementally when every change
+        since its own generation is recorded and by a rebuild otherwise.
+        One thread refreshes at a time; while it does, other queries answer
+        from the index as it is (they only wait if nothing is built yet).
+        Must be called inside an application context.
+
+        Args:
+            generation: Current cache generation
+        """
+        if self.is_current(generation):
+            return
+        if not self.refresh_lock.acquire(blocking=not self.built):
+            return
+        try:
+            if self.is_current(generation):
+                return
+            if not (self.built and self.catch_up(generation)):
+                self.build()
+        finally:
+            self.refresh_lock.release()
+
+    def add_entry(self, kind: str, ident: str, text: str, slug: Optional[str] = None, weight: int = 1):
+        """Insert an entry or add to its weight, keeping sorted keys and prefix caches current"""
+        term = normalize(text)
+        if not term or not ident:
+            return
+
+        entry = self.entries.get((kind, ident))
+        if entry is None:
+            entry = {'text': text, 'weight': 0, 'slug': slug}
+            self.entries[(kind, ident)] = entry
+            insort(self.keys, (term, kind, ident))
+        else:
+            term = normalize(entry['text'])
+        entry['weight'] += weight
+
+        # A heavier entry can only move up, so every cached list stays exact
+        key = (term, kind, ident)
+        rank = self.rank(entry, key)
+        for length in range(1, len(term) + 1):
+            cached = self.top.get(term[:length])
+            if cached is None:
+                continue
+            candidates = [item for item in cached if item[1] != key]
+            candidates.append((rank, key))
+            candidates.sort()
+            self.top[term[:length]] = candidates[:self.max_results]
+
+    def remove_use(self, kind: str, ident: str):
+        """Take one use off an entry, dropping it at zero and any cached list it was in"""
+        entry = self.entries.get((kind, ident))
+        if entry is None:
+            return
+
+        term = normalize(entry['text'])
+        key = (term, kind, ident)
+        entry['weight'] -= 1
+        if entry['weight'] <= 0:
+            del self.entries[(kind, ident)]
+            index = bisect_left(self.keys, key)
+            if index < len(self.keys) and self.keys[index] == key:
+                del self.keys[index]
+
+        # Entries below it may now rank higher; recomputed on the next query for the prefix
+        for length in range(1, len(term) + 1):
+            cached = self.top.get(term[:length])
+            if cached is not None and any(item[1] == key for item in cached):
+                del self.top[term[:length]]
+
+    def best_keys(self, term: str) -> List[tuple]:
+        """
+        Best-ranked keys starting with a normalized term.
+        Ranges of more than SCAN_LIMIT keys are ranked once and cached,
+        so no query scans a large range twice.
+        """
+        cached = self.top.get(term)
+        if cached is not None:
+            return [key for _, key in cached]
+
+        start = bisect_left(self.keys, (term,))
+        end = bisect_left(self.keys, (term + _MAX_CHAR,))
+        ranked = heapq.nsmallest(
+            self.max_results,
+            ((self.rank(self.entries[(key[1], key[2])], key), key) for key in self.keys[start:end])
+        )
+        if end - start > SCAN_LIMIT:
+            self.top[term] = ranked
+        return [key for _, key in ranked]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """
+        Get the best suggestions starting with a prefix.
+
+        Args:
+            prefix: Text typed so far
+            limit: Maximum number of suggestions (capped at max_results)
+
+        Returns:
+            List of {'text', 'type', 'slug', 'count'} dicts, best first
+        """
+        term = normalize(prefix)
+        limit = max(1, min(limit, self.max_results))
+        if not term:
+            return []
+
+        with self.lock:
+            best = self.best_keys(term)
+            results = []
+            seen = set()
+            for key in best:
+                # The same text can be a tag, a keyword and a title; show it once
+                if key[0] in seen:
+                    continue
+                seen.add(key[0])
+                if len(results) == limit:
+                    break
+
+                entry = self.entries[(key[1], key[2])]
+                results.append({
+                    'text': entry['text'],
+                    'type': key[1],
+                    'slug': entry['slug'],
+                    'count': entry['weight']
+                })
+            return results
+
+
+_default_index = None
+
+
+def get_suggest_index() -> SuggestIndex:
+    """Get the process-wide suggest index"""
+    global _default_index
+    if _default_index is None:
+        _default_index = SuggestIndex(
+            max_results=config.SUGGEST_MAX_RESULTS,
+            cached_prefix_length=config.SUGGEST_CACHED_PREFIX_LENGTH
+        )
+    return _default_index
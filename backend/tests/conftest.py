@@ -0,0 +1,80 @@
+"""
+Shared fixtures: the Flask app on a throwaway SQLite database and a
+helper writing scraped-data files.
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Keep the app away from the real database, lock file and sitemap directory
+_work_dir = Path(tempfile.mkdtemp(prefix='seo-backend-tests-'))
+os.environ['AUTO_PROCESS_ENABLED'] = 'false'
+os.environ['IMPORT_LOCK_FILE'] = str(_work_dir / 'import.lock')
+os.environ['SITEMAP_DIR'] = str(_work_dir / 'sitemaps')
+os.environ['CACHE_BACKEND'] = 'none'
+
+import config
+
+config.DATABASE_URI = f"sqlite:///{_work_dir / 'posts.db'}"
+
+
+def make_article(key: str, **fields) -> dict:
+    """A scraped article with a URL and title derived from key"""
+    article = {
+        'url': f'https://www.ytplatform.com/videos/{key}/',
+        'thumbnail': f'https://www.ytplatform.com/wp-content/uploads/{key}.gif',
+        'title': f'Cooking Tutorial {key}',
+        'body': f'Learn how to cook {key} step by step with simple ingredients.',
+        'video': f'https://cdn.ytplatform.com/{key}.mp4',
+        'video_duration': '5:58',
+        'category': ['Cooking'],
+        'tags': ['cooking tutorial', key],
+    }
+    article.update(fields)
+    return article
+
+
+def write_data_file(path: Path, pages: dict) -> Path:
+    """
+    Write a scraped-data file.
+
+    Args:
+        path: Destination
+        pages: {page_number: [article, ...]}
+
+    Returns:
+        The path
+    """
+    data = {
+        str(page_number): {
+            'page_number': page_number,
+            'articles': {str(i): article for i, article in enumerate(articles, 1)}
+        }
+        for page_number, articles in pages.items()
+    }
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return path
+
+
+@pytest.fixture(scope='session')
+def app_module():
+    import app as app_module
+    yield app_module
+    app_module.job_queue.shutdown()
+
+
+@pytest.fixture
+def app(app_module):
+    return app_module.app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,137 @@
+"""
+Tests for the single-flight import lock.
+"""
+import json
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.import_lock import ImportLock
+
+
+@pytest.fixture
+def lock(tmp_path):
+    return ImportLock(tmp_path / 'import.lock')
+
+
+def test_runs_own_request(lock):
+    calls = []
+    result = lock.run({'n': 1}, lambda request, own: calls.append((request, own)) or 'stats')
+
+    assert result == {'status': 'completed', 'statistics': 'stats'}
+    assert calls == [({'n': 1}, True)]
+    assert not lock.is_locked()
+    assert not lock.pending_path.exists()
+
+
+def run_while_locked(lock, requests):
+    """Start an import of {'n': 1}, submit requests while it runs, and return the runner calls"""
+    calls = []
+    started = threading.Event()
+    finish = threading.Event()
+
+    def runner(request, own):
+        calls.append((request, own))
+        if request['n'] == 1:
+            started.set()
+            assert finish.wait(5)
+        return request['n']
+
+    results = {}
+    first = threading.Thread(target=lambda: results.setdefault(1, lock.run({'n': 1}, runner)))
+    first.start()
+    assert started.wait(5)
+
+    # Triggers while the first import runs return at once
+    assert lock.is_locked()
+    for request in requests:
+        assert lock.run(request, runner) == {'status': 'coalesced', 'statistics': None}
+    assert calls == [({'n': 1}, True)]
+
+    finish.set()
+    first.join(5)
+
+    assert results[1] == {'status': 'completed', 'statistics': 1}
+    assert not lock.is_locked()
+    assert not lock.pending_path.exists()
+    return calls
+
+
+def test_concurrent_imports_coalesce_into_one_follow_up(lock):
+    calls = run_while_locked(lock, [
+        {'n': 2, 'coalesced_log_ids': [10]},
+        {'n': 2, 'coalesced_log_ids': [11]},
+        {'n': 2, 'coalesced_log_ids': [12]},
+    ])
+    assert calls == [({'n': 1}, True), ({'n': 2, 'coalesced_log_ids': [10, 11, 12]}, False)]
+
+
+def test_distinct_requests_keep_their_options(lock):
+    plain = {'n': 2, 'processor_options': {}}
+    upsert = {'n': 2, 'processor_options': {'upsert': True}}
+    calls = run_while_locked(lock, [upsert, plain, upsert])
+    assert calls == [({'n': 1}, True), (upsert, False), (plain, False)]
+
+
+def test_stale_pending_file_runs_once(lock):
+    # Left behind by a process that crashed after queueing a follow-up
+    lock.pending_path.write_text(json.dumps({'n': 'stale'}), encoding='utf-8')
+    assert not lock.is_locked()
+
+    calls = []
+    runner = lambda request, own: calls.append((request, own))
+
+    assert lock.run({'n': 1}, runner)['status'] == 'completed'
+    assert calls == [({'n': 1}, True), ({'n': 'stale'}, False)]
+    assert not lock.pending_path.exists()
+
+    calls.clear()
+    lock.run({'n': 2}, runner)
+    assert calls == [({'n': 2}, True)]
+
+
+def test_lock_released_when_import_fails(lock):
+    def runner(request, own):
+        raise RuntimeError('boom')
+
+    with pytest.raises(RuntimeError):
+        lock.run({'n': 1}, runner)
+    assert not lock.is_locked()
+
+
+def test_coalesced_job_links_follow_up_log(app, tmp_path):
+    from conftest import make_article, write_data_file
+    from models import db, ProcessingLog
+    from services.import_lock import get_import_lock, run_import
+
+    data_file = write_data_file(tmp_path / 'data.json', {1: [make_article(f'lock-{uuid.uuid4().hex[:8]}')]})
+    with app.app_context():
+        job_log = ProcessingLog(status='queued', data_file=str(data_file))
+        db.session.add(job_log)
+        db.session.commit()
+        job_id = job_log.id
+
+    # Another import holds the lock, so the job is coalesced into its follow-up
+    lock = get_import_lock()
+    handle = lock.try_acquire()
+    try:
+        result = run_import(app, data_file, processor_options={'upsert': True}, log_id=job_id)
+    finally:
+        lock.release(handle)
+    assert result['status'] == 'coalesced'
+
+    # The next import runs the follow-up
+    assert run_import(app, data_file)['status'] == 'completed'
+
+    with app.app_context():
+        job_log = db.session.get(ProcessingLog, job_id)
+        assert job_log.status == 'coalesced'
+        follow_up = db.session.get(ProcessingLog, job_log.merged_into_id)
+        assert follow_up.status == 'completed'
+        assert follow_up.processed_articles == 1
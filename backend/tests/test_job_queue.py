@@ -0,0 +1,36 @@
+"""
+Tests for the background job queue.
+"""
+import uuid
+
+from conftest import make_article, write_data_file
+from services import job_queue as job_queue_module
+from services.job_queue import JobQueue
+
+
+def test_finished_jobs_are_not_kept_forever(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue_module, 'FINISHED_JOBS_KEPT', 2)
+    queue = JobQueue(app, max_workers=1, max_pending=10)
+    try:
+        job_ids = []
+        for i in range(5):
+            data_file = write_data_file(tmp_path / f'data-{i}.json', {1: [make_article(uuid.uuid4().hex[:8])]})
+            job_ids.append(queue.submit(data_file, source='test'))
+    finally:
+        queue.shutdown(wait=True)
+
+    assert queue.jobs == {}
+    assert list(queue.finished) == job_ids[-2:]
+    assert queue.pending_count() == 0
+
+    with app.app_context():
+        recent = queue.get_job(job_ids[-1])
+        assert recent['status'] == 'completed'
+        assert recent['source'] == 'test'
+
+        # Dropped from memory, still reported from its processing log
+        oldest = queue.get_job(job_ids[0])
+        assert oldest['status'] == 'completed'
+        assert oldest['source'] is None
+        assert oldest['submitted_at'] and oldest['finished_at']
+        assert oldest['progress']['processed'] == 1
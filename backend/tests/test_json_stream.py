@@ -0,0 +1,145 @@
+"""
+Tests for the incremental JSON reader.
+Every chunk size must give the same members as json.load.
+"""
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import json_stream
+from utils.json_stream import iter_json_object
+
+
+DOCUMENTS = [
+    '{"a": 1.5e3, "b": 3}',
+    '{"a": -0.25, "b": 1E-7, "c": 2e+10, "d": -12}',
+    '{"n": 10, "t": true, "f": false, "z": null}',
+    '{ "s" : "say \\"hi\\" \\u00e9" , "empty": {}, "list": [1, 2.5, "x"] }',
+    '{"nested": {"page": [{"title": "A", "views": 1234567}]}, "last": 0.5}',
+    '{}',
+]
+
+
+def random_document(rng: random.Random) -> str:
+    """A JSON object with numbers in every notation and some nesting"""
+    def number():
+        return rng.choice([
+            rng.randint(-10 ** 6, 10 ** 6),
+            rng.uniform(-1000, 1000),
+            float(f'{rng.randint(1, 9)}.{rng.randint(0, 999)}e{rng.randint(-20, 20)}'),
+        ])
+
+    def value(depth):
+        kind = rng.randrange(5 if depth < 3 else 3)
+        if kind == 0:
+            return number()
+        if kind == 1:
+            return rng.choice([True, False, None, 'text', 'ünïcode "quoted"'])
+        if kind == 2:
+            return ''.join(rng.choice('abc xyz') for _ in range(rng.randrange(20)))
+        if kind == 3:
+            return [value(depth + 1) for _ in range(rng.randrange(4))]
+        return {f'k{i}': value(depth + 1) for i in range(rng.randrange(4))}
+
+    members = {f'member{i}': value(0) for i in range(rng.randrange(1, 30))}
+    return json.dumps(members, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5)
+
+
+def parse(tmp_path: Path, text: str, chunk_size: int):
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    return dict(iter_json_object(path, chunk_size=chunk_size))
+
+
+@pytest.mark.parametrize('text', DOCUMENTS)
+@pytest.mark.parametrize('chunk_size', range(1, 12))
+def test_matches_json_load(tmp_path, text, chunk_size):
+    assert parse(tmp_path, text, chunk_size) == json.loads(text)
+
+
+def test_number_cut_after_exponent(tmp_path):
+    # The chunks end right after "1." and right after "1.5e"
+    assert parse(tmp_path, '{"a": 1.5e3, "b": 3}', 4) == {'a': 1500.0, 'b': 3}
+    assert parse(tmp_path, '{"a":1.5e3}', 9) == {'a': 1500.0}
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_documents_and_chunk_sizes(tmp_path, seed):
+    rng = random.Random(seed)
+    text = random_document(rng)
+    for chunk_size in [rng.randint(1, 64) for _ in range(5)]:
+        assert parse(tmp_path, text, chunk_size) == json.loads(text), chunk_size
+
+
+def large_page(articles: int = 2000) -> dict:
+    return {
+        str(i): {'url': f'https://example.com/{i}', 'title': 'title ' * 20, 'views': i * 1.5, 'tags': ['a', 'b']}
+        for i in range(articles)
+    }
+
+
+def reads_counted(monkeypatch):
+    """Count the characters iter_json_object reads from its files"""
+    counter = {'chars': 0}
+    real_open = open
+
+    class CountingFile:
+        def __init__(self, *args, **kwargs):
+            self.file = real_open(*args, **kwargs)
+
+        def read(self, size):
+            data = self.file.read(size)
+            counter['chars'] += len(data)
+            return data
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.file.close()
+
+    monkeypatch.setattr(json_stream, 'open', CountingFile, raising=False)
+    return counter
+
+
+def test_value_much_larger_than_chunk(tmp_path):
+    text = json.dumps({'1': {'articles': large_page()}, '2': {'articles': {}}, 'n': 12.5e3})
+    assert len(text) > 100 * 64
+    assert parse(tmp_path, text, 64) == json.loads(text)
+
+
+def test_truncated_large_value(tmp_path):
+    text = json.dumps({'1': {'articles': large_page()}})
+    with pytest.raises(json.JSONDecodeError):
+        parse(tmp_path, text[:len(text) // 2], 64)
+
+
+def test_malformed_large_value_fails_without_reading_on(tmp_path, monkeypatch):
+    page = json.dumps({'articles': large_page()})
+    text = '{"1": {"articles": [1 2]}, "2": ' + page + ', "3": ' + page + '}'
+    counter = reads_counted(monkeypatch)
+    with pytest.raises(json.JSONDecodeError):
+        parse(tmp_path, text, 64)
+    assert counter['chars'] < 256
+
+
+def test_value_over_limit(tmp_path, monkeypatch):
+    text = json.dumps({'1': {'articles': large_page()}, '2': 0})
+    counter = reads_counted(monkeypatch)
+    path = tmp_path / 'data.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(json.JSONDecodeError, match='exceeds the limit'):
+        list(iter_json_object(path, chunk_size=64, max_value_size=10000))
+    assert counter['chars'] <= 10000 + 64
+
+
+@pytest.mark.parametrize('text', ['{"a": 1,}', '{"a" 1}', '[1, 2]', '{"a": 1.}', '{"a": tru}'])
+def test_malformed(tmp_path, text):
+    with pytest.raises(json.JSONDecodeError):
+        parse(tmp_path, text, 3)
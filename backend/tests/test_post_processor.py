@@ -0,0 +1,115 @@
+"""
+Tests for PostProcessor imports against the test database.
+Each test uses its own article URLs, since the database is shared.
+"""
+import uuid
+
+import pytest
+
+import config
+from conftest import make_article, write_data_file
+from models import db, ArticleFingerprint, Post
+from services.post_processor import PostProcessor
+
+
+def unique_keys(count: int):
+    prefix = uuid.uuid4().hex[:8]
+    return [f'{prefix}-{i}' for i in range(count)]
+
+
+def run_import(app, data_file, resume=False, **options):
+    with app.app_context():
+        processor = PostProcessor(app=app, incremental=True, **options)
+        return processor.process_all_data(data_file=data_file, resume=resume)
+
+
+def test_unchanged_articles_are_skipped(app, tmp_path):
+    keys = unique_keys(3)
+    data_file = write_data_file(tmp_path / 'data.json', {1: [make_article(key) for key in keys]})
+
+    assert run_import(app, data_file)['created'] == 3
+    stats = run_import(app, data_file)
+    assert stats['created'] == 0
+    assert stats['unchanged'] == 3
+
+
+def test_deleted_post_is_imported_again(app, client, tmp_path):
+    keys = unique_keys(3)
+    articles = [make_article(key) for key in keys]
+    data_file = write_data_file(tmp_path / 'data.json', {1: articles})
+    assert run_import(app, data_file)['created'] == 3
+
+    with app.app_context():
+        post_id = Post.query.filter_by(original_url=articles[1]['url']).one().id
+    assert client.delete(f'/api/posts/{post_id}').status_code == 200
+    with app.app_context():
+        assert ArticleFingerprint.query.filter_by(original_url=articles[1]['url']).count() == 0
+
+    stats = run_import(app, data_file)
+    assert stats['created'] == 1
+    assert stats['unchanged'] == 2
+    with app.app_context():
+        assert Post.query.filter_by(original_url=articles[1]['url']).count() == 1
+
+
+def test_fingerprint_without_post_does_not_skip(app, tmp_path):
+    # A post removed outside the API leaves its fingerprint behind
+    keys = unique_keys(2)
+    articles = [make_article(key) for key in keys]
+    data_file = write_data_file(tmp_path / 'data.json', {1: articles})
+    assert run_import(app, data_file)['created'] == 2
+
+    with app.app_context():
+        Post.query.filter_by(original_url=articles[0]['url']).delete()
+        db.session.commit()
+
+    stats = run_import(app, data_file)
+    assert stats['created'] == 1
+    assert stats['unchanged'] == 1
+
+
+def interrupted_run(app, monkeypatch, data_file):
+    """Run an import that fails in its second batch, leaving a checkpoint after the first"""
+    monkeypatch.setattr(config, 'BATCH_SIZE', 2)
+    original = PostProcessor.process_articles_batch
+    calls = []
+
+    def failing_batch(self, batch, commit=True):
+        calls.append(len(batch))
+        if len(calls) == 2:
+            raise RuntimeError('interrupted')
+        return original(self, batch, commit=commit)
+
+    monkeypatch.setattr(PostProcessor, 'process_articles_batch', failing_batch)
+    with pytest.raises(RuntimeError):
+        run_import(app, data_file)
+    monkeypatch.setattr(PostProcessor, 'process_articles_batch', original)
+
+
+def test_resume_continues_after_checkpoint(app, monkeypatch, tmp_path):
+    articles = [make_article(key) for key in unique_keys(5)]
+    data_file = write_data_file(tmp_path / 'data.json', {1: articles})
+    interrupted_run(app, monkeypatch, data_file)
+
+    stats = run_import(app, data_file, resume=True)
+    assert stats['created'] == 5
+    assert stats['processed'] == 5
+    assert stats['total_articles'] == 5
+
+
+def test_resume_starts_over_when_file_was_rewritten(app, monkeypatch, tmp_path):
+    articles = [make_article(key) for key in unique_keys(5)]
+    data_file = write_data_file(tmp_path / 'data.json', {1: articles})
+    interrupted_run(app, monkeypatch, data_file)
+
+    # The scraper rewrites the file with a new article ahead of the checkpoint
+    added = make_article(unique_keys(1)[0])
+    write_data_file(data_file, {1: [added] + articles})
+
+    stats = run_import(app, data_file, resume=True)
+    assert stats['total_articles'] == 6
+    assert stats['processed'] == 6
+    assert stats['created'] == 4
+    assert stats['unchanged'] == 2
+    with app.app_context():
+        assert Post.query.filter_by(original_url=added['url']).count() == 1
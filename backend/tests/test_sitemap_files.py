@@ -0,0 +1,47 @@
+"""
+Tests for serving the precomputed sitemap files.
+"""
+import gzip
+import uuid
+
+import config
+from conftest import make_article, write_data_file
+from services.post_processor import PostProcessor
+from services.sitemaps import get_sitemap_files
+
+
+def generated_sitemaps(app, tmp_path):
+    data_file = write_data_file(tmp_path / 'data.json', {1: [make_article(uuid.uuid4().hex[:8])]})
+    with app.app_context():
+        PostProcessor(app=app, incremental=True).process_all_data(data_file=data_file)
+        get_sitemap_files().regenerate(force=True)
+
+
+def test_file_responses_use_the_route_etag(app, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'SITEMAP_PRECOMPUTE', True)
+    generated_sitemaps(app, tmp_path)
+
+    etags = set()
+    for encoding in ('gzip', 'identity'):
+        response = client.get('/sitemap.xml', headers={'Accept-Encoding': encoding})
+        assert response.status_code == 200
+        assert response.mimetype == 'application/xml'
+        assert response.headers['Content-Disposition'].endswith('filename=sitemap.xml')
+        etag = response.get_etag()[0]
+        etags.add(etag)
+
+        body = response.get_data()
+        if encoding == 'gzip':
+            assert response.headers['Content-Encoding'] == 'gzip'
+            body = gzip.decompress(body)
+        assert body.startswith(b'<?xml')
+
+        revalidated = client.get('/sitemap.xml', headers={'Accept-Encoding': encoding, 'If-None-Match': f'"{etag}"'})
+        assert revalidated.status_code == 304
+        assert revalidated.get_etag()[0] == etag
+
+    # One ETag from the route's validator, whichever file was sent and however often it is rewritten
+    with app.app_context():
+        get_sitemap_files().regenerate(force=True)
+    assert client.get('/sitemap.xml').get_etag()[0] in etags
+    assert len(etags) == 1
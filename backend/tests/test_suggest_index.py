@@ -0,0 +1,118 @@
+"""
+Tests for the in-memory suggest index: catching up on changes recorded by
+other processes must give the same index as a rebuild.
+"""
+import threading
+import uuid
+
+from conftest import make_article, write_data_file
+from models import db, Post, get_cache_generation
+from services.post_processor import PostProcessor
+from services.suggest_index import SCAN_LIMIT, SuggestIndex
+
+
+def import_articles(app, tmp_path, articles):
+    data_file = write_data_file(tmp_path / f'{uuid.uuid4().hex}.json', {1: articles})
+    with app.app_context():
+        PostProcessor(app=app, incremental=False).process_all_data(data_file=data_file)
+
+
+def refreshed(app, index):
+    with app.app_context():
+        index.refresh(get_cache_generation()[0])
+    return index
+
+
+def snapshot(index):
+    weights = {key: entry['weight'] for key, entry in index.entries.items()}
+    answers = {prefix: index.suggest(prefix, 20) for prefix in ('c', 'co', 'coo', 'cooking', 'cooking tut', 'z', 'zz')}
+    return index.keys, weights, answers
+
+
+def rebuilt(app):
+    index = SuggestIndex()
+    with app.app_context():
+        index.build()
+    return index
+
+
+def test_catch_up_matches_rebuild(app, client, tmp_path, monkeypatch):
+    prefix = uuid.uuid4().hex[:6]
+    index = refreshed(app, rebuilt(app))
+    monkeypatch.setattr(index, 'build', lambda: (_ for _ in ()).throw(AssertionError('rebuilt')))
+
+    import_articles(app, tmp_path, [
+        make_article(f'{prefix}-{i}', category=['Cooking', f'Zz {prefix}'], tags=[f'zz tag {prefix}', 'cooking'])
+        for i in range(4)
+    ])
+    refreshed(app, index)
+    assert snapshot(index) == snapshot(rebuilt(app))
+
+    with app.app_context():
+        ids = [post.id for post in Post.query.filter(Post.original_url.contains(prefix)).order_by(Post.id)]
+    assert client.put(f'/api/posts/{ids[0]}', json={'title': f'Zz renamed {prefix}', 'categories': ['Baking']}).status_code == 200
+    assert client.put(f'/api/posts/{ids[1]}', json={'is_published': False}).status_code == 200
+    assert client.delete(f'/api/posts/{ids[2]}').status_code == 200
+
+    refreshed(app, index)
+    assert snapshot(index) == snapshot(rebuilt(app))
+    assert index.suggest(f'zz renamed {prefix}')[0]['type'] == 'post'
+
+
+def test_rebuilds_when_changes_are_unknown(app, tmp_path):
+    index = refreshed(app, rebuilt(app))
+    import_articles(app, tmp_path, [make_article(uuid.uuid4().hex[:8])])
+
+    with app.app_context():
+        from models import bump_cache_generation
+        bump_cache_generation()
+        db.session.commit()
+
+    builds = []
+    original_build = index.build
+    index.build = lambda: builds.append(1) or original_build()
+    refreshed(app, index)
+    assert builds == [1]
+    assert snapshot(index) == snapshot(rebuilt(app))
+
+
+def test_refresh_is_single_flight(app, tmp_path):
+    index = refreshed(app, rebuilt(app))
+    generation = index.generation
+    import_articles(app, tmp_path, [make_article(uuid.uuid4().hex[:8])])
+
+    # Another request is refreshing: this one answers from the index as it is
+    assert index.refresh_lock.acquire()
+    try:
+        refresh = threading.Thread(target=refreshed, args=(app, index))
+        refresh.start()
+        refresh.join(5)
+        assert not refresh.is_alive()
+        assert index.generation == generation
+    finally:
+        index.refresh_lock.release()
+
+    refreshed(app, index)
+    assert index.generation > generation
+
+
+def test_large_ranges_match_a_full_scan():
+    index = SuggestIndex(max_results=5, cached_prefix_length=1)
+    for i in range(SCAN_LIMIT * 2):
+        index.add_entry('tag', f'python {i}', f'python {i}', weight=i % 7 + 1)
+    index.built = True
+
+    def brute_force(term):
+        keys = [key for key in index.keys if key[0].startswith(term)]
+        keys.sort(key=lambda key: index.rank(index.entries[(key[1], key[2])], key))
+        return [index.entries[(key[1], key[2])]['text'] for key in keys[:5]]
+
+    for term in ('python', 'python 1', 'python 4', 'python 1'):
+        assert [result['text'] for result in index.suggest(term, 5)] == brute_force(term)
+    assert 'python' in index.top
+
+    # Lowering a cached entry drops the list; the next query ranks the range again
+    best = index.suggest('python', 1)[0]['text']
+    for _ in range(7):
+        index.remove_use('tag', best)
+    assert [result['text'] for result in index.suggest('python', 5)] == brute_force('python')
@@ -0,0 +1,134 @@
+"""
+inotify
+Minimal Linux inotify binding over ctypes (no third-party dependency).
+Lets the data file watcher block until the kernel reports a write or
+rename instead of waking up on a timer.
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Event flags (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+# struct inotify_event header: wd, mask, cookie, len (followed by len bytes of name)
+EVENT_HEADER = struct.Struct('iIII')
+
+# Room for many events per read (each is at most header + NAME_MAX + 1 bytes)
+READ_SIZE = 64 * 1024
+
+_libc = None
+
+
+def load_libc():
+    """libc with the inotify functions, or None where inotify is unavailable"""
+    global _libc
+    if _libc is None and sys.platform.startswith('linux'):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        except OSError:
+            return None
+        if hasattr(libc, 'inotify_init1') and hasattr(libc, 'inotify_add_watch'):
+            _libc = libc
+    return _libc
+
+
+def inotify_available() -> bool:
+    """Whether this platform supports inotify"""
+    return load_libc() is not None
+
+
+class Inotify:
+    """
+    One inotify instance. Usable as a context manager that closes it.
+    """
+
+    def __init__(self):
+        """
+        Create the inotify instance.
+
+        Raises:
+            OSError: If inotify is unavailable or the instance limit is reached
+        """
+        self.libc = load_libc()
+        if self.libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this platform")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_init1 failed: {os.strerror(code)}")
+
+    def add_watch(self, path: Path, mask: int) -> int:
+        """
+        Watch a file or directory.
+
+        Args:
+            path: Path to watch
+            mask: IN_* event flags
+
+        Returns:
+            Watch descriptor
+
+        Raises:
+            OSError: If the path cannot be watched (missing, or the watch limit is reached)
+        """
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(str(path)), ctypes.c_uint32(mask))
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, f"inotify_add_watch failed for {path}: {os.strerror(code)}")
+        return wd
+
+    def read(self, timeout: Optional[float] = None, wake_fd: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Wait for events.
+
+        Args:
+            timeout: Seconds to wait at most (None = until an event arrives)
+            wake_fd: Extra descriptor that ends the wait when readable (drained here)
+
+        Returns:
+            List of (mask, name) tuples; empty on timeout or wake-up
+        """
+        readable, _, _ = select.select([self.fd] + ([wake_fd] if wake_fd is not None else []), [], [], timeout)
+        if wake_fd is not None and wake_fd in readable:
+            os.read(wake_fd, 4096)
+        if self.fd not in readable:
+            return []
+
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
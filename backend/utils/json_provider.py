@@ -0,0 +1,107 @@
+"""
+JSON Provider
+Flask JSON provider backed by orjson when it is installed, with the
+standard library provider as fallback. Pre-encoded JSON stored in the
+database (Post.structured_data) is wrapped in RawJSON and copied into the
+response as-is instead of being decoded and re-encoded on every request.
+"""
+import json
+import logging
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class RawJSON:
+    """A JSON document that is already encoded and is emitted verbatim"""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        """
+        Wrap encoded JSON.
+
+        Args:
+            text: Valid JSON text
+        """
+        self.text = text
+
+    def __repr__(self):
+        return f'RawJSON({self.text[:40]!r})'
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's default provider, able to serialize RawJSON (by decoding it)"""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, RawJSON):
+            return json.loads(o.text)
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    orjson-backed provider producing the same documents as the default one:
+    sorted keys, non-string keys converted, and datetimes formatted by
+    Flask's default handler. RawJSON is embedded as an orjson Fragment
+    (orjson 3.9+; older versions decode it instead).
+    """
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, RawJSON):
+            fragment = getattr(orjson, 'Fragment', None)
+            return fragment(o.text) if fragment else orjson.loads(o.text)
+        return DefaultJSONProvider.default(o)
+
+    def options(self, indent: bool = False, sort_keys: bool = None) -> int:
+        """orjson option flags matching the provider settings"""
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Arguments orjson does not understand need the standard library
+        if set(kwargs) - {'indent', 'sort_keys', 'separators', 'default'}:
+            kwargs.setdefault('default', StdlibJSONProvider.default)
+            return DefaultJSONProvider.dumps(self, obj, **kwargs)
+        option = self.options(bool(kwargs.get('indent')), kwargs.get('sort_keys'))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self.options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def json_provider_class(name: str = 'orjson'):
+    """
+    Pick the JSON provider class for the Flask app.
+
+    Args:
+        name: 'orjson' (used when installed) or 'stdlib'
+
+    Returns:
+        Provider class to assign to Flask.json_provider_class
+    """
+    if name == 'orjson':
+        if orjson is not None:
+            return OrjsonProvider
+        logger.info("orjson is not installed, using the standard library JSON provider")
+    return StdlibJSONProvider
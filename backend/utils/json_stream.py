@@ -0,0 +1,140 @@
+"""
+Incremental JSON Reader
+Streams the members of a large top-level JSON object one at a time.
+Keeps only the member currently being decoded in memory instead of the whole file.
+An incomplete value is retried only after the buffered text has doubled, so
+decoding a value costs time linear in its size, and no value may grow past
+max_value_size characters.
+"""
+import json
+from pathlib import Path
+from typing import Any, Iterator, Tuple
+
+# Characters JSON allows between tokens
+_WHITESPACE = ' \t\n\r'
+
+# Characters that can continue a JSON number
+_NUMBER_CHARS = '0123456789.eE+-'
+
+# Longest token prefix a decode error at the end of the buffer may stand for ("\u12", "fals")
+_PARTIAL_TOKEN_CHARS = 6
+
+# Largest single member value read into memory, in characters
+MAX_VALUE_SIZE = 256 * 1024 * 1024
+
+
+def is_truncated(error: json.JSONDecodeError, buffer_length: int) -> bool:
+    """Whether a decode error can be caused by the value continuing past the buffer"""
+    return error.msg.startswith('Unterminated string') or error.pos >= buffer_length - _PARTIAL_TOKEN_CHARS
+
+
+def iter_json_object(
+    file_path: Path,
+    chunk_size: int = 65536,
+    max_value_size: int = MAX_VALUE_SIZE
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (key, value) pairs of a top-level JSON object as they are parsed.
+    The file is read in chunks and each value is decoded once it is complete,
+    so peak memory is bounded by the largest single value, not the file size.
+
+    Args:
+        file_path: Path to a JSON file whose root is an object
+        chunk_size: Number of characters to read per chunk
+        max_value_size: Largest member value accepted, in characters
+
+    Yields:
+        Tuples of (member key, decoded member value)
+
+    Raises:
+        json.JSONDecodeError: If the file is not a well-formed JSON object
+            or a value is larger than max_value_size
+    """
+    decoder = json.JSONDecoder()
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def fill(size: int = chunk_size) -> bool:
+            """Drop consumed text and append the next size characters. Returns False at EOF."""
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            chunk = f.read(size)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            if not chunk:
+                eof = True
+                return False
+            return True
+
+        def next_char() -> str:
+            """Skip whitespace and return the next significant character ('' at EOF)."""
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not fill():
+                    return ''
+
+        def fill_more() -> bool:
+            """Double the unconsumed text (at least one chunk), up to max_value_size."""
+            pending = len(buffer) - pos
+            if pending >= max_value_size:
+                raise json.JSONDecodeError(
+                    f"Value exceeds the limit of {max_value_size} characters", buffer, pos
+                )
+            return fill(min(max(chunk_size, pending), max_value_size - pending))
+
+        def decode_value() -> Any:
+            """Decode one complete JSON value starting at the current position."""
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    # Errors before the end of the buffer are malformed input, not a cut
+                    if is_truncated(e, len(buffer)) and fill_more():
+                        continue
+                    raise
+                # A number may continue past the end of the buffer, also when the
+                # decoder stopped before a trailing '.', 'e' or sign (e.g. "1.5e")
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if is_number and not buffer[end:].strip(_NUMBER_CHARS) and fill_more():
+                    continue
+                pos = end
+                return value
+
+        def expect(char: str):
+            nonlocal pos
+            found = next_char()
+            if found != char:
+                raise json.JSONDecodeError(f"Expecting '{char}'", buffer, pos)
+            pos += 1
+
+        fill()
+        expect('{')
+
+        if next_char() == '}':
+            return
+
+        while True:
+            if next_char() != '"':
+                raise json.JSONDecodeError('Expecting property name', buffer, pos)
+            key = decode_value()
+            expect(':')
+            next_char()
+            value = decode_value()
+
+            yield key, value
+
+            separator = next_char()
+            pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos - 1)
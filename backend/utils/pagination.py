@@ -0,0 +1,67 @@
+"""
+Keyset Pagination Helpers
+Opaque cursors for newest-first listings ordered by (timestamp, id).
+Each page seeks past the last row of the previous one through an index,
+so deep pages cost the same as the first instead of growing with OFFSET.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """
+    Build an opaque cursor pointing just after a row.
+
+    Args:
+        sort_value: Timestamp the listing is ordered by
+        row_id: Primary key of the row (breaks timestamp ties)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string; empty means "start from the first page"
+
+    Returns:
+        Tuple of (timestamp, id), or None for an empty cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (TypeError, ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_before(sort_column, id_column, position: Tuple[datetime, int]):
+    """
+    Filter for rows that come after a cursor position in (sort DESC, id DESC) order.
+
+    Args:
+        sort_column: Timestamp column the listing is ordered by
+        id_column: Primary key column
+        position: Decoded cursor (timestamp, id)
+
+    Returns:
+        SQLAlchemy boolean expression
+    """
+    # Row-value comparison lets the database seek the (timestamp, id) index directly
+    return tuple_(sort_column, id_column) < tuple_(*position)
@@ -2,11 +2,148 @@
 Sitemap Generator
 Generates XML sitemaps for search engines (Google, Bing, etc.)
 Helps search engines discover and index all your pages.
+Sitemaps are written as a stream of text chunks, one <url> entry at a
+time, so a document of any size is produced in constant memory.
 """
 from datetime import datetime
-from typing import List, Dict
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional
+from xml.sax.saxutils import escape
+
+XML_DECLARATION = '<?xml version="1.0" encoding="utf-8"?>\n'
+
+URLSET_OPEN = (
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:video="http://www.google.com/schemas/sitemap-video/1.1" '
+    'xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n'
+)
+
+# <url> entries joined into each yielded chunk
+ENTRIES_PER_CHUNK = 100
+
+
+def format_lastmod(value) -> Optional[str]:
+    """
+    Format a timestamp as a sitemap date (YYYY-MM-DD).
+
+    Args:
+        value: datetime or ISO 8601 string
+
+    Returns:
+        Date string, today for unparseable strings, or None if value is empty
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            value = datetime.utcnow()
+    return value.strftime('%Y-%m-%d')
+
+
+def element(name: str, text, indent: int) -> str:
+    """One escaped text element on its own line"""
+    return f"{'  ' * indent}<{name}>{escape(str(text if text is not None else ''))}</{name}>\n"
+
+
+def url_entry(post: Mapping, site_url: str, include_video: bool = True, include_image: bool = True) -> str:
+    """
+    Build the <url> element of one post.
+
+    Args:
+        post: Post fields (slug, title, body, thumbnail, video_url,
+            video_duration_seconds, tags, categories, created_at, updated_at)
+        site_url: Base site URL
+        include_video: Add the <video:video> block for posts with a video
+        include_image: Add the <image:image> block for posts with a thumbnail
+
+    Returns:
+        XML text of the entry
+    """
+    parts = ['  <url>\n', element('loc', f"{site_url.rstrip('/')}/watch/{post['slug']}", 2)]
+
+    lastmod = format_lastmod(post.get('updated_at') or post.get('created_at'))
+    if lastmod:
+        parts.append(element('lastmod', lastmod, 2))
+    parts.append(element('changefreq', 'weekly', 2))
+    parts.append(element('priority', '0.8', 2))
+
+    # Video data (Google video sitemap extension)
+    if include_video and post.get('video_url'):
+        parts.append('    <video:video>\n')
+        parts.append(element('video:thumbnail_loc', post.get('thumbnail'), 3))
+        parts.append(element('video:title', post.get('title'), 3))
+        parts.append(element('video:description', (post.get('body') or '')[:2048], 3))  # Max 2048 chars
+        parts.append(element('video:content_loc', post['video_url'], 3))
+
+        # Duration (in seconds)
+        if post.get('video_duration_seconds'):
+            parts.append(element('video:duration', int(post['video_duration_seconds']), 3))
+
+        # Publication date
+        pub_date = post.get('created_at')
+        if pub_date:
+            parts.append(element('video:publication_date', pub_date if isinstance(pub_date, str) else pub_date.isoformat(), 3))
+
+        # Family friendly (assume yes)
+        parts.append(element('video:family_friendly', 'yes', 3))
+
+        if post.get('tags'):
+            parts.append(element('video:tag', ', '.join(post['tags'][:32]), 3))  # Max 32 tags
+        if post.get('categories'):
+            parts.append(element('video:category', post['categories'][0], 3))
+        parts.append('    </video:video>\n')
+
+    # Image data (thumbnail)
+    if include_image and post.get('thumbnail'):
+        parts.append('    <image:image>\n')
+        parts.append(element('image:loc', post['thumbnail'], 3))
+        parts.append(element('image:title', post.get('title'), 3))
+        parts.append('    </image:image>\n')
+
+    parts.append('  </url>\n')
+    return ''.join(parts)
+
+
+def iter_sitemap_xml(posts: Iterable[Mapping], site_url: str, include_homepage: bool = True,
+                     include_video: bool = True, include_image: bool = True) -> Iterator[str]:
+    """
+    Stream an XML sitemap for search engines.
+    Posts are consumed lazily, so they can come straight from a database cursor.
+
+    Args:
+        posts: Iterable of post mappings (see url_entry); unpublished posts are skipped
+        site_url: Base site URL
+        include_homepage: Start with an entry for the homepage
+        include_video: Add video blocks to the entries (see url_entry)
+        include_image: Add image blocks to the entries
+
+    Yields:
+        Chunks of XML text
+    """
+    header = XML_DECLARATION + URLSET_OPEN
+    if include_homepage:
+        header += (
+            '  <url>\n'
+            + element('loc', site_url.rstrip('/'), 2)
+            + element('changefreq', 'daily', 2)
+            + element('priority', '1.0', 2)
+            + element('lastmod', datetime.utcnow().strftime('%Y-%m-%d'), 2)
+            + '  </url>\n'
+        )
+    yield header
+
+    chunk = []
+    for post in posts:
+        if not post.get('is_published', True):
+            continue  # Skip unpublished posts
+        chunk.append(url_entry(post, site_url, include_video, include_image))
+        if len(chunk) == ENTRIES_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+
+    chunk.append('</urlset>\n')
+    yield ''.join(chunk)
 
 
 def generate_sitemap_xml(posts: List[Dict], site_url: str) -> str:
@@ -21,96 +158,7 @@ def generate_sitemap_xml(posts: List[Dict], site_url: str) -> str:
     Returns:
         XML sitemap as string
     """
-    # Create root element
-    urlset = Element('urlset')
-    urlset.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
-    urlset.set('xmlns:video', 'http://www.google.com/schemas/sitemap-video/1.1')
-    urlset.set('xmlns:image', 'http://www.google.com/schemas/sitemap-image/1.1')
-
-    # Add homepage
-    url_elem = SubElement(urlset, 'url')
-    SubElement(url_elem, 'loc').text = site_url.rstrip('/')
-    SubElement(url_elem, 'changefreq').text = 'daily'
-    SubElement(url_elem, 'priority').text = '1.0'
-    SubElement(url_elem, 'lastmod').text = datetime.utcnow().strftime('%Y-%m-%d')
-
-    # Add each post
-    for post in posts:
-        if not post.get('is_published', True):
-            continue  # Skip unpublished posts
-
-        url_elem = SubElement(urlset, 'url')
-
-        # Page URL
-        page_url = f"{site_url.rstrip('/')}/watch/{post['slug']}"
-        SubElement(url_elem, 'loc').text = page_url
-
-        # Last modified date
-        updated_at = post.get('updated_at') or post.get('created_at')
-        if updated_at:
-            # Handle ISO format dates
-            if isinstance(updated_at, str):
-                try:
-                    date_obj = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-                    lastmod = date_obj.strftime('%Y-%m-%d')
-                except:
-                    lastmod = datetime.utcnow().strftime('%Y-%m-%d')
-            else:
-                lastmod = updated_at.strftime('%Y-%m-%d')
-            SubElement(url_elem, 'lastmod').text = lastmod
-
-        # Change frequency
-        SubElement(url_elem, 'changefreq').text = 'weekly'
-
-        # Priority (0.0 to 1.0)
-        SubElement(url_elem, 'priority').text = '0.8'
-
-        # Video data (Google video sitemap extension)
-        if post.get('video_url'):
-            video_elem = SubElement(url_elem, 'video:video')
-            SubElement(video_elem, 'video:thumbnail_loc').text = post.get('thumbnail', '')
-            SubElement(video_elem, 'video:title').text = post.get('title', '')
-            SubElement(video_elem, 'video:description').text = post.get('body', '')[:2048]  # Max 2048 chars
-            SubElement(video_elem, 'video:content_loc').text = post['video_url']
-
-            # Duration (in seconds)
-            if post.get('video_duration_seconds'):
-                SubElement(video_elem, 'video:duration').text = str(int(post['video_duration_seconds']))
-
-            # Publication date
-            if post.get('created_at'):
-                pub_date = post['created_at']
-                if isinstance(pub_date, str):
-                    SubElement(video_elem, 'video:publication_date').text = pub_date
-                else:
-                    SubElement(video_elem, 'video:publication_date').text = pub_date.isoformat()
-
-            # Family friendly (assume yes)
-            SubElement(video_elem, 'video:family_friendly').text = 'yes'
-
-            # Tags
-            if post.get('tags'):
-                tags = post['tags'][:32]  # Max 32 tags
-                SubElement(video_elem, 'video:tag').text = ', '.join(tags)
-
-            # Category
-            if post.get('categories') and len(post['categories']) > 0:
-                SubElement(video_elem, 'video:category').text = post['categories'][0]
-
-        # Image data (thumbnail)
-        if post.get('thumbnail'):
-            image_elem = SubElement(url_elem, 'image:image')
-            SubElement(image_elem, 'image:loc').text = post['thumbnail']
-            SubElement(image_elem, 'image:title').text = post.get('title', '')
-
-    # Pretty print XML
-    xml_str = tostring(urlset, encoding='utf-8')
-    dom = minidom.parseString(xml_str)
-    pretty_xml = dom.toprettyxml(indent='  ', encoding='utf-8').decode('utf-8')
-
-    # Remove extra whitespace lines
-    lines = [line for line in pretty_xml.split('\n') if line.strip()]
-    return '\n'.join(lines)
+    return ''.join(iter_sitemap_xml(posts, site_url))
 
 
 def generate_sitemap_index(sitemaps: List[Dict[str, str]], site_url: str) -> str:
@@ -125,21 +173,16 @@ def generate_sitemap_index(sitemaps: List[Dict[str, str]], site_url: str) -> str
     Returns:
         XML sitemap index as string
     """
-    sitemapindex = Element('sitemapindex')
-    sitemapindex.set('xmlns', 'http://www.sitemaps.org/schemas/sitemap/0.9')
+    parts = [XML_DECLARATION, '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n']
 
     for sitemap in sitemaps:
-        sitemap_elem = SubElement(sitemapindex, 'sitemap')
-        SubElement(sitemap_elem, 'loc').text = f"{site_url.rstrip('/')}{sitemap['loc']}"
-        SubElement(sitemap_elem, 'lastmod').text = sitemap.get('lastmod', datetime.utcnow().strftime('%Y-%m-%d'))
-
-    # Pretty print
-    xml_str = tostring(sitemapindex, encoding='utf-8')
-    dom = minidom.parseString(xml_str)
-    pretty_xml = dom.toprettyxml(indent='  ', encoding='utf-8').decode('utf-8')
+        parts.append('  <sitemap>\n')
+        parts.append(element('loc', f"{site_url.rstrip('/')}{sitemap['loc']}", 2))
+        parts.append(element('lastmod', sitemap.get('lastmod', datetime.utcnow().strftime('%Y-%m-%d')), 2))
+        parts.append('  </sitemap>\n')
 
-    lines = [line for line in pretty_xml.split('\n') if line.strip()]
-    return '\n'.join(lines)
+    parts.append('</sitemapindex>\n')
+    return ''.join(parts)
 
 
 def generate_robots_txt(site_url: str, sitemap_url: str = None, allow_all: bool = True) -> str:
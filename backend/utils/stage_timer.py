@@ -0,0 +1,111 @@
+"""
+Stage Timer
+Collects cumulative and per-batch timings for the stages of a bulk import,
+so slow runs can be traced to parsing, duplicate checks, SEO generation,
+serialization or database commits.
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+def summarize_stage(seconds: float, items: int) -> Dict:
+    """Format one stage's totals with its throughput"""
+    return {
+        'seconds': round(seconds, 6),
+        'items': items,
+        'items_per_second': round(items / seconds, 1) if seconds > 0 and items else None
+    }
+
+
+class StageTimer:
+    """
+    Accumulates elapsed time and item counts per named stage.
+    Time is tracked both for the whole run and for the batch in progress.
+    """
+
+    def __init__(self, max_batches: int = 50):
+        """
+        Initialize the timer.
+
+        Args:
+            max_batches: Number of most recent per-batch records to keep
+        """
+        self.started = time.perf_counter()
+        self.totals = {}
+        self.current = {}
+        self.batches = deque(maxlen=max_batches)
+
+    def add(self, stage: str, seconds: float, items: int = 0):
+        """
+        Record time spent in a stage.
+
+        Args:
+            stage: Stage name (e.g. 'parse', 'dedupe', 'seo', 'commit')
+            seconds: Elapsed seconds
+            items: Number of articles handled in that time
+        """
+        for bucket in (self.totals, self.current):
+            total = bucket.setdefault(stage, [0.0, 0])
+            total[0] += seconds
+            total[1] += items
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        """
+        Time a block of code as the given stage.
+
+        Args:
+            name: Stage name
+            items: Number of articles handled in the block
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, items)
+
+    def seconds(self, stage: str) -> float:
+        """Cumulative seconds recorded for a stage"""
+        return self.totals.get(stage, [0.0, 0])[0]
+
+    def end_batch(self, batch_num: int, articles: int) -> Dict:
+        """
+        Close the current batch and keep its timings.
+
+        Args:
+            batch_num: Batch number
+            articles: Number of articles in the batch
+
+        Returns:
+            Per-batch timing record
+        """
+        record = {
+            'batch': batch_num,
+            'articles': articles,
+            'stages': {name: summarize_stage(*values) for name, values in self.current.items()}
+        }
+        self.batches.append(record)
+        self.current = {}
+        return record
+
+    def summary(self, articles: Optional[int] = None) -> Dict:
+        """
+        Summarize the run so far.
+
+        Args:
+            articles: Total articles processed, for overall throughput
+
+        Returns:
+            Dictionary with cumulative stage timings and recent batch timings
+        """
+        elapsed = time.perf_counter() - self.started
+        result = {
+            'total_seconds': round(elapsed, 6),
+            'stages': {name: summarize_stage(*values) for name, values in self.totals.items()},
+            'batches': list(self.batches)
+        }
+        if articles is not None:
+            result['articles_per_second'] = round(articles / elapsed, 1) if elapsed > 0 else None
+        return result